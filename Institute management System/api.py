@@ -0,0 +1,374 @@
+"""
+HTTP API for Student Management System
+JSON endpoints over Database for front ends other than the desktop app
+(attendance kiosks, dashboards)
+
+    python api.py                     serve on API_CONFIG host/port
+    python api.py --port 8080
+    python api.py --host 0.0.0.0      reachable from kiosks (needs API_CONFIG["token"])
+
+With API_CONFIG["token"] set, every request must carry it in an
+X-API-Token header. Without one, the API is read-only and only binds to
+loopback addresses.
+"""
+
+import argparse
+import base64
+import gzip
+import hashlib
+import hmac
+import ipaddress
+import json
+import sys
+from datetime import date, datetime
+from decimal import Decimal
+
+from flask import Flask, Response, current_app, jsonify, request
+
+from config import API_CONFIG
+from db import Database
+from pool import PoolClosed, PoolTimeout
+
+
+class BadRequest(Exception):
+    """Invalid query string or body; answered with a 400"""
+
+
+TOKEN_HEADER = "X-API-Token"
+
+# Values of the students and attendance ENUM columns
+STUDENT_STATUSES = ("Active", "Inactive", "Graduated")
+GENDERS = ("Male", "Female", "Other")
+ATTENDANCE_STATUSES = ("Present", "Absent")
+
+
+# ================= APP =================
+
+def create_app(db=None, token=None):
+    """Flask app serving db (a connected Database; one is initialized if omitted)
+
+    Database hands each request its own pooled connection, so the app can
+    run under a threaded or multi-worker server. token defaults to
+    API_CONFIG["token"]; see the module docstring.
+    """
+    if db is None:
+        db = Database()
+        if not db.initialize_database():
+            raise RuntimeError("Failed to initialize database")
+
+    app = Flask(__name__)
+    app.config["DB"] = db
+    app.config["API_TOKEN"] = API_CONFIG["token"] if token is None else token
+
+    @app.errorhandler(BadRequest)
+    def bad_request(e):
+        return jsonify(error=str(e)), 400
+
+    def database_unavailable(e):
+        print(f"API Database Error: {e}")
+        return jsonify(error="Database unavailable"), 503
+
+    # Routes read with raise_errors=True, so a failed query lands here
+    # rather than passing for an empty result
+    for error in (db.backend.Error, PoolTimeout, PoolClosed):
+        app.register_error_handler(error, database_unavailable)
+
+    @app.errorhandler(404)
+    def not_found(e):
+        return jsonify(error="Not found"), 404
+
+    @app.errorhandler(405)
+    def method_not_allowed(e):
+        return jsonify(error="Method not allowed"), 405
+
+    @app.errorhandler(500)
+    def server_error(e):
+        # Flask has already logged the traceback
+        return jsonify(error="Internal server error"), 500
+
+    app.before_request(_check_token)
+    app.after_request(_conditional_gzip)
+    _register_routes(app, db)
+    return app
+
+
+def _register_routes(app, db):
+
+    # ================= STUDENTS =================
+
+    @app.get("/api/students")
+    def list_students():
+        """One keyset page, or search results when q is given"""
+        limit = _int_arg("limit", API_CONFIG["page_size"], 1, API_CONFIG["max_page_size"])
+
+        term = request.args.get("q", "").strip()
+        if term:
+            filter_by = request.args.get("filter_by", "all")
+            if filter_by not in ("all", "student_id", "first_name", "last_name", "email"):
+                raise BadRequest(f"Unsupported filter_by: {filter_by}")
+            rows = db.search_students(term, filter_by, limit, raise_errors=True)
+            return _json({"students": rows, "next_cursor": None, "total": len(rows)})
+
+        filters = {
+            "course_id": _int_arg("course_id", None, 1),
+            "status": _choice_arg("status", STUDENT_STATUSES),
+            "gender": _choice_arg("gender", GENDERS),
+        }
+        sort = request.args.get("sort", "desc")
+        if sort not in ("asc", "desc"):
+            raise BadRequest("sort must be asc or desc")
+
+        page = db.get_students_page(
+            _decode_cursor(request.args.get("cursor")), limit,
+            {k: v for k, v in filters.items() if v is not None}, sort,
+            raise_errors=True
+        )
+        return _json({
+            "students": page["rows"],
+            "next_cursor": _encode_cursor(page["next_key"]),
+            "total": page["total"],
+        })
+
+    @app.get("/api/students/<student_id>")
+    def get_student(student_id):
+        student = db.get_student_by_id(student_id, raise_errors=True)
+        if student is None:
+            return jsonify(error="Student not found"), 404
+        return _json(student)
+
+    @app.get("/api/students/<student_id>/attendance")
+    def student_attendance(student_id):
+        return _json({"attendance": db.get_student_attendance(student_id, raise_errors=True)})
+
+    # ================= COURSES =================
+
+    @app.get("/api/courses")
+    def list_courses():
+        return _json({"courses": db.get_all_courses(raise_errors=True)})
+
+    @app.get("/api/courses/<int:course_id>/roster")
+    def course_roster(course_id):
+        """Active students of a course with their attendance on date (default today)"""
+        day = _date_arg("date") or date.today()
+        return _json({"date": day, "roster": db.get_roster(course_id, day, raise_errors=True)})
+
+    # ================= ATTENDANCE =================
+
+    @app.get("/api/attendance")
+    def attendance_by_date():
+        day = _date_arg("date") or date.today()
+        course_id = _int_arg("course_id", None, 1)
+        return _json({"date": day, "attendance": db.get_attendance_by_date(day, course_id, raise_errors=True)})
+
+    @app.post("/api/attendance")
+    def mark_attendance():
+        """Bulk roll call in one transaction
+
+        Body: {"date": "YYYY-MM-DD", "course_id": 1, "records": [{"student_id":
+        ..., "status": "Present"|"Absent", "remarks": ...}]}. date and
+        course_id are defaults that a record may override. A malformed
+        record rejects the whole request with a 400 naming its index.
+        """
+        body = request.get_json(silent=True)
+        if not isinstance(body, dict) or not isinstance(body.get("records"), list):
+            raise BadRequest("Expected a JSON object with a records list")
+        if len(body["records"]) > API_CONFIG["max_bulk_records"]:
+            raise BadRequest(f"At most {API_CONFIG['max_bulk_records']} records per request")
+
+        default_date = _parse_date(body.get("date"), "date") or date.today()
+        rows = [
+            _attendance_row(i, record, body, default_date)
+            for i, record in enumerate(body["records"])
+        ]
+
+        try:
+            success, msg, outcomes = db.mark_attendance_bulk(rows, raise_errors=True)
+        except db.backend.IntegrityError:
+            # A record names a student or course that doesn't exist; the
+            # transaction saved nothing. Other database errors become a 503.
+            return jsonify(error="Unknown student or course in records; nothing was saved"), 422
+
+        saved = sum(1 for _, ok, _ in outcomes if ok)
+        return _json({
+            "success": success,
+            "message": msg,
+            "saved": saved,
+            "results": [
+                {"student_id": student_id, "saved": ok, "message": message}
+                for student_id, ok, message in outcomes
+            ],
+        }, status=200 if success else (207 if saved else 422))
+
+    # ================= DASHBOARD =================
+
+    @app.get("/api/dashboard")
+    def dashboard():
+        return _json(db.get_dashboard_stats(raise_errors=True))
+
+
+def _attendance_row(index, record, body, default_date):
+    """(student_id, course_id, date, status, remarks) for records[index], or BadRequest"""
+    where = f"records[{index}]"
+    if not isinstance(record, dict):
+        raise BadRequest(f"{where} must be a JSON object")
+
+    student_id = record.get("student_id")
+    course_id = record.get("course_id", body.get("course_id"))
+    status = record.get("status")
+    remarks = record.get("remarks")
+
+    if not isinstance(student_id, str) or not student_id.strip():
+        raise BadRequest(f"{where}: student_id must be a non-empty string")
+    # bool is an int subclass, but true is not a course
+    if not isinstance(course_id, int) or isinstance(course_id, bool):
+        raise BadRequest(f"{where}: course_id must be an integer")
+    if status not in ATTENDANCE_STATUSES:
+        raise BadRequest(f"{where}: status must be one of {', '.join(ATTENDANCE_STATUSES)}")
+    if remarks is not None and not isinstance(remarks, str):
+        raise BadRequest(f"{where}: remarks must be a string")
+
+    day = _parse_date(record.get("date"), f"{where}.date") or default_date
+    return student_id.strip(), course_id, day, status, remarks
+
+
+# ================= AUTHENTICATION =================
+
+def _check_token():
+    """Require the shared token on every request; without one configured, only reads are served"""
+    token = current_app.config["API_TOKEN"]
+    if not token:
+        if request.method not in ("GET", "HEAD", "OPTIONS"):
+            return jsonify(error="Writes are disabled until API_CONFIG['token'] is set"), 403
+        return None
+
+    sent = request.headers.get(TOKEN_HEADER, "")
+    if not hmac.compare_digest(sent.encode(), token.encode()):
+        return jsonify(error=f"Missing or invalid {TOKEN_HEADER} header"), 401
+    return None
+
+
+def _is_loopback(host):
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+# ================= RESPONSES =================
+
+def _json_default(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Not JSON serializable: {type(value).__name__}")
+
+
+def _json(payload, status=200):
+    body = json.dumps(payload, default=_json_default, separators=(",", ":"))
+    return Response(body, status=status, mimetype="application/json")
+
+
+def _conditional_gzip(response):
+    """ETag/If-None-Match for successful GETs, then gzip for clients that accept it"""
+    if request.method == "GET" and response.status_code == 200 and not response.direct_passthrough:
+        # Weak: the same tag stands for the identity and gzip encodings
+        response.set_etag(hashlib.sha1(response.get_data()).hexdigest(), weak=True)
+        response.make_conditional(request)
+
+    if (
+        response.status_code in (200, 207, 422)
+        and "gzip" in request.headers.get("Accept-Encoding", "").lower()
+        and "Content-Encoding" not in response.headers
+        and not response.direct_passthrough
+        and len(response.get_data()) >= API_CONFIG["gzip_min_bytes"]
+    ):
+        response.set_data(gzip.compress(response.get_data(), compresslevel=6))
+        response.headers["Content-Encoding"] = "gzip"
+    response.vary.add("Accept-Encoding")
+    return response
+
+
+# ================= ARGUMENTS =================
+
+def _encode_cursor(key):
+    """Opaque page cursor for a get_students_page (admission_date, student_id) key"""
+    if key is None:
+        return None
+    admission_date, student_id = key
+    raw = json.dumps([admission_date.isoformat(), student_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor):
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        admission_date, student_id = json.loads(raw)
+        return date.fromisoformat(admission_date), str(student_id)
+    except (ValueError, TypeError):
+        raise BadRequest("Invalid cursor") from None
+
+
+def _int_arg(name, default, minimum=None, maximum=None):
+    value = request.args.get(name)
+    if value in (None, ""):
+        return default
+    try:
+        value = int(value)
+    except ValueError:
+        raise BadRequest(f"{name} must be an integer") from None
+    if minimum is not None and value < minimum:
+        raise BadRequest(f"{name} must be at least {minimum}")
+    return min(value, maximum) if maximum is not None else value
+
+
+def _choice_arg(name, choices):
+    value = request.args.get(name)
+    if value in (None, ""):
+        return None
+    if value not in choices:
+        raise BadRequest(f"{name} must be one of {', '.join(choices)}")
+    return value
+
+
+def _date_arg(name):
+    return _parse_date(request.args.get(name), name)
+
+
+def _parse_date(value, name):
+    if value in (None, ""):
+        return None
+    try:
+        return date.fromisoformat(str(value))
+    except ValueError:
+        raise BadRequest(f"{name} must be a YYYY-MM-DD date") from None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Institute Management System HTTP API")
+    parser.add_argument("--host", default=API_CONFIG["host"])
+    parser.add_argument("--port", type=int, default=API_CONFIG["port"])
+    args = parser.parse_args(argv)
+
+    if not API_CONFIG["token"] and not _is_loopback(args.host):
+        print(f"✗ Refusing to serve on {args.host} without API_CONFIG['token']")
+        return 1
+
+    db = Database()
+    if not db.initialize_database():
+        print("Failed to initialize database!")
+        return 1
+    try:
+        # Threaded so concurrent clients each get their own pooled connection
+        create_app(db).run(host=args.host, port=args.port, threaded=True)
+    finally:
+        db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,8 @@
 import customtkinter as ctk
 from tkinter import messagebox
+import importlib
+import sys
+import threading
 
 # ---------------- APPEARANCE ----------------
 ctk.set_appearance_mode("light")      # "dark" if you prefer
@@ -7,15 +10,23 @@ ctk.set_default_color_theme("blue")
 
 # ---------------- CORE ----------------
 from db import Database
-from config import COLORS
+from config import COLORS, METRICS_CONFIG
+from tasks import TaskExecutor
+from jobs import ExportJobQueue
 
 # ---------------- MODULES ----------------
 from modules.auth import AuthModule
-from modules.dashboard import DashboardModule
-from modules.students import StudentsModule
-from modules.courses import CoursesModule
-from modules.attendance import AttendanceModule
-from modules.reports import ReportsModule
+
+# Sections are imported on first navigation (or by the post-login pre-warm)
+# so matplotlib, openpyxl, PIL and tkcalendar stay off the login path
+SECTIONS = {
+    "dashboard": ("modules.dashboard", "DashboardModule"),
+    "students": ("modules.students", "StudentsModule"),
+    "courses": ("modules.courses", "CoursesModule"),
+    "attendance": ("modules.attendance", "AttendanceModule"),
+    "reports": ("modules.reports", "ReportsModule"),
+    "diagnostics": ("modules.diagnostics", "DiagnosticsModule"),
+}
 
 
 class StudentManagementSystem(ctk.CTk):
@@ -33,6 +44,11 @@ class StudentManagementSystem(ctk.CTk):
             self.destroy()
             return
 
+        # -------- Background Work --------
+        self.tasks = TaskExecutor(self)
+        self.exports = ExportJobQueue(self.db)
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+
         # -------- App State --------
         self.current_user = None
         self.current_section = None
@@ -43,11 +59,7 @@ class StudentManagementSystem(ctk.CTk):
 
         # -------- Modules --------
         self.auth = AuthModule(self)
-        self.dashboard = DashboardModule(self)
-        self.students = StudentsModule(self)
-        self.courses = CoursesModule(self)
-        self.attendance = AttendanceModule(self)
-        self.reports = ReportsModule(self)
+        self.sections = {}
 
         # -------- Start App --------
         self.auth.show_login_screen()
@@ -58,6 +70,13 @@ class StudentManagementSystem(ctk.CTk):
 
     def clear_window(self):
         """Remove all widgets from root window"""
+        self.tasks.cancel_group("screen")
+        self.tasks.cancel_group("session")
+        # Screens are children of main_content, so they go with it; a new
+        # login builds fresh ones
+        self._close_sections()
+        self.sections.clear()
+        self.current_section = None
         for widget in self.winfo_children():
             widget.destroy()
 
@@ -76,6 +95,7 @@ class StudentManagementSystem(ctk.CTk):
 
         self._sidebar_buttons()
         self.show_dashboard()
+        self.prewarm_sections()
 
     # ======================================================
     # SIDEBAR
@@ -86,10 +106,11 @@ class StudentManagementSystem(ctk.CTk):
 
         nav_items = [
             ("📊 Dashboard", self.show_dashboard),
-            ("👨‍🎓 Students", self.students.show),
-            ("📚 Courses", self.courses.show),
-            ("📝 Attendance", self.attendance.show),
-            ("📈 Reports", self.reports.show),
+            ("👨‍🎓 Students", lambda: self.show_section("students")),
+            ("📚 Courses", lambda: self.show_section("courses")),
+            ("📝 Attendance", lambda: self.show_section("attendance")),
+            ("📈 Reports", lambda: self.show_section("reports")),
+            ("🩺 Diagnostics", lambda: self.show_section("diagnostics")),
         ]
 
         for text, command in nav_items:
@@ -119,7 +140,77 @@ class StudentManagementSystem(ctk.CTk):
 
     def show_dashboard(self):
         if self.main_content:
-            self.dashboard.show()
+            self.show_section("dashboard")
+
+    def show_section(self, name):
+        """Bring a section's screen to the front and refresh its data
+
+        Each screen is built once into its own frame in main_content; moving
+        away only hides it. Loads still running for the previous screen are
+        cancelled so their results never land on a hidden screen. Building
+        and refreshing are timed as ui.<name>.build / ui.<name>.refresh
+        operations in db.metrics.
+        """
+        section = self.section(name)
+        self.tasks.cancel_group("screen")
+
+        if self.current_section != name:
+            if self.current_section is not None:
+                self.sections[self.current_section].frame.pack_forget()
+
+            if section.frame is None:
+                section.frame = ctk.CTkFrame(self.main_content, fg_color="transparent")
+                with self.db.metrics.timer(f"ui.{name}.build"):
+                    section.build()
+            section.frame.pack(fill="both", expand=True)
+            self.current_section = name
+
+        with self.db.metrics.timer(f"ui.{name}.refresh"):
+            section.refresh()
+
+    def section(self, name):
+        """Section module instance, importing and creating it on first use"""
+        if name not in self.sections:
+            module_name, class_name = SECTIONS[name]
+            module = importlib.import_module(module_name)
+            self.sections[name] = getattr(module, class_name)(self)
+        return self.sections[name]
+
+    def prewarm_sections(self):
+        """Import the remaining section modules on a background thread
+
+        Only the imports happen off the Tk thread; the module objects are
+        still created on first navigation.
+        """
+        pending = [m for m, _ in SECTIONS.values() if m not in sys.modules]
+        if not pending:
+            return
+
+        def run():
+            for module_name in pending:
+                try:
+                    importlib.import_module(module_name)
+                except Exception as e:
+                    print(f"Pre-warm of {module_name} failed: {e}")
+
+        threading.Thread(target=run, name="ims-prewarm", daemon=True).start()
+
+    def _close_sections(self):
+        for section in self.sections.values():
+            close = getattr(section, "close", None)
+            if close:
+                close()
+
+    def on_close(self):
+        self.tasks.shutdown()
+        self.exports.shutdown()
+        self._close_sections()
+        if self.db.metrics.enabled and METRICS_CONFIG["dump_path"]:
+            success, msg = self.db.dump_metrics()
+            if not success:
+                print(msg)
+        self.db.close()
+        self.destroy()
 
     def logout(self):
         if messagebox.askyesno("Logout", "Are you sure you want to logout?"):
@@ -0,0 +1,204 @@
+"""
+Attendance Summary for Student Management System
+Monthly per-student rollup of the attendance table plus running per-course
+totals, both kept current by Database
+"""
+
+from collections import defaultdict
+from datetime import datetime
+
+SUMMARY_TABLE = """
+CREATE TABLE IF NOT EXISTS attendance_summary (
+    student_id VARCHAR(20) NOT NULL,
+    course_id INT NOT NULL,
+    month DATE NOT NULL,
+    present INT NOT NULL DEFAULT 0,
+    total INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (student_id, course_id, month),
+    FOREIGN KEY (student_id) REFERENCES students(student_id) ON DELETE CASCADE,
+    FOREIGN KEY (course_id) REFERENCES courses(course_id) ON DELETE CASCADE
+)
+"""
+
+# One row per course, so the dashboard's overall rate reads a table the size
+# of courses instead of summing the whole rollup. Deleting a course cascades;
+# deleting a student goes through remove_student first.
+TOTALS_TABLE = """
+CREATE TABLE IF NOT EXISTS attendance_totals (
+    course_id INT PRIMARY KEY,
+    present BIGINT NOT NULL DEFAULT 0,
+    total BIGINT NOT NULL DEFAULT 0,
+    FOREIGN KEY (course_id) REFERENCES courses(course_id) ON DELETE CASCADE
+)
+"""
+
+
+def month_of(value):
+    """First day of the month containing a date or 'YYYY-MM-DD' string"""
+    if isinstance(value, str):
+        value = datetime.strptime(value[:10], "%Y-%m-%d").date()
+    elif isinstance(value, datetime):
+        value = value.date()
+    return value.replace(day=1)
+
+
+def _fold(student_id):
+    # Student IDs compare case-insensitively in both backends' collations
+    return str(student_id).lower()
+
+
+def canonical_ids(cursor, rows, chunk_size=500):
+    """rows with each student_id replaced by the stored students.student_id it matches
+
+    The ID columns compare case-insensitively, so "stu-..." finds the
+    "STU-..." student; the rollup must use the stored spelling or it splits
+    one student's marks across two keys. Unknown IDs are left as given, for
+    the insert to reject.
+    """
+    ids = sorted({row[0] for row in rows}, key=str)
+    stored = {}
+    for start in range(0, len(ids), chunk_size):
+        chunk = ids[start:start + chunk_size]
+        cursor.execute(f"""
+            SELECT student_id FROM students
+            WHERE student_id IN ({", ".join(["%s"] * len(chunk))})
+        """, chunk)
+        for row in cursor.fetchall():
+            stored[_fold(row["student_id"])] = row["student_id"]
+    return [(stored.get(_fold(row[0]), row[0]),) + tuple(row[1:]) for row in rows]
+
+
+def lock_existing(cursor, rows, backend, chunk_size=500):
+    """Lock and return the attendance already recorded for rows
+
+    rows are (student_id, course_id, attendance_date, status, remarks) tuples.
+    Returns {(folded student_id, attendance_date): (course_id, status)}.
+    """
+    by_date = defaultdict(set)
+    for student_id, _, attendance_date, _, _ in rows:
+        by_date[attendance_date].add(student_id)
+
+    existing = {}
+    for attendance_date, student_ids in by_date.items():
+        student_ids = sorted(student_ids)
+        for start in range(0, len(student_ids), chunk_size):
+            chunk = student_ids[start:start + chunk_size]
+            cursor.execute(f"""
+                SELECT student_id, course_id, status
+                FROM attendance
+                WHERE attendance_date = %s AND student_id IN ({", ".join(["%s"] * len(chunk))})
+                {backend.for_update}
+            """, [attendance_date] + chunk)
+            for row in cursor.fetchall():
+                existing[(_fold(row["student_id"]), attendance_date)] = (row["course_id"], row["status"])
+    return existing
+
+
+def summary_deltas(existing, rows):
+    """Changes the upserted rows make to each (student_id, course_id, month) bucket
+
+    Mirrors the attendance upsert: a new record adds to total, an overwrite
+    only moves present, and course_id is never changed by an overwrite.
+    Returns {(student_id, course_id, month): [present_delta, total_delta]}.
+    """
+    state = dict(existing)
+    deltas = defaultdict(lambda: [0, 0])
+
+    for student_id, course_id, attendance_date, status, _ in rows:
+        key = (_fold(student_id), attendance_date)
+        present = 1 if status == "Present" else 0
+
+        if key in state:
+            old_course, old_status = state[key]
+            bucket = deltas[(student_id, old_course, month_of(attendance_date))]
+            bucket[0] += present - (1 if old_status == "Present" else 0)
+            state[key] = (old_course, status)
+        else:
+            bucket = deltas[(student_id, course_id, month_of(attendance_date))]
+            bucket[0] += present
+            bucket[1] += 1
+            state[key] = (course_id, status)
+
+    return {key: delta for key, delta in deltas.items() if delta != [0, 0]}
+
+
+def apply_deltas(cursor, deltas, backend):
+    """Add bucket deltas onto attendance_summary and attendance_totals"""
+    if not deltas:
+        return
+    upsert = backend.upsert(
+        ("student_id", "course_id", "month"),
+        present=f"present + {backend.new('present')}",
+        total=f"total + {backend.new('total')}",
+    )
+    cursor.executemany(f"""
+        INSERT INTO attendance_summary (student_id, course_id, month, present, total)
+        VALUES (%s, %s, %s, %s, %s)
+        {upsert}
+    """, [key + tuple(delta) for key, delta in deltas.items()])
+
+    by_course = defaultdict(lambda: [0, 0])
+    for (_, course_id, _), (present, total) in deltas.items():
+        by_course[course_id][0] += present
+        by_course[course_id][1] += total
+    apply_totals(cursor, by_course, backend)
+
+
+def apply_totals(cursor, by_course, backend):
+    """Add {course_id: (present_delta, total_delta)} onto attendance_totals"""
+    rows = [(course_id, *delta) for course_id, delta in sorted(by_course.items()) if any(delta)]
+    if not rows:
+        return
+    upsert = backend.upsert(
+        ("course_id",),
+        present=f"present + {backend.new('present')}",
+        total=f"total + {backend.new('total')}",
+    )
+    cursor.executemany(f"""
+        INSERT INTO attendance_totals (course_id, present, total)
+        VALUES (%s, %s, %s)
+        {upsert}
+    """, rows)
+
+
+def remove_student(cursor, student_id, backend):
+    """Take a student's attendance out of attendance_totals before the student is deleted
+
+    Their attendance and summary rows go with the student by cascade; run
+    this in the same transaction, ahead of the DELETE.
+    """
+    cursor.execute(f"""
+        SELECT course_id, SUM(present) as present, SUM(total) as total
+        FROM attendance_summary
+        WHERE student_id = %s
+        GROUP BY course_id
+        {backend.for_update}
+    """, (student_id,))
+    apply_totals(cursor, {
+        row["course_id"]: (-int(row["present"]), -int(row["total"])) for row in cursor.fetchall()
+    }, backend)
+
+
+def rebuild(cursor, backend):
+    """Recompute attendance_summary from the attendance table (backfill)"""
+    cursor.execute("DELETE FROM attendance_summary")
+    cursor.execute(f"""
+        INSERT INTO attendance_summary (student_id, course_id, month, present, total)
+        SELECT student_id, course_id,
+               {backend.month_start("attendance_date")} as month,
+               SUM(CASE WHEN status = 'Present' THEN 1 ELSE 0 END),
+               COUNT(*)
+        FROM attendance
+        GROUP BY student_id, course_id, month
+    """)
+
+
+def rebuild_totals(cursor, backend):
+    """Recompute attendance_totals from attendance_summary"""
+    cursor.execute("DELETE FROM attendance_totals")
+    cursor.execute("""
+        INSERT INTO attendance_totals (course_id, present, total)
+        SELECT course_id, SUM(present), SUM(total)
+        FROM attendance_summary
+        GROUP BY course_id
+    """)
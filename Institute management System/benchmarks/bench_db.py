@@ -0,0 +1,226 @@
+"""
+Database hot-path benchmarks for Student Management System
+
+    python benchmarks/bench_db.py                                20 courses, 5k students, 30 days
+    python benchmarks/bench_db.py --students 50000 --days 90
+    python benchmarks/bench_db.py --json new.json --compare old.json
+    python benchmarks/bench_db.py --backend sqlite               no server needed
+    python benchmarks/bench_db.py --metrics metrics.json         per-statement breakdown too
+
+A throwaway database (--database, dropped and recreated on every run) on
+the chosen --backend is filled by datagen through Database methods, then
+each hot path is timed --runs times: the listing, search, dashboard and
+attendance reads, the attendance writes and every report export in every
+format. The JSON output
+records the parameters with the timings; --compare flags paths whose
+median got slower than --threshold times the earlier run.
+"""
+
+import argparse
+import json
+import platform
+import re
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import config  # noqa: E402
+from db import Database  # noqa: E402
+from exporters import DATASETS, FORMATS, export  # noqa: E402
+from storage import MySQLBackend, SQLiteBackend  # noqa: E402
+
+from datagen import LAST_NAMES, populate  # noqa: E402
+
+
+# ================= SETUP =================
+
+def open_bench_database(kind, name):
+    """A connected Database on a freshly (re)created database called name"""
+    if not re.fullmatch(r"\w+", name):
+        raise SystemExit(f"✗ Benchmark database name must be a plain identifier: {name!r}")
+
+    if kind == "sqlite":
+        backend = SQLiteBackend(str(Path(tempfile.gettempdir()) / f"{name}.db"))
+    else:
+        if name == config.DB_CONFIG["database"]:
+            raise SystemExit("✗ Refusing to benchmark against the application database")
+        backend = MySQLBackend(database=name)
+
+    # Reachability is checked without a pool; initialize_database opens the
+    # only one, on the recreated database
+    try:
+        backend.check()
+    except Exception as e:
+        raise SystemExit(f"✗ Database server unavailable: {e}")
+    backend.drop_database()
+
+    db = Database(backend)
+    if not db.initialize_database():
+        raise SystemExit("✗ Failed to initialize the benchmark database")
+    return db
+
+
+# ================= HOT PATHS =================
+
+def hot_paths(db, data, export_dir, formats):
+    """(name, callable) pairs in run order; reads come before the writes that invalidate caches"""
+    first_day, last_day = data["first_day"], data["last_day"]
+    course_id = max(data["roster"], key=lambda c: len(data["roster"][c]))
+    roll_call = [(sid, course_id, last_day, "Present", None) for sid in data["roster"][course_id]]
+    name = LAST_NAMES[0].lower()
+
+    paths = [
+        ("get_all_students", db.get_all_students),
+        ("get_students_page", lambda: db.get_students_page(limit=200)["rows"]),
+        ("search_students[all]", lambda: db.search_students(name)),
+        ("search_students[last_name]", lambda: db.search_students(name[:3], "last_name")),
+        ("search_students[student_id]", lambda: db.search_students(f"STU-{last_day.year}00", "student_id")),
+        ("get_dashboard_stats[cold]", lambda: db.get_dashboard_stats(refresh=True)),
+        ("get_dashboard_stats[cached]", db.get_dashboard_stats),
+        ("get_attendance_full_by_date_range", lambda: db.get_attendance_full_by_date_range(first_day, last_day)),
+        ("get_attendance_by_date", lambda: db.get_attendance_by_date(last_day)),
+        ("get_roster", lambda: db.get_roster(course_id, last_day)),
+    ]
+
+    for dataset in DATASETS:
+        params = {"start_date": first_day, "end_date": last_day} if dataset == "attendance" else {}
+        for fmt in formats:
+            path = str(Path(export_dir) / f"{dataset}{FORMATS[fmt].extension}")
+            paths.append((
+                f"export[{dataset}.{fmt}]",
+                lambda dataset=dataset, path=path, fmt=fmt, params=params: export(db, dataset, path, fmt, **params)
+            ))
+
+    paths += [
+        ("mark_attendance_bulk", lambda: db.mark_attendance_bulk(roll_call)[2]),
+        ("mark_attendance", lambda: db.mark_attendance(roll_call[0])),
+    ]
+    return paths
+
+
+def time_path(fn, runs):
+    """Per-run seconds and the row count of the last result (None if it has none)"""
+    seconds = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = fn()
+        seconds.append(time.perf_counter() - start)
+
+    if isinstance(result, int) and not isinstance(result, bool):
+        rows = result
+    elif isinstance(result, list):
+        rows = len(result)
+    else:
+        rows = None
+    return seconds, rows
+
+
+# ================= REPORT =================
+
+def compare(results, baseline_path, threshold):
+    """Print the change against an earlier JSON run; returns the names that regressed"""
+    baseline = json.loads(Path(baseline_path).read_text())
+    before = {r["name"]: r["median_ms"] for r in baseline["results"]}
+    if baseline.get("params") != results["params"]:
+        print("! Baseline was recorded with different parameters; ratios are indicative only")
+
+    regressed = []
+    print(f"\n{'path':<40} {'before':>10} {'after':>10} {'ratio':>7}")
+    for r in results["results"]:
+        old = before.get(r["name"])
+        if not old:
+            continue
+        ratio = r["median_ms"] / old
+        flag = ""
+        if ratio > threshold:
+            regressed.append(r["name"])
+            flag = "  ✗ slower"
+        print(f"{r['name']:<40} {old:10.2f} {r['median_ms']:10.2f} {ratio:6.2f}x{flag}")
+    return regressed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Database hot-path benchmarks")
+    parser.add_argument("--courses", type=int, default=20)
+    parser.add_argument("--students", type=int, default=5000)
+    parser.add_argument("--days", type=int, default=30, help="days of attendance, ending on --anchor")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--anchor", type=date.fromisoformat, default=date.today(),
+                        help="last attendance day, YYYY-MM-DD (default today)")
+    parser.add_argument("--runs", type=int, default=5, help="timed runs per path")
+    parser.add_argument("--formats", nargs="+", choices=sorted(FORMATS), default=sorted(FORMATS),
+                        help="export formats to time")
+    parser.add_argument("--backend", choices=("mysql", "sqlite"), default="mysql")
+    parser.add_argument("--database", default="ims_benchmark",
+                        help="scratch database, dropped and recreated (default ims_benchmark)")
+    parser.add_argument("--keep", action="store_true", help="leave the benchmark database behind")
+    parser.add_argument("--json", metavar="PATH", help="write the results to PATH")
+    parser.add_argument("--compare", metavar="PATH", help="earlier --json output to compare against")
+    parser.add_argument("--threshold", type=float, default=1.2, help="slowdown ratio flagged by --compare")
+    parser.add_argument("--metrics", metavar="PATH",
+                        help="write the per-statement timings of the timed runs to PATH")
+    args = parser.parse_args(argv)
+
+    db = open_bench_database(args.backend, args.database)
+    try:
+        start = time.perf_counter()
+        data = populate(db, args.courses, args.students, args.days, args.seed, args.anchor)
+        load_seconds = time.perf_counter() - start
+        print(f"Loaded {data['courses']} courses, {data['students']} students and "
+              f"{data['attendance']} attendance marks in {load_seconds:.1f}s\n")
+
+        # Only the timed runs count, not the data load
+        db.metrics.reset()
+        results = []
+        print(f"{'path':<40} {'median':>10} {'min':>10} {'rows':>8}")
+        with tempfile.TemporaryDirectory(prefix="ims-bench-") as export_dir:
+            for name, fn in hot_paths(db, data, export_dir, args.formats):
+                seconds, rows = time_path(fn, args.runs)
+                result = {
+                    "name": name,
+                    "median_ms": round(statistics.median(seconds) * 1000, 3),
+                    "min_ms": round(min(seconds) * 1000, 3),
+                    "max_ms": round(max(seconds) * 1000, 3),
+                    "rows": rows,
+                }
+                results.append(result)
+                print(f"{name:<40} {result['median_ms']:8.2f}ms {result['min_ms']:8.2f}ms "
+                      f"{'' if rows is None else rows:>8}")
+        if args.metrics:
+            success, msg = db.dump_metrics(args.metrics)
+            print(("\n✓ " if success else "\n✗ ") + msg)
+    finally:
+        db.close()
+        if not args.keep:
+            db.backend.drop_database()
+
+    output = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "params": {
+            "backend": args.backend, "courses": args.courses, "students": args.students, "days": args.days,
+            "seed": args.seed, "anchor": args.anchor.isoformat(), "runs": args.runs,
+        },
+        "load_seconds": round(load_seconds, 3),
+        "results": results,
+    }
+    if args.json:
+        Path(args.json).write_text(json.dumps(output, indent=2))
+        print(f"\n✓ Results written to {args.json}")
+
+    if args.compare:
+        regressed = compare(output, args.compare, args.threshold)
+        if regressed:
+            print(f"\n✗ {len(regressed)} paths slower than {args.threshold}x the baseline")
+            return 1
+        print("\n✓ No regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
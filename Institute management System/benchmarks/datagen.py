@@ -0,0 +1,121 @@
+"""
+Deterministic synthetic data for the Student Management System benchmarks
+
+The same (courses, students, days, seed, anchor) always produces the same
+rows, so timings from different runs measure the code and not the data.
+Everything is loaded through Database methods, the way the app writes it.
+"""
+
+import random
+from datetime import date, timedelta
+
+FIRST_NAMES = ["Aarav", "Diya", "Ishaan", "Meera", "Rohan", "Sara", "Kabir", "Anaya", "Vivaan", "Zoya",
+               "Arjun", "Myra", "Reyansh", "Kiara", "Aditya", "Tara", "Dhruv", "Nisha", "Yash", "Pooja"]
+LAST_NAMES = ["Sharma", "Verma", "Patel", "Iyer", "Reddy", "Khan", "Singh", "Gupta", "Nair", "Das",
+              "Mehta", "Joshi", "Rao", "Bose", "Kapoor", "Menon", "Ghosh", "Pillai", "Chopra", "Malik"]
+SUBJECTS = ["Python", "Data Science", "Web Development", "Accounting", "Graphic Design",
+            "Networking", "Digital Marketing", "Java", "Cloud Computing", "Cyber Security"]
+
+# Share of Active students, and of Present marks in each roll call
+ACTIVE_RATE = 0.85
+PRESENT_RATE = 0.8
+
+
+def make_courses(count, seed=42):
+    """add_course tuples: (course_name, course_code, description, duration_months, fees)"""
+    rng = random.Random(seed)
+    courses = []
+    for n in range(count):
+        subject = SUBJECTS[n % len(SUBJECTS)]
+        level = n // len(SUBJECTS) + 1
+        courses.append((
+            f"{subject} {level}",
+            f"{subject[:3].upper()}{level:03d}",
+            f"Level {level} {subject.lower()} programme",
+            rng.choice((3, 6, 12)),
+            rng.randrange(5000, 50000, 500),
+        ))
+    return courses
+
+
+def make_students(count, course_ids, anchor, seed=42):
+    """add_student field tuples without the ID (as importer.RowValidator returns)
+
+    Admissions are spread over the year before anchor, so the dashboard's
+    monthly series is populated.
+    """
+    rng = random.Random(seed + 1)
+    students = []
+    for n in range(count):
+        first = rng.choice(FIRST_NAMES)
+        last = rng.choice(LAST_NAMES)
+        students.append((
+            first,
+            last,
+            rng.choice(("Male", "Female", "Other")),
+            anchor - timedelta(days=rng.randint(17 * 365, 30 * 365)),
+            f"{first}.{last}{n}@example.com".lower(),
+            f"9{rng.randrange(10 ** 9):09d}",
+            f"{rng.randint(1, 999)} Main Road",
+            rng.choice(course_ids) if course_ids else None,
+            anchor - timedelta(days=rng.randint(0, 364)),
+            None,
+            "Active" if rng.random() < ACTIVE_RATE else rng.choice(("Inactive", "Graduated")),
+        ))
+    return students
+
+
+def make_attendance(days, roster, anchor, seed=42):
+    """Yield one roll call per (day, course): lists of mark_attendance_bulk rows
+
+    roster maps course_id to its active student IDs; days end on anchor.
+    """
+    rng = random.Random(seed + 2)
+    for offset in range(days - 1, -1, -1):
+        day = anchor - timedelta(days=offset)
+        for course_id in sorted(roster):
+            yield [
+                (student_id, course_id, day,
+                 "Present" if rng.random() < PRESENT_RATE else "Absent", None)
+                for student_id in roster[course_id]
+            ]
+
+
+def populate(db, courses=20, students=5000, days=30, seed=42, anchor=None, chunk_size=1000):
+    """Load a fresh data set through db; returns a summary dict of what was written"""
+    anchor = anchor or date.today()
+
+    for course in make_courses(courses, seed):
+        success, msg = db.add_course(course)
+        if not success:
+            raise RuntimeError(msg)
+    course_ids = [c["course_id"] for c in db.get_all_courses()]
+
+    fields = make_students(students, course_ids, anchor, seed)
+    roster = {}
+    for start in range(0, len(fields), chunk_size):
+        chunk = fields[start:start + chunk_size]
+        ids = db.reserve_student_ids(len(chunk))
+        success, msg, _ = db.add_students_bulk([(i, *f) for i, f in zip(ids, chunk)], chunk_size)
+        if not success:
+            raise RuntimeError(msg)
+        for student_id, f in zip(ids, chunk):
+            if f[10] == "Active" and f[7] is not None:
+                roster.setdefault(f[7], []).append(student_id)
+
+    marks = 0
+    for roll_call in make_attendance(days, roster, anchor, seed):
+        if roll_call:
+            success, msg, _ = db.mark_attendance_bulk(roll_call)
+            if not success:
+                raise RuntimeError(msg)
+            marks += len(roll_call)
+
+    return {
+        "courses": len(course_ids),
+        "students": students,
+        "attendance": marks,
+        "first_day": anchor - timedelta(days=days - 1),
+        "last_day": anchor,
+        "roster": roster,
+    }
@@ -0,0 +1,142 @@
+"""
+Start-up import profile for Student Management System
+
+    python benchmarks/importtime.py                  import profile of app.py
+    python benchmarks/importtime.py --login          also time-to-login-screen
+    python benchmarks/importtime.py --json out.json  save the results
+
+Every measurement runs in a fresh interpreter so nothing is already cached
+in sys.modules. The import profile comes from `python -X importtime`;
+time-to-login-screen creates the real window, so it needs a display and a
+reachable database.
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parent.parent
+
+# Dependencies that should not be imported before the login screen is up.
+# PIL is not listed: customtkinter itself imports it for CTkImage.
+HEAVY_MODULES = ("matplotlib", "openpyxl", "pyarrow", "tkcalendar")
+
+IMPORT_SNIPPET = f"""
+import sys, time, json
+t0 = time.perf_counter()
+import app
+elapsed = time.perf_counter() - t0
+print(json.dumps({{
+    "seconds": elapsed,
+    "heavy": [m for m in {HEAVY_MODULES!r} if m in sys.modules],
+}}))
+"""
+
+LOGIN_SNIPPET = """
+import time
+t0 = time.perf_counter()
+from app import StudentManagementSystem
+window = StudentManagementSystem()
+window.update()
+print(time.perf_counter() - t0)
+window.on_close()
+"""
+
+
+def _python(*args):
+    return subprocess.run(
+        [sys.executable, *args],
+        cwd=APP_DIR, capture_output=True, text=True, check=False
+    )
+
+
+def profile_imports():
+    """Parse one `-X importtime` run into (self_us, cumulative_us, depth, module) rows"""
+    result = _python("-X", "importtime", "-c", "import app")
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((int(self_us), int(cumulative_us), depth, name.strip()))
+    return rows
+
+
+def time_import(runs):
+    """Median wall time of `import app` and the heavy modules it dragged in"""
+    seconds = []
+    heavy = []
+    for _ in range(runs):
+        result = _python("-c", IMPORT_SNIPPET)
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.strip().splitlines()[-1])
+        data = json.loads(result.stdout.strip().splitlines()[-1])
+        seconds.append(data["seconds"])
+        heavy = data["heavy"]
+    return statistics.median(seconds), heavy
+
+
+def time_login(runs):
+    """Median seconds from interpreter start-up to a drawn login screen, or None"""
+    seconds = []
+    for _ in range(runs):
+        result = _python("-c", LOGIN_SNIPPET)
+        if result.returncode != 0:
+            lines = result.stderr.strip().splitlines()
+            print(f"✗ time-to-login-screen unavailable: {lines[-1] if lines else 'no output'}")
+            return None
+        seconds.append(float(result.stdout.strip().splitlines()[-1]))
+    return statistics.median(seconds)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Start-up import profile")
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters per timing")
+    parser.add_argument("--top", type=int, default=15, help="slowest imports to list")
+    parser.add_argument("--login", action="store_true", help="also time the login screen")
+    parser.add_argument("--json", metavar="PATH", help="write the results to PATH")
+    args = parser.parse_args(argv)
+
+    rows = profile_imports()
+    import_seconds, heavy = time_import(args.runs)
+    login_seconds = time_login(args.runs) if args.login else None
+
+    print(f"import app        {import_seconds * 1000:8.1f} ms  (median of {args.runs})")
+    if login_seconds is not None:
+        print(f"login screen      {login_seconds * 1000:8.1f} ms  (median of {args.runs})")
+    print(f"heavy at startup  {', '.join(heavy) or 'none'}")
+
+    print(f"\n{'cumulative':>12} {'self':>10}  module")
+    top = sorted(rows, key=lambda r: r[1], reverse=True)[:args.top]
+    for self_us, cumulative_us, depth, name in top:
+        print(f"{cumulative_us / 1000:10.1f}ms {self_us / 1000:8.1f}ms  {'  ' * depth}{name}")
+
+    if args.json:
+        results = {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "import_app_ms": round(import_seconds * 1000, 1),
+            "time_to_login_ms": round(login_seconds * 1000, 1) if login_seconds is not None else None,
+            "heavy_modules_at_startup": heavy,
+            "slowest_imports": [
+                {"module": name, "cumulative_us": cumulative_us, "self_us": self_us}
+                for self_us, cumulative_us, _, name in top
+            ],
+        }
+        Path(args.json).write_text(json.dumps(results, indent=2))
+        print(f"\n✓ Results written to {args.json}")
+
+    return 1 if heavy else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,53 @@
+"""
+In-memory caching for Student Management System
+"""
+
+import threading
+import time
+
+
+class TTLCache:
+    """Thread-safe key/value cache whose entries expire after ttl seconds"""
+
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self._entries = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    @property
+    def generation(self):
+        """Counter bumped by every invalidation"""
+        return self._generation
+
+    def get(self, key, default=None):
+        """Cached value for key, or default if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[key]
+                return default
+            return value
+
+    def set(self, key, value, generation=None):
+        """Store value under key for the next ttl seconds
+
+        Pass the generation read before loading value: if an invalidation
+        happened since, the value may already be stale and is not stored.
+        """
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+
+    def invalidate(self, *keys):
+        """Drop the given keys, or everything when called without keys"""
+        with self._lock:
+            self._generation += 1
+            if not keys:
+                self._entries.clear()
+            for key in keys:
+                self._entries.pop(key, None)
@@ -1,2 +1,107 @@
-# Routed to base_app to preserve original logic
-from base_app import *
+"""
+Dashboard Charts for Student Management System
+Matplotlib canvases that are built once and updated in place
+"""
+
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+
+class Chart:
+    """A figure embedded in a Tk parent; update() redraws only when data changes
+
+    data is a sequence of (label, value) pairs. timer, if given, returns a
+    context manager (e.g. a metrics timer) wrapped around every render.
+    """
+
+    def __init__(self, parent, figsize, dpi=100, timer=None):
+        self.figure = Figure(figsize=figsize, dpi=dpi)
+        self.ax = self.figure.add_subplot(111)
+        self.canvas = FigureCanvasTkAgg(self.figure, parent)
+        self.canvas.get_tk_widget().pack(fill="both", expand=True, padx=20, pady=20)
+        self.data = None
+
+        if timer is not None:
+            # draw_idle renders later, from the Tk idle loop; time it there
+            draw = self.canvas.draw
+
+            def timed_draw():
+                with timer():
+                    draw()
+            self.canvas.draw = timed_draw
+
+    def update(self, data):
+        """Show data; returns False (and draws nothing) if it is what is already shown"""
+        data = tuple((label, value) for label, value in data)
+        if data == self.data:
+            return False
+
+        self.data = data
+        self._draw(data)
+        self.canvas.draw_idle()
+        return True
+
+    def close(self):
+        """Release the figure and its canvas widget"""
+        self.figure.clear()
+        widget = self.canvas.get_tk_widget()
+        if widget.winfo_exists():
+            widget.destroy()
+        self.data = None
+
+    def _draw(self, data):
+        raise NotImplementedError
+
+
+class PieChart(Chart):
+    """Share of each label; wedges are rebuilt only when the data changes"""
+
+    def _draw(self, data):
+        self.ax.clear()
+        if data:
+            labels = [label for label, _ in data]
+            sizes = [value for _, value in data]
+            self.ax.pie(sizes, labels=labels, autopct="%1.1f%%", startangle=90)
+        else:
+            self.ax.text(0.5, 0.5, "No data", ha="center", va="center")
+
+
+class LineChart(Chart):
+    """One series over labelled points; the line artist is reused across updates"""
+
+    def __init__(self, parent, figsize, dpi=100, timer=None):
+        super().__init__(parent, figsize, dpi, timer)
+        self.line, = self.ax.plot([], [], marker="o")
+        self.empty = self.ax.text(
+            0.5, 0.5, "No data", ha="center", va="center",
+            transform=self.ax.transAxes, visible=False
+        )
+
+    def _draw(self, data):
+        xs = range(len(data))
+        self.line.set_data(xs, [value for _, value in data])
+        self.ax.set_xticks(xs)
+        self.ax.set_xticklabels([label for label, _ in data])
+        self.empty.set_visible(not data)
+
+        self.ax.relim()
+        self.ax.autoscale_view()
+
+
+class ChartManager:
+    """Keeps named charts alive between visits and closes them on teardown"""
+
+    def __init__(self):
+        self._charts = {}
+
+    def add(self, name, chart):
+        self._charts[name] = chart
+        return chart
+
+    def update(self, name, data):
+        return self._charts[name].update(data)
+
+    def close(self):
+        for chart in self._charts.values():
+            chart.close()
+        self._charts.clear()
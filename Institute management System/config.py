@@ -6,6 +6,52 @@ DB_CONFIG = {
     "database": "Institute Management"
 }
 
+# Storage Backend: "mysql" (DB_CONFIG server) or "sqlite" (local WAL-mode file)
+STORAGE_CONFIG = {
+    "backend": "mysql",
+    "sqlite_path": "institute.db"
+}
+
+# Connection Pool Configuration (times in seconds)
+POOL_CONFIG = {
+    "max_size": 8,            # hard cap on open connections
+    "checkout_timeout": 10,   # wait this long for a free connection
+    "idle_timeout": 300,      # close connections idle longer than this
+    "max_lifetime": 1800,     # recycle connections older than this
+    "ping_after_idle": 5      # health-check connections idle longer than this on borrow
+}
+
+# Cache Configuration (times in seconds)
+CACHE_CONFIG = {
+    "dashboard_ttl": 60       # dashboard stats; writes through Database invalidate early
+}
+
+# Query Instrumentation (Diagnostics screen, manage.py metrics)
+METRICS_CONFIG = {
+    "enabled": True,
+    "slow_query_ms": 200,     # statements slower than this are logged with their plan
+    "slow_log_size": 50,      # slow queries kept in memory for the Diagnostics screen
+    "slow_log_path": "slow_queries.log",  # JSON lines; None to keep them in memory only
+    "explain_ttl": 300,       # re-EXPLAIN a slow statement at most this often
+    "dump_path": "ims_metrics.json"  # written when the app exits; None to skip
+}
+
+# Student ID Allocation
+ID_CONFIG = {
+    "block_size": 50          # IDs each process reserves from the sequence table at a time
+}
+
+# HTTP API Configuration (api.py)
+API_CONFIG = {
+    "host": "127.0.0.1",      # "0.0.0.0" for kiosks on the LAN; refused unless token is set
+    "port": 5000,
+    "token": "",              # shared secret clients send as X-API-Token; writes need one
+    "page_size": 100,         # students per page when no limit is given
+    "max_page_size": 500,
+    "max_bulk_records": 2000, # attendance records per POST
+    "gzip_min_bytes": 1024    # smaller bodies are sent uncompressed
+}
+
 # SMTP Configuration for Email
 SMTP_CONFIG = {
     "host": "ims.gmail.com",
@@ -1,42 +1,117 @@
 """
 Database Layer for Student Management System
-Handles all database operations with PyMySQL
+Handles all database operations through a storage backend (MySQL or SQLite)
 """
 
-import pymysql
-from config import DB_CONFIG
+from config import POOL_CONFIG, CACHE_CONFIG, ID_CONFIG, METRICS_CONFIG
+from storage import backend_from_config
+from pool import ConnectionPool
+from cache import TTLCache
+import attendance_summary
+import student_ids
+from search import SEARCH_COLUMNS, all_fields_query, prefix_pattern
+from migrations import run_migrations
+from metrics import QueryMetrics, InstrumentedConnection, timed
+import json
 import os
 
+# Listing queries shared by the get_* methods and their streaming iter_* twins
+ALL_STUDENTS_QUERY = """
+SELECT s.*, c.course_name 
+FROM students s 
+LEFT JOIN courses c ON s.course_id = c.course_id
+ORDER BY s.admission_date DESC
+"""
+
+ALL_COURSES_QUERY = """
+SELECT c.*, COUNT(s.student_id) as student_count
+FROM courses c
+LEFT JOIN students s ON c.course_id = s.course_id
+GROUP BY c.course_id
+ORDER BY c.course_name
+"""
+
+# {student_name} is filled in with the backend's string concatenation
+ATTENDANCE_RANGE_QUERY = """
+SELECT 
+    a.student_id,
+    {student_name} AS student_name,
+    c.course_name,
+    a.attendance_date,
+    a.status,
+    a.remarks
+FROM attendance a
+JOIN students s ON a.student_id = s.student_id
+JOIN courses c ON a.course_id = c.course_id
+WHERE a.attendance_date BETWEEN %s AND %s
+ORDER BY a.attendance_date, a.student_id
+"""
+
+# Shared by add_student and add_students_bulk (PyMySQL batches executemany
+# of a plain INSERT ... VALUES into multi-row statements)
+INSERT_STUDENT_QUERY = """
+INSERT INTO students 
+(student_id, first_name, last_name, gender, dob, email, phone, 
+ address, course_id, admission_date, photo_path, status)
+VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+"""
+
 class Database:
-    """Database handler class for all database operations"""
+    """Database handler class for all database operations
+
+    Every method borrows its own connection and cursor from a bounded pool,
+    so a single Database instance can be shared across worker threads.
+    Queries are written once with %s placeholders; the backend supplies the
+    connections and the few dialect-specific fragments. Public methods and
+    the statements they run are timed in self.metrics (METRICS_CONFIG).
+    Reads report a failure as an empty result; those taking raise_errors
+    re-raise it instead, for callers that must not mistake it for no data.
+    """
+
+    def __init__(self, backend=None):
+        """Initialize database handler (connections are opened lazily)
 
-    def __init__(self):
-        """Initialize database connection"""
-        self.connection = None
-        self.cursor = None
+        backend defaults to the one chosen in STORAGE_CONFIG.
+        """
+        self.backend = backend or backend_from_config()
+        self.pool = None
+        self.cache = TTLCache(CACHE_CONFIG["dashboard_ttl"])
+        self.id_allocator = student_ids.StudentIdAllocator(
+            self._reserve_id_block, ID_CONFIG["block_size"]
+        )
+        self.metrics = QueryMetrics(
+            enabled=METRICS_CONFIG["enabled"],
+            slow_query_ms=METRICS_CONFIG["slow_query_ms"],
+            slow_log_size=METRICS_CONFIG["slow_log_size"],
+            slow_log_path=METRICS_CONFIG["slow_log_path"],
+            explain_ttl=METRICS_CONFIG["explain_ttl"],
+            explain=self._explain
+        )
 
     def connect(self):
-        """Establish connection to MySQL database"""
+        """Check the storage backend is reachable and set up the connection pool"""
         try:
-            self.connection = pymysql.connect(
-                host=DB_CONFIG["host"],
-                user=DB_CONFIG["user"],
-                password=DB_CONFIG["password"],
-                charset='utf8mb4',
-                cursorclass=pymysql.cursors.DictCursor
+            self.backend.check()
+            self.pool = ConnectionPool(
+                self._open_connection,
+                disconnect_errors=self.backend.disconnect_errors,
+                **POOL_CONFIG
             )
-            self.cursor = self.connection.cursor()
             return True
         except Exception as e:
             print(f"Connection Error: {e}")
             return False
 
+    def _open_connection(self):
+        connection = self.backend.connect()
+        if self.metrics.enabled:
+            connection = InstrumentedConnection(connection, self.metrics)
+        return connection
+
     def create_database(self):
         """Create database if it doesn't exist"""
         try:
-            self.cursor.execute(f"CREATE DATABASE IF NOT EXISTS {DB_CONFIG['database']}")
-            self.cursor.execute(f"USE {DB_CONFIG['database']}")
-            self.connection.commit()
+            self.backend.create_database()
             return True
         except Exception as e:
             print(f"Database Creation Error: {e}")
@@ -45,74 +120,13 @@ class Database:
     def create_tables(self):
         """Create all required tables if they don't exist"""
         try:
-            # Students Table
-            students_table = """
-            CREATE TABLE IF NOT EXISTS students (
-                student_id VARCHAR(20) PRIMARY KEY,
-                first_name VARCHAR(50) NOT NULL,
-                last_name VARCHAR(50) NOT NULL,
-                gender ENUM('Male', 'Female', 'Other') NOT NULL,
-                dob DATE NOT NULL,
-                email VARCHAR(100) UNIQUE,
-                phone VARCHAR(15),
-                address TEXT,
-                course_id INT,
-                admission_date DATE NOT NULL,
-                photo_path VARCHAR(255),
-                status ENUM('Active', 'Inactive', 'Graduated') DEFAULT 'Active',
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (course_id) REFERENCES courses(course_id) ON DELETE SET NULL
-            )
-            """
-
-            # Courses Table
-            courses_table = """
-            CREATE TABLE IF NOT EXISTS courses (
-                course_id INT AUTO_INCREMENT PRIMARY KEY,
-                course_name VARCHAR(100) NOT NULL UNIQUE,
-                course_code VARCHAR(20) NOT NULL UNIQUE,
-                description TEXT,
-                duration_months INT,
-                fees DECIMAL(10, 2),
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-            """
-
-            # Attendance Table
-            attendance_table = """
-            CREATE TABLE IF NOT EXISTS attendance (
-                attendance_id INT AUTO_INCREMENT PRIMARY KEY,
-                student_id VARCHAR(20) NOT NULL,
-                course_id INT NOT NULL,
-                attendance_date DATE NOT NULL,
-                status ENUM('Present', 'Absent') NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (student_id) REFERENCES students(student_id) ON DELETE CASCADE,
-                FOREIGN KEY (course_id) REFERENCES courses(course_id) ON DELETE CASCADE,
-                UNIQUE KEY unique_attendance (student_id, attendance_date)
-            )
-            """
-
-            # Users Table (for login)
-            users_table = """
-            CREATE TABLE IF NOT EXISTS users (
-                user_id INT AUTO_INCREMENT PRIMARY KEY,
-                username VARCHAR(50) NOT NULL UNIQUE,
-                email VARCHAR(100) NOT NULL UNIQUE,
-                password_hash VARCHAR(255) NOT NULL,
-                full_name VARCHAR(100),
-                role ENUM('Admin', 'Staff') DEFAULT 'Staff',
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-            """
+            with self.pool.cursor() as cursor:
+                for table in self.backend.tables():
+                    cursor.execute(table)
 
-            # Execute table creation - courses first due to foreign key
-            self.cursor.execute(courses_table)
-            self.cursor.execute(students_table)
-            self.cursor.execute(attendance_table)
-            self.cursor.execute(users_table)
+                # Indexes and later schema changes are tracked as migrations
+                run_migrations(cursor, self.backend)
 
-            self.connection.commit()
             print("✓ All tables created successfully")
             return True
 
@@ -120,6 +134,7 @@ class Database:
             print(f"Table Creation Error: {e}")
             return False
 
+    @timed
     def initialize_database(self):
         """Initialize the complete database"""
         if self.connect():
@@ -132,23 +147,91 @@ class Database:
         return False
 
     # CRUD Operations for Students
+    @timed
     def add_student(self, student_data):
         """Add a new student - parameterized query"""
         try:
-            query = """
-            INSERT INTO students 
-            (student_id, first_name, last_name, gender, dob, email, phone, 
-             address, course_id, admission_date, photo_path, status)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            """
-            self.cursor.execute(query, student_data)
-            self.connection.commit()
+            with self.pool.transaction() as cursor:
+                cursor.execute(INSERT_STUDENT_QUERY, student_data)
+            self._data_changed()
             return True, "Student added successfully!"
-        except pymysql.IntegrityError as e:
+        except self.backend.IntegrityError as e:
             return False, f"Duplicate entry: {str(e)}"
         except Exception as e:
             return False, f"Error adding student: {str(e)}"
 
+    @timed
+    def add_students_bulk(self, rows, chunk_size=500):
+        """Insert many new students, one transaction per chunk - parameterized query
+
+        rows are add_student tuples. Emails already in the database are
+        rejected up front; if a chunk still hits a duplicate key it is retried
+        row by row so only the offending rows are lost.
+        Returns (success, message, outcomes) where outcomes holds one
+        (student_id, saved, message) tuple per input row, in input order.
+        """
+        outcomes = [None] * len(rows)
+
+        for start in range(0, len(rows), chunk_size):
+            indexes = range(start, min(start + chunk_size, len(rows)))
+            try:
+                taken = self._existing_emails([rows[i][5] for i in indexes if rows[i][5]])
+            except Exception as e:
+                for i in indexes:
+                    outcomes[i] = (rows[i][0], False, f"Error: {str(e)}")
+                continue
+
+            chunk = []
+            for i in indexes:
+                if rows[i][5] and rows[i][5].lower() in taken:
+                    outcomes[i] = (rows[i][0], False, f"Email already registered: {rows[i][5]}")
+                else:
+                    chunk.append(i)
+            if not chunk:
+                continue
+
+            try:
+                with self.pool.transaction() as cursor:
+                    cursor.executemany(INSERT_STUDENT_QUERY, [tuple(rows[i]) for i in chunk])
+                for i in chunk:
+                    outcomes[i] = (rows[i][0], True, "Student added")
+            except self.backend.IntegrityError:
+                for i in chunk:
+                    success, msg = self._insert_student(rows[i])
+                    outcomes[i] = (rows[i][0], success, msg)
+            except Exception as e:
+                for i in chunk:
+                    outcomes[i] = (rows[i][0], False, f"Error: {str(e)}")
+
+        saved = [rows[i] for i, outcome in enumerate(outcomes) if outcome[1]]
+        if saved:
+            self._data_changed()
+
+        if len(saved) == len(rows):
+            return True, f"{len(saved)} students added successfully!", outcomes
+        return False, f"{len(saved)} of {len(rows)} students added", outcomes
+
+    def _insert_student(self, student_data):
+        # Single-row fallback for add_students_bulk; no cache upkeep
+        try:
+            with self.pool.transaction() as cursor:
+                cursor.execute(INSERT_STUDENT_QUERY, student_data)
+            return True, "Student added"
+        except self.backend.IntegrityError as e:
+            return False, f"Duplicate entry: {e.args[-1]}"
+        except Exception as e:
+            return False, f"Error: {str(e)}"
+
+    def _existing_emails(self, emails):
+        """Lower-cased subset of emails already used by a student"""
+        if not emails:
+            return set()
+        placeholders = ", ".join(["%s"] * len(emails))
+        with self.pool.cursor() as cursor:
+            cursor.execute(f"SELECT email FROM students WHERE email IN ({placeholders})", emails)
+            return {row["email"].lower() for row in cursor.fetchall()}
+
+    @timed
     def update_student(self, student_id, student_data):
         """Update existing student - parameterized query"""
         try:
@@ -160,65 +243,166 @@ class Database:
             WHERE student_id=%s
             """
             data = student_data + (student_id,)
-            self.cursor.execute(query, data)
-            self.connection.commit()
+            with self.pool.transaction() as cursor:
+                cursor.execute(query, data)
+            self._data_changed()
             return True, "Student updated successfully!"
         except Exception as e:
             return False, f"Error updating student: {str(e)}"
 
+    @timed
     def delete_student(self, student_id):
         """Delete a student - parameterized query"""
         try:
             query = "DELETE FROM students WHERE student_id=%s"
-            self.cursor.execute(query, (student_id,))
-            self.connection.commit()
+            with self.pool.transaction() as cursor:
+                attendance_summary.remove_student(cursor, student_id, self.backend)
+                cursor.execute(query, (student_id,))
+            self._data_changed()
             return True, "Student deleted successfully!"
         except Exception as e:
             return False, f"Error deleting student: {str(e)}"
 
+    @timed
     def get_all_students(self):
         """Get all students"""
         try:
-            query = """
-            SELECT s.*, c.course_name 
-            FROM students s 
-            LEFT JOIN courses c ON s.course_id = c.course_id
-            ORDER BY s.admission_date DESC
-            """
-            self.cursor.execute(query)
-            return self.cursor.fetchall()
+            with self.pool.cursor() as cursor:
+                cursor.execute(ALL_STUDENTS_QUERY)
+                return cursor.fetchall()
         except Exception as e:
             print(f"Error fetching students: {e}")
             return []
 
-    def search_students(self, search_term, filter_by="all"):
-        """Search students - parameterized query"""
+    @timed
+    def get_students_page(self, after_key=None, limit=100, filters=None, sort="desc", raise_errors=False):
+        """Get one keyset page of students - parameterized query
+
+        Rows are ordered by (admission_date, student_id); after_key is that pair
+        for the last row already shown, or None for the first page. filters may
+        hold course_id, status and gender. Returns a dict with "rows",
+        "next_key" (None on the last page) and "total", a row count estimate
+        that is only computed for the first page.
+        """
         try:
-            if filter_by == "all":
-                query = """
-                SELECT s.*, c.course_name 
-                FROM students s 
-                LEFT JOIN courses c ON s.course_id = c.course_id
-                WHERE s.student_id LIKE %s OR s.first_name LIKE %s 
-                   OR s.last_name LIKE %s OR s.email LIKE %s
-                """
-                search_param = f"%{search_term}%"
-                self.cursor.execute(query, (search_param, search_param, search_param, search_param))
-            else:
-                query = f"""
-                SELECT s.*, c.course_name 
-                FROM students s 
-                LEFT JOIN courses c ON s.course_id = c.course_id
-                WHERE {filter_by} LIKE %s
-                """
-                self.cursor.execute(query, (f"%{search_term}%",))
-
-            return self.cursor.fetchall()
+            direction, compare = ("ASC", ">") if sort == "asc" else ("DESC", "<")
+            conditions, params = self._student_filter_sql(filters)
+
+            if after_key:
+                admission_date, student_id = after_key
+                conditions.append(
+                    f"(s.admission_date {compare} %s OR "
+                    f"(s.admission_date = %s AND s.student_id {compare} %s))"
+                )
+                params += [admission_date, admission_date, student_id]
+
+            where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+            query = f"""
+            SELECT s.*, c.course_name
+            FROM students s
+            LEFT JOIN courses c ON s.course_id = c.course_id
+            {where}
+            ORDER BY s.admission_date {direction}, s.student_id {direction}
+            LIMIT %s
+            """
+            # One extra row tells us whether another page exists
+            params.append(limit + 1)
+
+            with self.pool.cursor() as cursor:
+                cursor.execute(query, params)
+                rows = cursor.fetchall()
+
+            next_key = None
+            if len(rows) > limit:
+                rows = rows[:limit]
+                next_key = (rows[-1]["admission_date"], rows[-1]["student_id"])
+
+            total = None
+            if not after_key:
+                total = len(rows) if next_key is None else self.estimate_student_count(filters, raise_errors)
+
+            return {"rows": rows, "next_key": next_key, "total": total}
+        except Exception as e:
+            if raise_errors:
+                raise
+            print(f"Error fetching students page: {e}")
+            return {"rows": [], "next_key": None, "total": 0}
+
+    @timed
+    def estimate_student_count(self, filters=None, raise_errors=False):
+        """Estimate the number of students matching filters - parameterized query
+
+        Unfiltered counts come from InnoDB table statistics so they cost no scan;
+        filtered counts are exact and rely on the students indexes.
+        """
+        try:
+            with self.pool.cursor() as cursor:
+                if not filters:
+                    estimate = self.backend.estimate_rows(cursor, "students")
+                    if estimate:
+                        return estimate
+
+                conditions, params = self._student_filter_sql(filters)
+                where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+                cursor.execute(f"SELECT COUNT(*) as count FROM students s {where}", params)
+                return cursor.fetchone()['count']
         except Exception as e:
+            if raise_errors:
+                raise
+            print(f"Error counting students: {e}")
+            return 0
+
+    def _student_filter_sql(self, filters):
+        """Translate a filters dict into whitelisted WHERE conditions and params"""
+        columns = {"course_id": "s.course_id", "status": "s.status", "gender": "s.gender"}
+        conditions, params = [], []
+        for key, value in (filters or {}).items():
+            if key not in columns:
+                raise ValueError(f"Unsupported student filter: {key}")
+            if value is not None:
+                conditions.append(f"{columns[key]} = %s")
+                params.append(value)
+        return conditions, params
+
+    @timed
+    def search_students(self, search_term, filter_by="all", limit=50, raise_errors=False):
+        """Search students by prefix / full-text match, best matches first - parameterized query
+
+        filter_by is "all" or one of search.SEARCH_COLUMNS. Single columns use a
+        prefix range scan on their index; "all" unions a student_id prefix scan
+        with a ranked FULLTEXT match over names and email.
+        """
+        try:
+            term = search_term.strip()
+            if not term:
+                return []
+            if filter_by != "all" and filter_by not in SEARCH_COLUMNS:
+                raise ValueError(f"Unsupported search column: {filter_by}")
+
+            with self.pool.cursor() as cursor:
+                if filter_by == "all":
+                    cursor.execute(*all_fields_query(self.backend, term, limit))
+                else:
+                    # filter_by is whitelisted above, so it is safe to interpolate
+                    query = f"""
+                    SELECT s.*, c.course_name
+                    FROM students s
+                    LEFT JOIN courses c ON s.course_id = c.course_id
+                    WHERE s.{filter_by} LIKE %s{self.backend.like_escape}
+                    ORDER BY s.{filter_by}
+                    LIMIT %s
+                    """
+                    cursor.execute(query, (prefix_pattern(term), limit))
+
+                return cursor.fetchall()
+        except Exception as e:
+            if raise_errors:
+                raise
             print(f"Search Error: {e}")
             return []
 
-    def get_student_by_id(self, student_id):
+    @timed
+    def get_student_by_id(self, student_id, raise_errors=False):
         """Get student by ID - parameterized query"""
         try:
             query = """
@@ -227,35 +411,39 @@ class Database:
             LEFT JOIN courses c ON s.course_id = c.course_id
             WHERE s.student_id = %s
             """
-            self.cursor.execute(query, (student_id,))
-            return self.cursor.fetchone()
+            with self.pool.cursor() as cursor:
+                cursor.execute(query, (student_id,))
+                return cursor.fetchone()
         except Exception as e:
+            if raise_errors:
+                raise
             print(f"Error: {e}")
             return None
 
+    @timed
     def generate_student_id(self):
-        """Generate unique student ID in format STU-YYYY0001"""
+        """Allocate a unique student ID in format STU-YYYY0001, or None on error"""
         try:
-            from datetime import datetime
-            year = datetime.now().year
+            return self.id_allocator.next_id()
+        except Exception as e:
+            print(f"ID Generation Error: {e}")
+            return None
 
-            query = "SELECT student_id FROM students WHERE student_id LIKE %s ORDER BY student_id DESC LIMIT 1"
-            self.cursor.execute(query, (f"STU-{year}%",))
-            result = self.cursor.fetchone()
+    @timed
+    def reserve_student_ids(self, count):
+        """Allocate count unique student IDs at once for bulk admissions
 
-            if result:
-                last_id = result['student_id']
-                number = int(last_id.split('-')[1][4:]) + 1
-            else:
-                number = 1
+        Raises on database errors so a bulk caller can abort before inserting.
+        """
+        return self.id_allocator.take(count)
 
-            new_id = f"STU-{year}{number:04d}"
-            return new_id
-        except Exception as e:
-            print(f"ID Generation Error: {e}")
-            return f"STU-{datetime.now().year}0001"
+    def _reserve_id_block(self, year, count):
+        # Autocommit upsert: the sequence row is locked only for this statement
+        with self.pool.cursor() as cursor:
+            return student_ids.reserve_block(cursor, self.backend, year, count)
 
     # CRUD Operations for Courses
+    @timed
     def add_course(self, course_data):
         """Add new course - parameterized query"""
         try:
@@ -263,14 +451,16 @@ class Database:
             INSERT INTO courses (course_name, course_code, description, duration_months, fees)
             VALUES (%s, %s, %s, %s, %s)
             """
-            self.cursor.execute(query, course_data)
-            self.connection.commit()
+            with self.pool.transaction() as cursor:
+                cursor.execute(query, course_data)
+            self._data_changed()
             return True, "Course added successfully!"
-        except pymysql.IntegrityError:
+        except self.backend.IntegrityError:
             return False, "Course already exists!"
         except Exception as e:
             return False, f"Error: {str(e)}"
 
+    @timed
     def update_course(self, course_id, course_data):
         """Update course - parameterized query"""
         try:
@@ -281,116 +471,236 @@ class Database:
             WHERE course_id=%s
             """
             data = course_data + (course_id,)
-            self.cursor.execute(query, data)
-            self.connection.commit()
+            with self.pool.transaction() as cursor:
+                cursor.execute(query, data)
+            self._data_changed()
             return True, "Course updated successfully!"
         except Exception as e:
             return False, f"Error: {str(e)}"
 
+    @timed
     def delete_course(self, course_id):
         """Delete course - parameterized query"""
         try:
             query = "DELETE FROM courses WHERE course_id=%s"
-            self.cursor.execute(query, (course_id,))
-            self.connection.commit()
+            with self.pool.transaction() as cursor:
+                cursor.execute(query, (course_id,))
+            self._data_changed()
             return True, "Course deleted successfully!"
         except Exception as e:
             return False, f"Error: {str(e)}"
 
-    def get_all_courses(self):
+    @timed
+    def get_all_courses(self, raise_errors=False):
         """Get all courses with student count"""
         try:
-            query = """
-            SELECT c.*, COUNT(s.student_id) as student_count
-            FROM courses c
-            LEFT JOIN students s ON c.course_id = s.course_id
-            GROUP BY c.course_id
-            ORDER BY c.course_name
-            """
-            self.cursor.execute(query)
-            return self.cursor.fetchall()
+            with self.pool.cursor() as cursor:
+                cursor.execute(ALL_COURSES_QUERY)
+                return cursor.fetchall()
         except Exception as e:
+            if raise_errors:
+                raise
             print(f"Error: {e}")
             return []
 
     # Attendance Operations
+    @timed
     def mark_attendance(self, attendance_data):
         """Mark attendance for students - parameterized query"""
         try:
-            query = """
-            INSERT INTO attendance (student_id, course_id, attendance_date, status, remarks)
-            VALUES (%s, %s, %s, %s, %s)
-            ON DUPLICATE KEY UPDATE status=%s, remarks=%s
-            """
-            data = attendance_data + (attendance_data[3], attendance_data[4])
-            self.cursor.execute(query, data)
-            self.connection.commit()
+            with self.pool.transaction() as cursor:
+                self._write_attendance(cursor, [tuple(attendance_data)])
+            self._data_changed()
             return True, "Attendance marked successfully!"
         except Exception as e:
             return False, f"Error: {str(e)}"
 
-    def get_attendance_by_date(self, date, course_id=None):
+    @timed
+    def mark_attendance_bulk(self, rows, chunk_size=500, raise_errors=False):
+        """Mark attendance for a whole roll call in one transaction - parameterized query
+
+        rows are (student_id, course_id, attendance_date, status, remarks) tuples,
+        written as multi-row upserts of at most chunk_size rows each.
+        Returns (success, message, outcomes) where outcomes holds one
+        (student_id, saved, message) tuple per input row, in input order.
+        With raise_errors, a failed transaction raises instead of being
+        reported in outcomes, so callers can tell bad records from a bad database.
+        """
+        outcomes = [None] * len(rows)
+        valid = []
+
+        for i, row in enumerate(rows):
+            student_id = row[0] if row else None
+            if len(row) != 5 or not student_id or row[1] is None or row[2] is None:
+                outcomes[i] = (student_id, False, "Incomplete attendance record")
+            elif row[3] not in ("Present", "Absent"):
+                outcomes[i] = (student_id, False, f"Invalid status: {row[3]}")
+            else:
+                valid.append(i)
+
+        if valid:
+            try:
+                with self.pool.transaction() as cursor:
+                    self._write_attendance(cursor, [tuple(rows[i]) for i in valid], chunk_size)
+            except Exception as e:
+                if raise_errors:
+                    raise
+                for i in valid:
+                    outcomes[i] = (rows[i][0], False, f"Error: {str(e)}")
+                return False, f"Error: {str(e)}", outcomes
+
+            self._data_changed()
+            for i in valid:
+                outcomes[i] = (rows[i][0], True, "Attendance marked")
+
+        saved = len(valid)
+        if saved == len(rows):
+            return True, f"Attendance saved for {saved} students!", outcomes
+        return False, f"Attendance saved for {saved} of {len(rows)} students", outcomes
+
+    def _write_attendance(self, cursor, rows, chunk_size=500):
+        """Upsert attendance rows and roll their effect into attendance_summary and attendance_totals
+
+        Runs inside the caller's transaction: the existing records are locked
+        first so the summary deltas match exactly what the upsert changes.
+        """
+        rows = attendance_summary.canonical_ids(cursor, rows, chunk_size)
+        existing = attendance_summary.lock_existing(cursor, rows, self.backend, chunk_size)
+        deltas = attendance_summary.summary_deltas(existing, rows)
+
+        upsert = self.backend.upsert(
+            ("student_id", "attendance_date"),
+            status=self.backend.new("status"),
+            remarks=self.backend.new("remarks"),
+        )
+        query = f"""
+        INSERT INTO attendance (student_id, course_id, attendance_date, status, remarks)
+        VALUES (%s, %s, %s, %s, %s)
+        {upsert}
+        """
+        for start in range(0, len(rows), chunk_size):
+            cursor.executemany(query, rows[start:start + chunk_size])
+
+        attendance_summary.apply_deltas(cursor, deltas, self.backend)
+
+    @timed
+    def rebuild_attendance_summary(self):
+        """Recompute the monthly attendance rollup and running totals from raw attendance (backfill)"""
+        try:
+            with self.pool.transaction() as cursor:
+                attendance_summary.rebuild(cursor, self.backend)
+                attendance_summary.rebuild_totals(cursor, self.backend)
+            self._data_changed()
+            return True, "Attendance summary rebuilt successfully!"
+        except Exception as e:
+            return False, f"Error: {str(e)}"
+
+    @timed
+    def get_attendance_by_date(self, date, course_id=None, raise_errors=False):
         """Get attendance records by date - parameterized query"""
         try:
-            if course_id:
-                query = """
-                SELECT a.*, s.first_name, s.last_name, c.course_name
-                FROM attendance a
-                JOIN students s ON a.student_id = s.student_id
-                JOIN courses c ON a.course_id = c.course_id
-                WHERE a.attendance_date = %s AND a.course_id = %s
-                """
-                self.cursor.execute(query, (date, course_id))
-            else:
-                query = """
-                SELECT a.*, s.first_name, s.last_name, c.course_name
-                FROM attendance a
-                JOIN students s ON a.student_id = s.student_id
-                JOIN courses c ON a.course_id = c.course_id
-                WHERE a.attendance_date = %s
-                """
-                self.cursor.execute(query, (date,))
-
-            return self.cursor.fetchall()
+            with self.pool.cursor() as cursor:
+                if course_id:
+                    query = """
+                    SELECT a.*, s.first_name, s.last_name, c.course_name
+                    FROM attendance a
+                    JOIN students s ON a.student_id = s.student_id
+                    JOIN courses c ON a.course_id = c.course_id
+                    WHERE a.attendance_date = %s AND a.course_id = %s
+                    """
+                    cursor.execute(query, (date, course_id))
+                else:
+                    query = """
+                    SELECT a.*, s.first_name, s.last_name, c.course_name
+                    FROM attendance a
+                    JOIN students s ON a.student_id = s.student_id
+                    JOIN courses c ON a.course_id = c.course_id
+                    WHERE a.attendance_date = %s
+                    """
+                    cursor.execute(query, (date,))
+
+                return cursor.fetchall()
         except Exception as e:
+            if raise_errors:
+                raise
             print(f"Error: {e}")
             return []
 
-    def get_student_attendance(self, student_id):
+    @timed
+    def get_roster(self, course_id, date=None, status="Active", raise_errors=False):
+        """Get a course's students with their attendance on date - parameterized query
+
+        Only the columns the attendance dialog needs are selected, served by
+        idx_students_roster; attendance_status and remarks are None for
+        students not yet marked on date (or when date is None).
+        """
+        try:
+            with self.pool.cursor() as cursor:
+                if date:
+                    query = """
+                    SELECT s.student_id, s.first_name, s.last_name,
+                           a.status AS attendance_status, a.remarks
+                    FROM students s
+                    LEFT JOIN attendance a
+                        ON a.student_id = s.student_id AND a.attendance_date = %s
+                    WHERE s.course_id = %s AND s.status = %s
+                    ORDER BY s.last_name, s.first_name
+                    """
+                    cursor.execute(query, (date, course_id, status))
+                else:
+                    query = """
+                    SELECT s.student_id, s.first_name, s.last_name,
+                           NULL AS attendance_status, NULL AS remarks
+                    FROM students s
+                    WHERE s.course_id = %s AND s.status = %s
+                    ORDER BY s.last_name, s.first_name
+                    """
+                    cursor.execute(query, (course_id, status))
+
+                return cursor.fetchall()
+        except Exception as e:
+            if raise_errors:
+                raise
+            print(f"Error fetching roster: {e}")
+            return []
+
+    @timed
+    def get_student_attendance(self, student_id, raise_errors=False):
         """Get attendance percentage for a student - parameterized query"""
         try:
             query = """
-            SELECT 
-                COUNT(*) as total,
-                SUM(CASE WHEN status = 'Present' THEN 1 ELSE 0 END) as present
-            FROM attendance
+            SELECT SUM(total) as total, SUM(present) as present
+            FROM attendance_summary
             WHERE student_id = %s
             """
-            self.cursor.execute(query, (student_id,))
-            result = self.cursor.fetchone()
+            with self.pool.cursor() as cursor:
+                cursor.execute(query, (student_id,))
+                result = cursor.fetchone()
 
-            if result and result['total'] > 0:
+            if result and result['total']:
                 percentage = (result['present'] / result['total']) * 100
                 return percentage
             return 0
         except Exception as e:
+            if raise_errors:
+                raise
             print(f"Error: {e}")
             return 0
 
+    @timed
     def get_course_attendance(self, course_id):
         """Get attendance statistics for a course - parameterized query"""
         try:
             query = """
-            SELECT 
-                COUNT(*) as total,
-                SUM(CASE WHEN status = 'Present' THEN 1 ELSE 0 END) as present
-            FROM attendance
+            SELECT SUM(total) as total, SUM(present) as present
+            FROM attendance_summary
             WHERE course_id = %s
             """
-            self.cursor.execute(query, (course_id,))
-            result = self.cursor.fetchone()
+            with self.pool.cursor() as cursor:
+                cursor.execute(query, (course_id,))
+                result = cursor.fetchone()
 
-            if result and result['total'] > 0:
+            if result and result['total']:
                 percentage = (result['present'] / result['total']) * 100
                 return percentage
             return 0
@@ -398,90 +708,135 @@ class Database:
             print(f"Error: {e}")
             return 0
 
+    @timed
     def get_attendance_full_by_date_range(self, start_date, end_date):
         """
         Get attendance records between start_date and end_date (inclusive)
         with full data: Student Name, Course Name, etc.
         """
         try:
-            query = """
-                SELECT 
-                    a.student_id,
-                    CONCAT(s.first_name, ' ', s.last_name) AS student_name,
-                    c.course_name,
-                    a.attendance_date,
-                    a.status,
-                    a.remarks
-                FROM attendance a
-                JOIN students s ON a.student_id = s.student_id
-                JOIN courses c ON a.course_id = c.course_id
-                WHERE a.attendance_date BETWEEN %s AND %s
-                ORDER BY a.attendance_date, a.student_id
-            """
-            self.cursor.execute(query, (start_date, end_date))
-            return self.cursor.fetchall()
+            with self.pool.cursor() as cursor:
+                cursor.execute(self._attendance_range_query(), (start_date, end_date))
+                return cursor.fetchall()
         except Exception as e:
             print(f"Error fetching full attendance by date range: {e}")
             return []
 
     # Dashboard Statistics
-    def get_dashboard_stats(self):
-        """Get statistics for dashboard"""
+    @timed
+    def get_dashboard_stats(self, refresh=False, raise_errors=False):
+        """Get statistics for dashboard (cached for CACHE_CONFIG["dashboard_ttl"] seconds)"""
+        stats = None if refresh else self.cache.get("dashboard_stats")
+        if stats is not None:
+            return stats
+
         try:
+            generation = self.cache.generation
             stats = {}
 
-            # Total students
-            self.cursor.execute("SELECT COUNT(*) as count FROM students")
-            stats['total_students'] = self.cursor.fetchone()['count']
-
-            # Total courses
-            self.cursor.execute("SELECT COUNT(*) as count FROM courses")
-            stats['total_courses'] = self.cursor.fetchone()['count']
-
-            # Active students
-            self.cursor.execute("SELECT COUNT(*) as count FROM students WHERE status='Active'")
-            stats['active_students'] = self.cursor.fetchone()['count']
-
-            # Overall attendance rate
-            self.cursor.execute("""
-                SELECT 
-                    COUNT(*) as total,
-                    SUM(CASE WHEN status = 'Present' THEN 1 ELSE 0 END) as present
-                FROM attendance
-            """)
-            result = self.cursor.fetchone()
-            if result and result['total'] > 0:
-                stats['attendance_rate'] = round((result['present'] / result['total']) * 100, 2)
-            else:
-                stats['attendance_rate'] = 0
-
-            # Students by course
-            self.cursor.execute("""
-                SELECT c.course_name, COUNT(s.student_id) as count
-                FROM courses c
-                LEFT JOIN students s ON c.course_id = s.course_id
-                GROUP BY c.course_id, c.course_name
-            """)
-            stats['students_by_course'] = self.cursor.fetchall()
-
-            # Monthly admissions
-            self.cursor.execute("""
-                SELECT 
-                    DATE_FORMAT(admission_date, '%Y-%m') as month,
-                    COUNT(*) as count
-                FROM students
-                WHERE admission_date >= DATE_SUB(CURDATE(), INTERVAL 12 MONTH)
-                GROUP BY month
-                ORDER BY month
-            """)
-            stats['monthly_admissions'] = self.cursor.fetchall()
+            with self.pool.cursor() as cursor:
+                # Every scalar in one round trip: one pass per table via conditional aggregates
+                cursor.execute("""
+                    SELECT st.total_students, st.active_students, co.total_courses,
+                           att.attendance_total, att.attendance_present
+                    FROM (
+                        SELECT COUNT(*) as total_students,
+                               SUM(CASE WHEN status = 'Active' THEN 1 ELSE 0 END) as active_students
+                        FROM students
+                    ) st
+                    CROSS JOIN (SELECT COUNT(*) as total_courses FROM courses) co
+                    CROSS JOIN (
+                        SELECT SUM(total) as attendance_total, SUM(present) as attendance_present
+                        FROM attendance_totals
+                    ) att
+                """)
+                result = cursor.fetchone()
+                stats['total_students'] = int(result['total_students'] or 0)
+                stats['total_courses'] = int(result['total_courses'] or 0)
+                stats['active_students'] = int(result['active_students'] or 0)
+
+                # Overall attendance rate
+                if result['attendance_total']:
+                    stats['attendance_rate'] = round(
+                        (result['attendance_present'] / result['attendance_total']) * 100, 2
+                    )
+                else:
+                    stats['attendance_rate'] = 0
+
+                # Both chart series in a second round trip: students by course, monthly admissions
+                cursor.execute(f"""
+                    SELECT 'course' as series, c.course_name as label, COUNT(s.student_id) as count
+                    FROM courses c
+                    LEFT JOIN students s ON c.course_id = s.course_id
+                    GROUP BY c.course_id, c.course_name
+                    UNION ALL
+                    SELECT 'month' as series, month as label, count
+                    FROM (
+                        SELECT 
+                            {self.backend.month("admission_date")} as month,
+                            COUNT(*) as count
+                        FROM students
+                        WHERE admission_date >= {self.backend.months_ago(12)}
+                        GROUP BY month
+                    ) monthly
+                """)
+                series = cursor.fetchall()
+
+            stats['students_by_course'] = [
+                {"course_name": r['label'], "count": r['count']} for r in series if r['series'] == 'course'
+            ]
+            stats['monthly_admissions'] = sorted(
+                ({"month": r['label'], "count": r['count']} for r in series if r['series'] == 'month'),
+                key=lambda r: r['month']
+            )
 
+            self.cache.set("dashboard_stats", stats, generation)
             return stats
         except Exception as e:
+            if raise_errors:
+                raise
             print(f"Stats Error: {e}")
             return {}
 
+    def _attendance_range_query(self):
+        return ATTENDANCE_RANGE_QUERY.format(
+            student_name=self.backend.concat("s.first_name", "' '", "s.last_name")
+        )
+
+    def _data_changed(self):
+        """Drop cached aggregates after a write to students, courses or attendance"""
+        self.cache.invalidate("dashboard_stats")
+
+    # Streaming reads for exports (generators, so timed per statement rather than per call)
+    def iter_students(self, chunk_size=1000):
+        """Stream every student (as get_all_students) in lists of up to chunk_size rows
+
+        Unlike the get_* methods, errors are raised so that a failed export
+        can't pass for an empty one.
+        """
+        return self._stream(ALL_STUDENTS_QUERY, None, chunk_size)
+
+    def iter_courses(self, chunk_size=1000):
+        """Stream every course (as get_all_courses) in lists of up to chunk_size rows"""
+        return self._stream(ALL_COURSES_QUERY, None, chunk_size)
+
+    def iter_attendance_by_date_range(self, start_date, end_date, chunk_size=1000):
+        """Stream attendance (as get_attendance_full_by_date_range) in lists of up to chunk_size rows"""
+        return self._stream(self._attendance_range_query(), (start_date, end_date), chunk_size)
+
+    def _stream(self, query, params, chunk_size):
+        # Unbuffered cursor: rows cross the wire as they are fetched, never all at once.
+        # The borrowed connection stays checked out until the generator is exhausted or closed.
+        with self.pool.cursor(self.backend.stream_cursorclass) as cursor:
+            cursor.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield rows
+
     # User Authentication
+    @timed
     def add_user(self, user_data):
         """Add new user - parameterized query"""
         try:
@@ -489,47 +844,83 @@ class Database:
             INSERT INTO users (username, email, password_hash, full_name, role)
             VALUES (%s, %s, %s, %s, %s)
             """
-            self.cursor.execute(query, user_data)
-            self.connection.commit()
+            with self.pool.transaction() as cursor:
+                cursor.execute(query, user_data)
             return True, "User registered successfully!"
-        except pymysql.IntegrityError:
+        except self.backend.IntegrityError:
             return False, "Username or email already exists!"
         except Exception as e:
             return False, f"Error: {str(e)}"
 
+    @timed
     def authenticate_user(self, username, password_hash):
         """Authenticate user - parameterized query"""
         try:
             query = "SELECT * FROM users WHERE (username=%s OR email=%s) AND password_hash=%s"
-            self.cursor.execute(query, (username, username, password_hash))
-            return self.cursor.fetchone()
+            with self.pool.cursor() as cursor:
+                cursor.execute(query, (username, username, password_hash))
+                return cursor.fetchone()
         except Exception as e:
             print(f"Auth Error: {e}")
             return None
 
+    @timed
     def get_user_by_email(self, email):
         """Get user by email - parameterized query"""
         try:
             query = "SELECT * FROM users WHERE email=%s"
-            self.cursor.execute(query, (email,))
-            return self.cursor.fetchone()
+            with self.pool.cursor() as cursor:
+                cursor.execute(query, (email,))
+                return cursor.fetchone()
         except Exception as e:
             print(f"Error: {e}")
             return None
 
+    @timed
     def update_password(self, email, new_password_hash):
         """Update user password - parameterized query"""
         try:
             query = "UPDATE users SET password_hash=%s WHERE email=%s"
-            self.cursor.execute(query, (new_password_hash, email))
-            self.connection.commit()
+            with self.pool.transaction() as cursor:
+                cursor.execute(query, (new_password_hash, email))
             return True, "Password updated successfully!"
         except Exception as e:
             return False, f"Error: {str(e)}"
 
+    # Diagnostics
+    def metrics_snapshot(self):
+        """Recorded timings (see metrics.QueryMetrics.snapshot) plus backend and pool state"""
+        snapshot = self.metrics.snapshot()
+        snapshot["backend"] = self.backend.name
+        snapshot["pool"] = self.pool.stats() if self.pool else None
+        return snapshot
+
+    def dump_metrics(self, path=None):
+        """Write metrics_snapshot() as JSON to path (default METRICS_CONFIG["dump_path"])"""
+        path = path or METRICS_CONFIG["dump_path"]
+        if not path:
+            return False, "No metrics dump path configured"
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(self.metrics_snapshot(), f, indent=2, default=str)
+            return True, f"Metrics written to {path}"
+        except Exception as e:
+            return False, f"Error writing metrics: {str(e)}"
+
+    def _explain(self, query, params):
+        # Plan for the slow-query log, on a second connection: the slow one may
+        # still be mid-transaction. Never waits for a busy pool, and bypasses
+        # the instrumentation so EXPLAINs are not counted as queries.
+        with self.pool.connection(timeout=0) as conn:
+            raw = conn.connection if isinstance(conn, InstrumentedConnection) else conn
+            cursor = raw.cursor()
+            try:
+                cursor.execute(self.backend.explain_prefix + query, params)
+                return cursor.fetchall()
+            finally:
+                cursor.close()
+
     def close(self):
-        """Close database connection"""
-        if self.cursor:
-            self.cursor.close()
-        if self.connection:
-            self.connection.close()
+        """Close all pooled database connections"""
+        if self.pool:
+            self.pool.close()
@@ -0,0 +1,356 @@
+"""
+Report Exporters for Student Management System
+Stream datasets from Database into files without holding them in memory
+"""
+
+import csv
+import gzip
+import os
+import tempfile
+
+# Rows fetched from the server-side cursor per round trip
+CHUNK_SIZE = 2000
+
+# Column widths are clamped so one long address can't blow up a sheet
+MAX_COLUMN_WIDTH = 60
+
+# Rows an Excel export holds back to size its columns from; a write-only
+# sheet fixes its widths before the first row goes out
+WIDTH_SAMPLE_ROWS = 20000
+
+
+class ExportCancelled(Exception):
+    """Raised from a progress callback to stop an export part-way"""
+
+
+# Each dataset: sheet title, header colour, its columns as (header, field
+# name, type) for the columnar formats, the Database iterator that streams
+# it and how a database row maps onto an output row
+DATASETS = {
+    "students": {
+        "title": "Students",
+        "color": "1f538d",
+        "columns": [
+            ("Student ID", "student_id", "string"),
+            ("First Name", "first_name", "string"),
+            ("Last Name", "last_name", "string"),
+            ("Gender", "gender", "string"),
+            ("DOB", "dob", "date"),
+            ("Email", "email", "string"),
+            ("Phone", "phone", "string"),
+            ("Address", "address", "string"),
+            ("Course", "course_name", "string"),
+            ("Admission Date", "admission_date", "date"),
+            ("Status", "status", "string"),
+        ],
+        "source": lambda db, chunk_size: db.iter_students(chunk_size),
+        "row": lambda s: (
+            s["student_id"], s["first_name"], s["last_name"], s["gender"],
+            s["dob"], s["email"], s["phone"], s["address"],
+            s.get("course_name", "N/A"), s["admission_date"], s["status"]
+        ),
+    },
+    "courses": {
+        "title": "Courses",
+        "color": "14a085",
+        "columns": [
+            ("Course ID", "course_id", "int"),
+            ("Name", "course_name", "string"),
+            ("Code", "course_code", "string"),
+            ("Description", "description", "string"),
+            ("Duration (Months)", "duration_months", "int"),
+            ("Fees", "fees", "money"),
+            ("Students Enrolled", "student_count", "int"),
+        ],
+        "source": lambda db, chunk_size: db.iter_courses(chunk_size),
+        "row": lambda c: (
+            c["course_id"], c["course_name"], c["course_code"], c["description"],
+            c["duration_months"], c["fees"], c["student_count"]
+        ),
+    },
+    "attendance": {
+        "title": "Attendance",
+        "color": "f39c12",
+        "columns": [
+            ("Student ID", "student_id", "string"),
+            ("Student Name", "student_name", "string"),
+            ("Course", "course_name", "string"),
+            ("Date", "attendance_date", "date"),
+            ("Status", "status", "string"),
+            ("Remarks", "remarks", "string"),
+        ],
+        "source": lambda db, chunk_size, start_date, end_date: db.iter_attendance_by_date_range(
+            start_date, end_date, chunk_size
+        ),
+        "row": lambda a: (
+            a["student_id"], a["student_name"], a["course_name"],
+            a["attendance_date"], a["status"], a["remarks"]
+        ),
+    },
+}
+
+
+def export(db, dataset_name, path, fmt="xlsx", chunk_size=CHUNK_SIZE, progress=None, **params):
+    """Stream a dataset into a file at path in one of the FORMATS
+
+    params are passed on to the dataset's source (e.g. start_date/end_date).
+    progress(rows_so_far) is called after every chunk and may raise
+    ExportCancelled to abandon the file. Returns the number of data rows written.
+    """
+    dataset = DATASETS[dataset_name]
+    to_row = dataset["row"]
+    chunks = dataset["source"](db, chunk_size, **params)
+
+    writer = None
+    try:
+        writer = FORMATS[fmt](dataset, path)
+        count = 0
+        for chunk in chunks:
+            writer.write([to_row(r) for r in chunk])
+            count += len(chunk)
+            if progress:
+                progress(count)
+        writer.close()
+        return count
+    except BaseException:
+        if writer is not None:
+            writer.abort()
+        raise
+    finally:
+        # Hand the streaming connection back even if writing failed part-way
+        chunks.close()
+
+
+# ================= FORMATS =================
+
+class Exporter:
+    """A streaming file format; rows arrive one chunk at a time
+
+    Subclasses open a file at _stage() in __init__, append each chunk in
+    write(), finish it in close() and release whatever they hold in abort().
+    The staged file is written beside the target and only renamed over it by
+    _commit() once complete, so a failed or cancelled export never touches
+    an existing file at path; _discard() throws it away.
+    """
+
+    label = ""
+    extension = ""
+
+    def __init__(self, dataset, path):
+        self.dataset = dataset
+        self.path = path
+
+    def write(self, rows):
+        raise NotImplementedError
+
+    def close(self):
+        raise NotImplementedError
+
+    def abort(self):
+        raise NotImplementedError
+
+    def _stage(self):
+        fd, self.tmp_path = tempfile.mkstemp(
+            prefix=".", suffix=f"{self.extension}.part", dir=os.path.dirname(os.path.abspath(self.path))
+        )
+        os.close(fd)
+        return self.tmp_path
+
+    def _commit(self):
+        os.replace(self.tmp_path, self.path)
+
+    def _discard(self):
+        try:
+            os.remove(self.tmp_path)
+        except OSError:
+            pass
+
+class XlsxExporter(Exporter):
+    """Styled Excel sheet through a write-only workbook"""
+
+    label = "Excel"
+    extension = ".xlsx"
+
+    def __init__(self, dataset, path):
+        super().__init__(dataset, path)
+        # openpyxl is imported on first use so the app can start without it
+        import openpyxl
+
+        self.wb = openpyxl.Workbook(write_only=True)
+        self.ws = self.wb.create_sheet(dataset["title"])
+        self.started = False
+        self.sample = []
+        self._stage()
+
+    def write(self, rows):
+        if self.started:
+            for row in rows:
+                self.ws.append(row)
+            return
+
+        self.sample.extend(rows)
+        if len(self.sample) >= WIDTH_SAMPLE_ROWS:
+            self._start()
+
+    def close(self):
+        if not self.started:
+            self._start()
+        self.wb.save(self.tmp_path)
+        self._commit()
+
+    def abort(self):
+        # Rows of a write-only sheet are spooled to a temp file that only
+        # save() releases; save the partial workbook and throw it away
+        try:
+            self.wb.save(self.tmp_path)
+        except Exception:
+            pass
+        finally:
+            self._discard()
+
+    def _start(self):
+        # A write-only sheet emits <cols> before the first row, so widths are
+        # sized from the header and the first WIDTH_SAMPLE_ROWS rows (the
+        # whole sheet for most reports), then frozen.
+        from openpyxl.utils import get_column_letter
+
+        headers = [c[0] for c in self.dataset["columns"]]
+        widths = [len(h) for h in headers]
+        _grow_widths(widths, self.sample)
+        for i, width in enumerate(widths, 1):
+            self.ws.column_dimensions[get_column_letter(i)].width = min(width, MAX_COLUMN_WIDTH) + 2
+
+        self.ws.append(_header_cells(self.ws, headers, self.dataset["color"]))
+        for row in self.sample:
+            self.ws.append(row)
+        self.sample = []
+        self.started = True
+
+
+class CsvExporter(Exporter):
+    """Plain UTF-8 CSV with a header row"""
+
+    label = "CSV"
+    extension = ".csv"
+
+    def __init__(self, dataset, path):
+        super().__init__(dataset, path)
+        self.file = self._open(self._stage())
+        self.writer = csv.writer(self.file)
+        self.writer.writerow([c[0] for c in dataset["columns"]])
+
+    def _open(self, path):
+        return open(path, "w", newline="", encoding="utf-8")
+
+    def write(self, rows):
+        self.writer.writerows(rows)
+
+    def close(self):
+        self.file.close()
+        self._commit()
+
+    def abort(self):
+        try:
+            self.file.close()
+        finally:
+            self._discard()
+
+
+class GzipCsvExporter(CsvExporter):
+    """CSV compressed on the fly"""
+
+    label = "CSV (gzip)"
+    extension = ".csv.gz"
+
+    def _open(self, path):
+        return gzip.open(path, "wt", newline="", encoding="utf-8", compresslevel=6)
+
+
+class ArrowExporter(Exporter):
+    """Arrow IPC file, one record batch per chunk"""
+
+    label = "Arrow IPC"
+    extension = ".arrow"
+
+    def __init__(self, dataset, path):
+        super().__init__(dataset, path)
+        # pyarrow is heavy; only pay for the import when a columnar export runs
+        import pyarrow as pa
+
+        self.pa = pa
+        types = {
+            "string": pa.string(),
+            "int": pa.int64(),
+            "date": pa.date32(),
+            "money": pa.decimal128(10, 2),
+        }
+        self.schema = pa.schema([(field, types[kind]) for _, field, kind in dataset["columns"]])
+        self.writer = self._open(self._stage())
+
+    def _open(self, path):
+        return self.pa.ipc.new_file(path, self.schema)
+
+    def write(self, rows):
+        if not rows:
+            return
+        columns = zip(*rows)
+        arrays = [self.pa.array(values, type=f.type) for values, f in zip(columns, self.schema)]
+        self.writer.write_batch(self.pa.RecordBatch.from_arrays(arrays, schema=self.schema))
+
+    def close(self):
+        self.writer.close()
+        self._commit()
+
+    def abort(self):
+        try:
+            self.writer.close()
+        finally:
+            self._discard()
+
+
+class ParquetExporter(ArrowExporter):
+    """Parquet file, one row group per chunk"""
+
+    label = "Parquet"
+    extension = ".parquet"
+
+    def _open(self, path):
+        import pyarrow.parquet as pq
+
+        return pq.ParquetWriter(path, self.schema, compression="zstd")
+
+
+FORMATS = {
+    "xlsx": XlsxExporter,
+    "csv": CsvExporter,
+    "csv.gz": GzipCsvExporter,
+    "parquet": ParquetExporter,
+    "arrow": ArrowExporter,
+}
+
+
+# ================= XLSX HELPERS =================
+
+def _header_cells(ws, headers, color):
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font, PatternFill, Alignment
+
+    fill = PatternFill(start_color=color, end_color=color, fill_type="solid")
+    font = Font(bold=True, color="FFFFFF")
+    alignment = Alignment(horizontal="center")
+
+    cells = []
+    for h in headers:
+        cell = WriteOnlyCell(ws, value=h)
+        cell.font = font
+        cell.fill = fill
+        cell.alignment = alignment
+        cells.append(cell)
+    return cells
+
+
+def _grow_widths(widths, rows):
+    for row in rows:
+        for i, value in enumerate(row):
+            if value is not None:
+                widths[i] = max(widths[i], len(str(value)))
@@ -0,0 +1,272 @@
+"""
+Bulk Student Import for Student Management System
+Streams CSV/XLSX rows through validation into chunked multi-row inserts
+"""
+
+import csv
+import gzip
+import re
+import time
+from datetime import date, datetime
+
+# Valid rows inserted per transaction (and per block of reserved student IDs)
+CHUNK_SIZE = 500
+
+# Normalized header -> student field. Headers are matched case-insensitively
+# with spaces as underscores, so a Students export can be imported back.
+HEADER_ALIASES = {
+    "first_name": "first_name",
+    "last_name": "last_name",
+    "gender": "gender",
+    "dob": "dob",
+    "date_of_birth": "dob",
+    "email": "email",
+    "phone": "phone",
+    "address": "address",
+    "course": "course",
+    "course_code": "course",
+    "course_name": "course",
+    "admission_date": "admission_date",
+    "status": "status",
+}
+
+REQUIRED_FIELDS = ("first_name", "last_name", "gender", "dob")
+
+GENDERS = {"m": "Male", "male": "Male", "f": "Female", "female": "Female", "o": "Other", "other": "Other"}
+STATUSES = ("Active", "Inactive", "Graduated")
+DATE_FORMATS = ("%Y-%m-%d", "%d/%m/%Y", "%d-%m-%Y")
+EMAIL_PATTERN = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+
+# Column limits from the students table
+MAX_LENGTHS = {"first_name": 50, "last_name": 50, "email": 100, "phone": 15}
+
+
+class ImportFileError(Exception):
+    """Raised when a file can't be imported at all (unknown type, bad header, courses unreadable)"""
+
+
+# ================= PARSE =================
+
+def read_rows(path):
+    """Yield (line_number, {field: raw value}) for every non-blank data row"""
+    rows = _xlsx_rows(path) if path.lower().endswith(".xlsx") else _csv_rows(path)
+    header = next(rows, None)
+    if header is None:
+        raise ImportFileError("The file is empty")
+
+    fields = [HEADER_ALIASES.get(_header_key(h)) for h in header]
+    missing = [f for f in REQUIRED_FIELDS if f not in fields]
+    if missing:
+        raise ImportFileError(f"Missing required columns: {', '.join(missing)}")
+
+    for line, values in enumerate(rows, 2):
+        if not any(v not in (None, "") for v in values):
+            continue
+        yield line, {f: v for f, v in zip(fields, values) if f is not None}
+
+
+def _header_key(value):
+    return str(value or "").strip().lower().replace(" ", "_")
+
+
+def _csv_rows(path):
+    if path.lower().endswith(".csv.gz"):
+        f = gzip.open(path, "rt", newline="", encoding="utf-8-sig")
+    elif path.lower().endswith(".csv"):
+        f = open(path, newline="", encoding="utf-8-sig")
+    else:
+        raise ImportFileError("Unsupported file type (use .csv, .csv.gz or .xlsx)")
+    with f:
+        yield from csv.reader(f)
+
+
+def _xlsx_rows(path):
+    # Read-only workbooks stream rows from the zip instead of loading the sheet;
+    # openpyxl is imported here so the app can start without it
+    import openpyxl
+
+    wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        yield from wb.worksheets[0].iter_rows(values_only=True)
+    finally:
+        wb.close()
+
+
+# ================= VALIDATE =================
+
+class RowValidator:
+    """Turns raw rows into add_student field tuples (without the student ID)
+
+    Courses are resolved by code or name against a map built once per
+    import; emails must be unique within the file.
+    """
+
+    def __init__(self, courses, today=None):
+        self.courses = {}
+        for c in courses:
+            self.courses[str(c["course_name"]).strip().lower()] = c["course_id"]
+            self.courses[str(c["course_code"]).strip().lower()] = c["course_id"]
+        self.today = today or date.today()
+        self.emails = set()
+
+    def validate(self, raw):
+        """Normalized (first_name, ..., status) tuple; raises ValueError with the reason"""
+        first_name = _text(raw.get("first_name"))
+        last_name = _text(raw.get("last_name"))
+        if not first_name or not last_name:
+            raise ValueError("First and last name are required")
+
+        gender = GENDERS.get((_text(raw.get("gender")) or "").lower())
+        if gender is None:
+            raise ValueError(f"Invalid gender: {raw.get('gender')!r}")
+
+        dob = _date(raw.get("dob"), "date of birth")
+        if dob is None:
+            raise ValueError("Date of birth is required")
+        if dob >= self.today:
+            raise ValueError(f"Date of birth is not in the past: {dob}")
+
+        email = _text(raw.get("email"))
+        if email:
+            email = email.lower()
+            if not EMAIL_PATTERN.match(email):
+                raise ValueError(f"Invalid email: {email}")
+            if email in self.emails:
+                raise ValueError(f"Email repeated in the file: {email}")
+
+        phone = _text(raw.get("phone"))
+        for field, value in (("first_name", first_name), ("last_name", last_name),
+                             ("email", email), ("phone", phone)):
+            if value and len(value) > MAX_LENGTHS[field]:
+                raise ValueError(f"{field} longer than {MAX_LENGTHS[field]} characters")
+
+        course_id = None
+        course = _text(raw.get("course"))
+        if course:
+            course_id = self.courses.get(course.lower())
+            if course_id is None:
+                raise ValueError(f"Unknown course: {course}")
+
+        admission_date = _date(raw.get("admission_date"), "admission date") or self.today
+
+        status = (_text(raw.get("status")) or "Active").capitalize()
+        if status not in STATUSES:
+            raise ValueError(f"Invalid status: {raw.get('status')!r}")
+
+        if email:
+            self.emails.add(email)
+        return (
+            first_name, last_name, gender, dob, email, phone,
+            _text(raw.get("address")), course_id, admission_date, None, status
+        )
+
+
+def _text(value):
+    if value is None:
+        return None
+    if isinstance(value, float) and value.is_integer():
+        # Excel stores phone numbers typed without quotes as numbers
+        value = int(value)
+    return str(value).strip() or None
+
+
+def _date(value, label):
+    if value in (None, ""):
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    text = str(value).strip()
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).date()
+        except ValueError:
+            pass
+    raise ValueError(f"Invalid {label}: {text!r} (use YYYY-MM-DD)")
+
+
+# ================= IMPORT =================
+
+class ImportResult:
+    """Outcome of an import: counts, rejected rows and throughput"""
+
+    def __init__(self):
+        self.inserted = 0
+        self.rejected = []  # (line, reason, raw row)
+        self.seconds = 0.0
+
+    @property
+    def processed(self):
+        return self.inserted + len(self.rejected)
+
+    @property
+    def rows_per_minute(self):
+        return self.processed / self.seconds * 60 if self.seconds else 0.0
+
+    def summary(self):
+        return (
+            f"{self.inserted} students imported, {len(self.rejected)} rows rejected "
+            f"in {self.seconds:.1f}s ({self.rows_per_minute:,.0f} rows/min)"
+        )
+
+    def write_error_report(self, path):
+        """CSV of rejected rows: line, reason and the values as read"""
+        fields = list(dict.fromkeys(HEADER_ALIASES.values()))
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["Line", "Error", *fields])
+            for line, reason, raw in self.rejected:
+                writer.writerow([line, reason, *(raw.get(field, "") for field in fields)])
+
+
+def import_students(db, path, chunk_size=CHUNK_SIZE, progress=None):
+    """Import every valid student row from a CSV/XLSX file
+
+    Rows are parsed and validated as they stream in; valid ones are given
+    IDs from one reserved block per chunk and inserted chunk by chunk.
+    progress(result) is called after each chunk. Raises ImportFileError if
+    the file can't be read at all, or the courses to match it against can't
+    be loaded; bad rows only land in result.rejected.
+    """
+    result = ImportResult()
+    started = time.perf_counter()
+    try:
+        courses = db.get_all_courses(raise_errors=True)
+    except Exception as e:
+        # An empty course list would reject every row as "Unknown course"
+        raise ImportFileError(f"Could not load courses: {e}") from e
+    validator = RowValidator(courses)
+
+    pending = []
+    for line, raw in read_rows(path):
+        try:
+            pending.append((line, raw, validator.validate(raw)))
+        except ValueError as e:
+            result.rejected.append((line, str(e), raw))
+
+        if len(pending) == chunk_size:
+            _flush(db, pending, result)
+            pending = []
+            result.seconds = time.perf_counter() - started
+            if progress:
+                progress(result)
+
+    if pending:
+        _flush(db, pending, result)
+    result.rejected.sort(key=lambda r: r[0])
+    result.seconds = time.perf_counter() - started
+    if progress:
+        progress(result)
+    return result
+
+
+def _flush(db, pending, result):
+    ids = db.reserve_student_ids(len(pending))
+    rows = [(student_id, *fields) for student_id, (_, _, fields) in zip(ids, pending)]
+    _, _, outcomes = db.add_students_bulk(rows, chunk_size=len(rows))
+    for (line, raw, _), (_, saved, msg) in zip(pending, outcomes):
+        if saved:
+            result.inserted += 1
+        else:
+            result.rejected.append((line, msg, raw))
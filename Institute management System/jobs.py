@@ -0,0 +1,130 @@
+"""
+Background Export Jobs for Student Management System
+Queue of report exports run on worker threads, each streaming over its own
+pooled database connection
+"""
+
+import itertools
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from exporters import export, ExportCancelled
+
+
+class ExportJob:
+    """One queued export and its live progress"""
+
+    QUEUED = "Queued"
+    RUNNING = "Running"
+    DONE = "Done"
+    EMPTY = "No data"
+    FAILED = "Failed"
+    CANCELLED = "Cancelled"
+
+    def __init__(self, job_id, dataset, path, fmt, params):
+        self.job_id = job_id
+        self.dataset = dataset
+        self.path = path
+        self.fmt = fmt
+        self.params = params
+
+        self.status = self.QUEUED
+        self.rows = 0
+        self.error = None
+        self.created_at = time.time()
+        self.finished_at = None
+        self._cancel = threading.Event()
+
+    @property
+    def active(self):
+        return self.status in (self.QUEUED, self.RUNNING)
+
+    @property
+    def filename(self):
+        return os.path.basename(self.path)
+
+    def cancel(self):
+        """Ask the job to stop; a queued job never starts, a running one stops at the next chunk"""
+        self._cancel.set()
+
+    def _progress(self, rows):
+        # Called by the exporter after every chunk, on the worker thread
+        self.rows = rows
+        if self._cancel.is_set():
+            raise ExportCancelled()
+
+
+class ExportJobQueue:
+    """Runs ExportJobs on a small worker pool and keeps the most recent ones"""
+
+    def __init__(self, db, max_workers=2, keep=20):
+        self.db = db
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ims-export")
+        self._ids = itertools.count(1)
+        self._jobs = deque(maxlen=keep)
+        self._lock = threading.Lock()
+
+    def submit(self, dataset, path, fmt="xlsx", **params):
+        """Queue an export of dataset to path; params go to the dataset source"""
+        job = ExportJob(next(self._ids), dataset, path, fmt, params)
+        with self._lock:
+            self._jobs.appendleft(job)
+        self._pool.submit(self._run, job)
+        return job
+
+    def recent(self):
+        """Most recent jobs first"""
+        with self._lock:
+            return list(self._jobs)
+
+    def has_active(self):
+        return any(job.active for job in self.recent())
+
+    def shutdown(self):
+        """Cancel every queued or running job and stop the workers"""
+        for job in self.recent():
+            job.cancel()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, job):
+        if job._cancel.is_set():
+            self._finish(job, ExportJob.CANCELLED)
+            return
+
+        job.status = ExportJob.RUNNING
+        # Exporters only write path once an export completes, so a failed or
+        # cancelled one leaves nothing behind; an empty one is removed unless
+        # it replaced a file that was already there
+        created = not os.path.exists(job.path)
+        try:
+            count = export(
+                self.db, job.dataset, job.path, job.fmt, progress=job._progress, **job.params
+            )
+        except ExportCancelled:
+            self._finish(job, ExportJob.CANCELLED)
+        except Exception as e:
+            job.error = str(e)
+            self._finish(job, ExportJob.FAILED)
+        else:
+            job.rows = count
+            if count:
+                self._finish(job, ExportJob.DONE)
+            else:
+                if created:
+                    self._discard(job.path)
+                self._finish(job, ExportJob.EMPTY)
+
+    @staticmethod
+    def _finish(job, status):
+        job.finished_at = time.time()
+        job.status = status
+
+    @staticmethod
+    def _discard(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -0,0 +1,98 @@
+"""
+Maintenance commands for Student Management System
+
+    python manage.py migrate          apply pending schema migrations
+    python manage.py check-indexes    EXPLAIN the hot queries and flag full scans
+    python manage.py rebuild-summary  recompute attendance_summary and attendance_totals
+    python manage.py import-students FILE [--errors REPORT.csv]
+                                      bulk-admit students from a CSV/XLSX file
+"""
+
+import argparse
+import sys
+
+from db import Database
+from migrations import explain_queries
+from importer import import_students, ImportFileError
+
+
+def cmd_migrate(db, args):
+    # initialize_database() already ran the pending migrations
+    print("✓ Schema is up to date")
+    return 0
+
+
+def cmd_check_indexes(db, args):
+    failures = 0
+    for method, sql, problems in explain_queries(db):
+        if problems:
+            failures += 1
+            print(f"✗ {method}: full scan of {', '.join(problems)}")
+            if args.verbose:
+                print(f"    {sql}")
+        else:
+            print(f"✓ {method}")
+    print(f"\n{failures} queries without index support" if failures else "\nAll queries use indexes")
+    return 1 if failures else 0
+
+
+def cmd_rebuild_summary(db, args):
+    success, msg = db.rebuild_attendance_summary()
+    print(("✓ " if success else "✗ ") + msg)
+    return 0 if success else 1
+
+
+def cmd_import_students(db, args):
+    if not args.path:
+        print("✗ import-students needs the file to import")
+        return 2
+    try:
+        result = import_students(
+            db, args.path,
+            progress=lambda r: print(f"  {r.processed} rows...", end="\r", flush=True)
+        )
+    except ImportFileError as e:
+        print(f"✗ {e}")
+        return 1
+
+    print(("✓ " if not result.rejected else "✗ ") + result.summary())
+    if result.rejected:
+        if args.errors:
+            result.write_error_report(args.errors)
+            print(f"  Rejected rows written to {args.errors}")
+        else:
+            for line, reason, _ in result.rejected[:20]:
+                print(f"  line {line}: {reason}")
+            if len(result.rejected) > 20:
+                print(f"  ... {len(result.rejected) - 20} more (use --errors to save them all)")
+    return 1 if result.rejected else 0
+
+
+COMMANDS = {
+    "migrate": cmd_migrate,
+    "check-indexes": cmd_check_indexes,
+    "rebuild-summary": cmd_rebuild_summary,
+    "import-students": cmd_import_students,
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Institute Management System maintenance")
+    parser.add_argument("command", choices=sorted(COMMANDS))
+    parser.add_argument("path", nargs="?", help="file to import (import-students)")
+    parser.add_argument("-v", "--verbose", action="store_true", help="show the offending SQL")
+    parser.add_argument("--errors", metavar="PATH", help="write rejected rows to PATH (import-students)")
+    args = parser.parse_args(argv)
+
+    db = Database()
+    if not db.initialize_database():
+        print("Failed to initialize database!")
+        return 1
+    try:
+        return COMMANDS[args.command](db, args)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
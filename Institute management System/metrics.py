@@ -0,0 +1,404 @@
+"""
+Query Instrumentation for Student Management System
+Latency histograms for SQL statements and timed operations (Database methods,
+screen builds), rows and bytes fetched, and a slow-query log with query plans
+"""
+
+import json
+import re
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from functools import wraps
+
+from cache import TTLCache
+
+# Upper bounds of the histogram buckets in milliseconds; a last, open bucket
+# catches anything slower
+BUCKET_BOUNDS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000)
+
+# Statements the backends can EXPLAIN without running them
+EXPLAINABLE = ("select", "insert", "update", "delete", "replace", "with")
+
+# Rows per fetch whose size is measured; bigger fetches are extrapolated
+BYTES_SAMPLE = 64
+
+# IN lists are built with one placeholder per value; collapsed so that every
+# chunk size counts as the same statement
+_PLACEHOLDER_RUN = re.compile(r"%s(?:\s*,\s*%s)+")
+
+
+def normalize_sql(query):
+    """Statement key: whitespace collapsed and placeholder lists shortened"""
+    return _PLACEHOLDER_RUN.sub("%s, ...", " ".join(query.split()))
+
+
+def row_bytes(row):
+    """Approximate payload size of a fetched row (text by length, other values 8 bytes)"""
+    size = 0
+    for value in (row.values() if isinstance(row, dict) else row):
+        if isinstance(value, (str, bytes, bytearray)):
+            size += len(value)
+        elif value is not None:
+            size += 8
+    return size
+
+
+def rows_bytes(rows):
+    """Approximate payload size of a fetch, from an even sample of at most BYTES_SAMPLE rows"""
+    if len(rows) <= BYTES_SAMPLE:
+        return sum(map(row_bytes, rows))
+    sample = rows[::len(rows) // BYTES_SAMPLE]
+    return sum(map(row_bytes, sample)) * len(rows) // len(sample)
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram; percentiles are bucket upper bounds"""
+
+    __slots__ = ("buckets", "count", "total_ms", "max_ms")
+
+    def __init__(self):
+        self.buckets = [0] * (len(BUCKET_BOUNDS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def add(self, ms):
+        self.buckets[bisect_left(BUCKET_BOUNDS_MS, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+
+    def percentile(self, fraction):
+        """Latency in ms below which fraction of the samples fall (0 when empty)"""
+        if not self.count:
+            return 0.0
+        wanted = fraction * self.count
+        seen = 0
+        for bound, n in zip(BUCKET_BOUNDS_MS, self.buckets):
+            seen += n
+            if seen >= wanted:
+                return float(min(bound, self.max_ms))
+        return self.max_ms
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "total_ms": round(self.total_ms, 3),
+            "mean_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "p50_ms": self.percentile(0.5),
+            "p95_ms": self.percentile(0.95),
+            "p99_ms": self.percentile(0.99),
+            "max_ms": round(self.max_ms, 3),
+            "buckets": {
+                (f"<={bound}" if i < len(BUCKET_BOUNDS_MS) else f">{BUCKET_BOUNDS_MS[-1]}"): n
+                for i, (bound, n) in enumerate(zip(BUCKET_BOUNDS_MS + (None,), self.buckets))
+                if n
+            },
+        }
+
+
+class _QueryStats:
+    __slots__ = ("latency", "rows", "bytes", "errors", "operations")
+
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.rows = 0
+        self.bytes = 0
+        self.errors = 0
+        self.operations = set()
+
+
+class _OperationStats:
+    __slots__ = ("latency", "errors")
+
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.errors = 0
+
+
+class QueryMetrics:
+    """Thread-safe registry of statement and operation timings
+
+    Statements are recorded by InstrumentedCursor and tagged with the
+    operation (see timer) running on the same thread. A statement slower than
+    slow_query_ms is added to the slow-query log with the plan returned by
+    explain(query, params); plans are cached per statement for explain_ttl
+    seconds. Parameters are used for the EXPLAIN only and never logged.
+    """
+
+    def __init__(self, enabled=True, slow_query_ms=200, slow_log_size=50,
+                 slow_log_path=None, explain_ttl=300, explain=None):
+        self.enabled = enabled
+        self.slow_query_ms = slow_query_ms
+        self.slow_log_path = slow_log_path
+        self.explain = explain
+        self.started_at = datetime.now()
+
+        self._queries = {}
+        self._operations = {}
+        self._slow = deque(maxlen=slow_log_size)
+        self._plans = TTLCache(explain_ttl)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._log_lock = threading.Lock()
+
+    # ================= RECORDING =================
+
+    @contextmanager
+    def timer(self, name):
+        """Time a with block as the operation name; statements it runs are tagged with it"""
+        if not self.enabled:
+            yield
+            return
+
+        stack = self._stack()
+        stack.append(name)
+        start = time.perf_counter()
+        failed = False
+        try:
+            yield
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            stack.pop()
+            ms = (time.perf_counter() - start) * 1000
+            with self._lock:
+                stats = self._operations.get(name)
+                if stats is None:
+                    stats = self._operations[name] = _OperationStats()
+                stats.latency.add(ms)
+                stats.errors += failed
+
+    def record_query(self, query, seconds, rows=0, nbytes=0, error=False, params=None):
+        """Add one statement execution; seconds runs from execute to the last fetch"""
+        key = normalize_sql(query)
+        stack = self._stack()
+        operation = stack[-1] if stack else None
+        ms = seconds * 1000
+
+        with self._lock:
+            stats = self._queries.get(key)
+            if stats is None:
+                stats = self._queries[key] = _QueryStats()
+            stats.latency.add(ms)
+            stats.rows += rows
+            stats.bytes += nbytes
+            stats.errors += error
+            if operation:
+                stats.operations.add(operation)
+
+        if ms >= self.slow_query_ms and not error:
+            self._log_slow(key, query, params, ms, rows, operation)
+
+    def _stack(self):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    # ================= SLOW QUERIES =================
+
+    def _log_slow(self, key, query, params, ms, rows, operation):
+        entry = {
+            "time": datetime.now().isoformat(timespec="seconds"),
+            "ms": round(ms, 3),
+            "rows": rows,
+            "operation": operation,
+            "sql": key,
+        }
+        entry.update(self._plan(key, query, params))
+
+        with self._lock:
+            self._slow.append(entry)
+
+        if self.slow_log_path:
+            try:
+                with self._log_lock, open(self.slow_log_path, "a", encoding="utf-8") as log:
+                    log.write(json.dumps(entry, default=str) + "\n")
+            except OSError as e:
+                print(f"Slow Query Log Error: {e}")
+
+    def _plan(self, key, query, params):
+        # {"plan": rows} or {"plan_error": reason}; successful plans are cached
+        verb = (query.split(None, 1) or [""])[0].lower()
+        if self.explain is None or verb not in EXPLAINABLE:
+            return {"plan": None}
+
+        plan = self._plans.get(key)
+        if plan is None:
+            try:
+                plan = [dict(row) for row in self.explain(query, params)]
+            except Exception as e:
+                return {"plan_error": str(e)}
+            self._plans.set(key, plan)
+        return {"plan": plan}
+
+    # ================= REPORTING =================
+
+    def snapshot(self):
+        """Plain-dict copy of everything recorded, slowest totals first"""
+        with self._lock:
+            queries = [
+                {
+                    "sql": key,
+                    "operations": sorted(stats.operations),
+                    "rows": stats.rows,
+                    "bytes": stats.bytes,
+                    "errors": stats.errors,
+                    **stats.latency.to_dict(),
+                }
+                for key, stats in self._queries.items()
+            ]
+            operations = [
+                {"name": name, "errors": stats.errors, **stats.latency.to_dict()}
+                for name, stats in self._operations.items()
+            ]
+            slow = list(self._slow)
+
+        queries.sort(key=lambda q: q["total_ms"], reverse=True)
+        operations.sort(key=lambda o: o["total_ms"], reverse=True)
+        return {
+            "started_at": self.started_at.isoformat(timespec="seconds"),
+            "taken_at": datetime.now().isoformat(timespec="seconds"),
+            "slow_query_ms": self.slow_query_ms,
+            "bucket_bounds_ms": list(BUCKET_BOUNDS_MS),
+            "operations": operations,
+            "queries": queries,
+            "slow_queries": slow,
+        }
+
+    def reset(self):
+        """Forget everything recorded so far (the slow-query log file is kept)"""
+        with self._lock:
+            self._queries.clear()
+            self._operations.clear()
+            self._slow.clear()
+            self.started_at = datetime.now()
+        self._plans.invalidate()
+
+
+def timed(method):
+    """Record a Database method as an operation in self.metrics"""
+    name = f"db.{method.__name__}"
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.metrics.timer(name):
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+# ================= WRAPPERS =================
+
+class InstrumentedCursor:
+    """Cursor that reports each statement to a QueryMetrics
+
+    A statement is timed from execute through every fetch of its results and
+    reported when the next statement starts or the cursor closes, so rows
+    streamed by fetchmany count towards the query that produced them.
+    """
+
+    def __init__(self, cursor, metrics):
+        self._cursor = cursor
+        self._metrics = metrics
+        # [query, explain params, seconds, rows fetched or None, bytes]
+        self._pending = None
+
+    def execute(self, query, params=None):
+        self._finish()
+        return self._run(self._cursor.execute, query, params, params)
+
+    def executemany(self, query, seq_of_params):
+        self._finish()
+        seq_of_params = list(seq_of_params)
+        first = seq_of_params[0] if seq_of_params else None
+        return self._run(self._cursor.executemany, query, seq_of_params, first)
+
+    def fetchone(self):
+        start = time.perf_counter()
+        row = self._cursor.fetchone()
+        self._fetched(start, () if row is None else (row,))
+        return row
+
+    def fetchmany(self, size):
+        start = time.perf_counter()
+        rows = self._cursor.fetchmany(size)
+        self._fetched(start, rows)
+        return rows
+
+    def fetchall(self):
+        start = time.perf_counter()
+        rows = self._cursor.fetchall()
+        self._fetched(start, rows)
+        return rows
+
+    def close(self):
+        try:
+            self._finish()
+        finally:
+            self._cursor.close()
+
+    def __getattr__(self, name):
+        # rowcount, lastrowid, description, ...
+        return getattr(self._cursor, name)
+
+    def _run(self, execute, query, args, explain_params):
+        start = time.perf_counter()
+        try:
+            result = execute(query, args)
+        except Exception:
+            self._metrics.record_query(query, time.perf_counter() - start, error=True)
+            raise
+        self._pending = [query, explain_params, time.perf_counter() - start, None, 0]
+        return result
+
+    def _fetched(self, start, rows):
+        pending = self._pending
+        if pending is None:
+            return
+        pending[2] += time.perf_counter() - start
+        pending[3] = (pending[3] or 0) + len(rows)
+        pending[4] += rows_bytes(rows)
+
+    def _finish(self):
+        pending, self._pending = self._pending, None
+        if pending is None:
+            return
+        query, params, seconds, rows, nbytes = pending
+        if rows is None:
+            # Nothing fetched: report the rows the statement changed
+            rows = max(self._cursor.rowcount or 0, 0)
+        self._metrics.record_query(query, seconds, rows, nbytes, params=params)
+
+
+class InstrumentedConnection:
+    """Connection whose cursors are InstrumentedCursors; the pool sees the usual methods"""
+
+    def __init__(self, connection, metrics):
+        self.connection = connection
+        self._metrics = metrics
+
+    def cursor(self, cursorclass=None):
+        raw = self.connection.cursor(cursorclass) if cursorclass else self.connection.cursor()
+        return InstrumentedCursor(raw, self._metrics)
+
+    def begin(self):
+        self.connection.begin()
+
+    def commit(self):
+        self.connection.commit()
+
+    def rollback(self):
+        self.connection.rollback()
+
+    def ping(self, reconnect=False):
+        self.connection.ping(reconnect=reconnect)
+
+    def close(self):
+        self.connection.close()
@@ -0,0 +1,225 @@
+"""
+Schema Migrations for Student Management System
+Versioned, tracked schema changes applied on top of Database.create_tables
+"""
+
+from contextlib import contextmanager
+from datetime import date
+
+from search import ensure_search_indexes
+import attendance_summary
+import student_ids
+
+
+def create_index(table, name, columns):
+    """Migration step creating an index unless it is already there"""
+    def step(cursor, backend):
+        if not backend.index_exists(cursor, table, name):
+            cursor.execute(f"CREATE INDEX {name} ON {table} ({columns})")
+    return step
+
+
+def add_column(table, name, definition, after=None):
+    """Migration step adding a column unless it is already there"""
+    def step(cursor, backend):
+        if not backend.column_exists(cursor, table, name):
+            cursor.execute(backend.add_column(table, name, definition, after))
+    return step
+
+
+# (version, description, steps) - steps are SQL strings, {backend name: SQL}
+# dicts or callables taking (cursor, backend).
+# MySQL DDL commits implicitly, so every step must be safe to re-run.
+MIGRATIONS = [
+    (1, "Student search indexes", [
+        ensure_search_indexes,
+    ]),
+    (2, "Attendance remarks column", [
+        # Queried and written by the attendance methods but missing from the original table
+        add_column("attendance", "remarks", "VARCHAR(255) NULL", after="status"),
+    ]),
+    (3, "Attendance hot query indexes", [
+        # get_attendance_by_date / get_attendance_full_by_date_range
+        create_index("attendance", "idx_attendance_date_course", "attendance_date, course_id"),
+        # get_course_attendance (covering: the status sum never touches the rows)
+        create_index("attendance", "idx_attendance_course_status", "course_id, status"),
+    ]),
+    (4, "Student hot query indexes", [
+        create_index("students", "idx_students_course", "course_id"),
+        create_index("students", "idx_students_status", "status"),
+        # Monthly admissions and the (admission_date, student_id) keyset pages;
+        # InnoDB appends the primary key to every secondary index
+        create_index("students", "idx_students_admission_date", "admission_date"),
+    ]),
+    (5, "Monthly attendance summary", [
+        attendance_summary.SUMMARY_TABLE,
+        create_index("attendance_summary", "idx_summary_course", "course_id"),
+        attendance_summary.rebuild,
+    ]),
+    (6, "Attendance roster index", [
+        # get_roster: equality on (course_id, status), rows already in name
+        # order, and covering for the projected columns (the key carries student_id)
+        create_index("students", "idx_students_roster", "course_id, status, last_name, first_name"),
+    ]),
+    (7, "Student ID sequences", [
+        student_ids.SEQUENCE_TABLE,
+        student_ids.SEED_SEQUENCES,
+    ]),
+    (8, "Attendance running totals", [
+        attendance_summary.TOTALS_TABLE,
+        attendance_summary.rebuild_totals,
+    ]),
+]
+
+
+def run_migrations(cursor, backend, migrations=MIGRATIONS):
+    """Apply every migration newer than the recorded schema version
+
+    Returns the list of versions applied by this call.
+    """
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INT PRIMARY KEY,
+            description VARCHAR(255) NOT NULL,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    cursor.execute("SELECT version FROM schema_migrations")
+    done = {row["version"] for row in cursor.fetchall()}
+
+    applied = []
+    for version, description, steps in sorted(migrations, key=lambda m: m[0]):
+        if version in done:
+            continue
+        for step in steps:
+            if callable(step):
+                step(cursor, backend)
+            elif isinstance(step, dict):
+                cursor.execute(step[backend.name])
+            else:
+                cursor.execute(step)
+        cursor.execute(
+            "INSERT INTO schema_migrations (version, description) VALUES (%s, %s)",
+            (version, description)
+        )
+        print(f"✓ Migration {version}: {description}")
+        applied.append(version)
+    return applied
+
+
+# ================= EXPLAIN CHECK =================
+
+# Database methods (with sample arguments) whose queries must be served by an index
+HOT_QUERY_CHECKS = [
+    ("get_students_page", (None, 100, {"status": "Active"})),
+    ("get_students_page", ((date.today(), "STU-00000000"), 100)),
+    ("search_students", ("STU-2024", "student_id")),
+    ("search_students", ("smith", "last_name")),
+    ("search_students", ("smith",)),
+    ("get_student_by_id", ("STU-00000000",)),
+    ("get_attendance_by_date", (date.today(),)),
+    ("get_attendance_by_date", (date.today(), 1)),
+    ("get_roster", (1, date.today())),
+    ("get_roster", (1,)),
+    ("get_student_attendance", ("STU-00000000",)),
+    ("get_course_attendance", (1,)),
+    ("get_attendance_full_by_date_range", (date.today(), date.today())),
+    ("get_dashboard_stats", ()),
+]
+
+# Tables small enough that a full scan is the right plan (attendance_totals
+# has one row per course)
+SCAN_OK_TABLES = {"courses", "attendance_totals", "schema_migrations", "student_id_sequences"}
+
+
+class _NullRow(dict):
+    """Row stand-in so code reading EXPLAIN'd results keeps going"""
+
+    def __missing__(self, key):
+        return 0
+
+
+class _ExplainCursor:
+    """Cursor that EXPLAINs each statement instead of running it"""
+
+    def __init__(self, cursor, prefix, method, plans):
+        self._cursor = cursor
+        self._prefix = prefix
+        self._method = method
+        self._plans = plans
+
+    def execute(self, query, params=None):
+        self._cursor.execute(self._prefix + query, params)
+        self._plans.append((self._method, " ".join(query.split()), self._cursor.fetchall()))
+
+    def executemany(self, query, seq_of_params):
+        for params in seq_of_params:
+            self.execute(query, params)
+            break
+
+    def fetchone(self):
+        return _NullRow()
+
+    def fetchall(self):
+        return []
+
+    def close(self):
+        pass
+
+
+class _ExplainPool:
+    """Pool stand-in handing out EXPLAIN cursors on real pooled connections"""
+
+    def __init__(self, pool, prefix, plans):
+        self._pool = pool
+        self._prefix = prefix
+        self._plans = plans
+        self.method = None
+
+    def cursor(self, cursorclass=None):
+        return self._explaining()
+
+    def transaction(self):
+        return self._explaining()
+
+    @contextmanager
+    def _explaining(self):
+        with self._pool.cursor() as cursor:
+            yield _ExplainCursor(cursor, self._prefix, self.method, self._plans)
+
+
+def explain_queries(db, checks=HOT_QUERY_CHECKS):
+    """EXPLAIN the statements issued by each checked Database method
+
+    Returns (method, sql, problems) tuples, where problems lists every table
+    the plan reads with a full scan; an empty list means the query is indexed.
+    Run it against a populated database: on near-empty tables the optimizer
+    rightly prefers full scans.
+    """
+    plans = []
+    explainer = type(db)(db.backend)
+    explainer.pool = _ExplainPool(db.pool, db.backend.explain_prefix, plans)
+
+    for method, args in checks:
+        explainer.pool.method = method
+        getattr(explainer, method)(*args)
+
+    report = []
+    for method, sql, rows in plans:
+        problems = []
+        for alias in db.backend.full_scans(rows):
+            table = _base_table(sql, alias)
+            if table is not None and table not in SCAN_OK_TABLES:
+                problems.append(alias)
+        report.append((method, sql, problems))
+    return report
+
+
+def _base_table(sql, alias):
+    # EXPLAIN reports aliases ("s", "a"); map them back to table names.
+    # Aliases of derived tables map to None, which is never a problem table.
+    words = sql.replace(",", " ").split()
+    for i, word in enumerate(words[1:], 1):
+        if word == alias and words[i - 1].lower() not in ("from", "join"):
+            return None if words[i - 1].endswith(")") else words[i - 1]
+    return alias
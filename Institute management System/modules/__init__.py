@@ -1,9 +1,28 @@
-# This file marks "modules" as a Python package.
-# Do NOT create objects or use self here.
-
-from .auth import AuthModule
-from .dashboard import DashboardModule
-from .students import StudentsModule
-from .courses import CoursesModule
-from .attendance import AttendanceModule
-from .reports import ReportsModule
+# This file marks "modules" as a Python package.
+# Do NOT create objects or use self here.
+#
+# Section modules pull in heavy dependencies (matplotlib, openpyxl, PIL,
+# tkcalendar), so they are imported on first attribute access rather than
+# when the package is.
+
+import importlib
+
+_LAZY = {
+    "AuthModule": ".auth",
+    "DashboardModule": ".dashboard",
+    "StudentsModule": ".students",
+    "CoursesModule": ".courses",
+    "AttendanceModule": ".attendance",
+    "ReportsModule": ".reports",
+    "DiagnosticsModule": ".diagnostics",
+}
+
+__all__ = list(_LAZY)
+
+
+def __getattr__(name):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY[name], __name__), name)
+    globals()[name] = value
+    return value
@@ -4,19 +4,29 @@ from tkinter import messagebox
 from tkcalendar import DateEntry
 
 from config import COLORS
+from widgets import VirtualTreeview
 
 
 class AttendanceModule:
     def __init__(self, app):
         self.app = app
+        self.frame = None
+        self.course_map = {}
+        self.view_task = None
+
+        # fetched records and the grid that shows them
+        self.records = []
+        self.record_tree = None
+        self.records_title = None
+        self.records_count = None
+        self.record_search = None
+        self.record_status = None
 
     # ================= MAIN VIEW =================
 
-    def show(self):
-        for w in self.app.main_content.winfo_children():
-            w.destroy()
-
-        header = ctk.CTkFrame(self.app.main_content, fg_color="transparent", height=80)
+    def build(self):
+        """Create the screen's widgets once; refresh() reloads the course filter"""
+        header = ctk.CTkFrame(self.frame, fg_color="transparent", height=80)
         header.pack(fill="x", padx=30, pady=(20, 10))
 
         ctk.CTkLabel(
@@ -37,7 +47,7 @@ class AttendanceModule:
     # ================= FILTER + VIEW =================
 
     def _filter_section(self):
-        filter_frame = ctk.CTkFrame(self.app.main_content, fg_color="transparent")
+        filter_frame = ctk.CTkFrame(self.frame, fg_color="transparent")
         filter_frame.pack(fill="x", padx=30, pady=10)
 
         ctk.CTkLabel(filter_frame, text="Date:", font=ctk.CTkFont(size=12, weight="bold")).pack(side="left", padx=5)
@@ -49,14 +59,11 @@ class AttendanceModule:
         )
         self.date_filter.pack(side="left", padx=5)
 
-        courses = self.app.db.get_all_courses()
-        self.course_map = {c["course_name"]: c["course_id"] for c in courses}
-        course_names = ["All"] + list(self.course_map.keys())
-
         ctk.CTkLabel(filter_frame, text="Course:", font=ctk.CTkFont(size=12, weight="bold")).pack(
             side="left", padx=(20, 5)
         )
-        self.course_filter = ctk.CTkOptionMenu(filter_frame, values=course_names)
+        # Filled in by refresh() once the course list arrives
+        self.course_filter = ctk.CTkOptionMenu(filter_frame, values=["All"])
         self.course_filter.pack(side="left", padx=5)
 
         ctk.CTkButton(
@@ -65,7 +72,7 @@ class AttendanceModule:
             command=self.view_attendance
         ).pack(side="left", padx=20)
 
-        self.info_frame = ctk.CTkFrame(self.app.main_content, fg_color=COLORS["info"], corner_radius=15)
+        self.info_frame = ctk.CTkFrame(self.frame, fg_color=COLORS["info"], corner_radius=15)
         self.info_frame.pack(fill="both", expand=True, padx=30, pady=20)
 
         ctk.CTkLabel(
@@ -75,68 +82,105 @@ class AttendanceModule:
             text_color="white"
         ).pack(expand=True, pady=50)
 
+    def refresh(self):
+        """Reload the course filter; the records on screen stay until View is pressed"""
+        self.app.tasks.submit(self.app.db.get_all_courses, on_success=self._set_courses, group="screen")
+        # A view cut short by navigating away is reloaded rather than left spinning
+        if self.view_task and self.view_task.cancelled:
+            self.view_attendance()
+
+    def _set_courses(self, courses):
+        self.course_map = {c["course_name"]: c["course_id"] for c in courses}
+        self.course_filter.configure(values=["All"] + list(self.course_map.keys()))
+        if self.course_filter.get() not in self.course_map:
+            self.course_filter.set("All")
+
     def view_attendance(self):
-        for w in self.info_frame.winfo_children():
-            w.destroy()
+        if self.view_task:
+            self.view_task.cancel()
+        if self.record_tree is None:
+            self._records_view()
 
         date = self.date_filter.get_date()
         selected_course = self.course_filter.get()
         course_id = self.course_map.get(selected_course) if selected_course != "All" else None
 
-        records = self.app.db.get_attendance_by_date(date, course_id)
+        self.records_title.configure(text=f"📅 Attendance Records – {date}")
+        self.records_count.configure(text="⏳ Loading records...")
+        self.records = []
+        self.record_tree.clear()
 
-        ctk.CTkLabel(
+        self.view_task = self.app.tasks.submit(
+            self.app.db.get_attendance_by_date, date, course_id,
+            on_success=self._render_records,
+            group="screen"
+        )
+
+    def _records_view(self):
+        # Built on the first View; later views only swap the rows
+        for w in self.info_frame.winfo_children():
+            w.destroy()
+
+        self.records_title = ctk.CTkLabel(
             self.info_frame,
-            text=f"📅 Attendance Records – {date}",
+            text="",
             font=ctk.CTkFont(size=20, weight="bold"),
             text_color="white"
-        ).pack(pady=10)
-
-        if not records:
-            ctk.CTkLabel(
-                self.info_frame,
-                text="No attendance records found",
-                font=ctk.CTkFont(size=16),
-                text_color="white"
-            ).pack(pady=40)
-            return
-
-        table = ctk.CTkScrollableFrame(self.info_frame)
-        table.pack(fill="both", expand=True, padx=20, pady=10)
-
-        headers = ["Student", "Course", "Status"]
-        widths = [300, 250, 150]
-
-        header_row = ctk.CTkFrame(table, fg_color=COLORS["primary"])
-        header_row.pack(fill="x")
-
-        for i, h in enumerate(headers):
-            ctk.CTkLabel(
-                header_row,
-                text=h,
-                width=widths[i],
-                text_color="white",
-                font=ctk.CTkFont(size=14, weight="bold"),
-                anchor="center"
-            ).grid(row=0, column=i, padx=1, pady=1)
-
-        for r in records:
-            row = ctk.CTkFrame(table)
-            row.pack(fill="x")
-
-            values = [
-                f"{r['first_name']} {r['last_name']}",
-                r["course_name"],
-                r["status"]
-            ]
-
-            for i, v in enumerate(values):
-                ctk.CTkLabel(
-                    row,
-                    text=v,
-                    width=widths[i],
-                    anchor="center"
-                ).grid(row=0, column=i, padx=1, pady=1)
+        )
+        self.records_title.pack(pady=10)
+
+        bar = ctk.CTkFrame(self.info_frame, fg_color="transparent")
+        bar.pack(fill="x", padx=20)
+
+        self.record_search = ctk.CTkEntry(bar, placeholder_text="🔍 Filter by name, ID or course", width=300)
+        self.record_search.pack(side="left", padx=(0, 10))
+        self.record_search.bind("<KeyRelease>", lambda e: self._filter_records())
+
+        self.record_status = ctk.CTkOptionMenu(
+            bar,
+            values=["All", "Present", "Absent"],
+            command=lambda _: self._filter_records()
+        )
+        self.record_status.pack(side="left")
+
+        self.records_count = ctk.CTkLabel(bar, text="", text_color="white")
+        self.records_count.pack(side="right")
+
+        # One Treeview recycling a screenful of items, sorted by clicking a heading
+        self.record_tree = VirtualTreeview(
+            self.info_frame,
+            ("Student ID", "Student", "Course", "Status"),
+            widths=(140, 300, 250, 150),
+            sortable=True
+        )
+        self.record_tree.pack(fill="both", expand=True, padx=20, pady=10)
+        self.record_tree.sort_by("Student")
+
+    def _render_records(self, records):
+        self.records = [
+            (r["student_id"], f"{r['first_name']} {r['last_name']}", r["course_name"], r["status"])
+            for r in records
+        ]
+        self._filter_records()
+
+    def _filter_records(self):
+        """Show the fetched records matching the filter box and status, in the current sort"""
+        term = self.record_search.get().strip().lower()
+        status = self.record_status.get()
+
+        rows = self.records
+        if status != "All":
+            rows = [r for r in rows if r[3] == status]
+        if term:
+            rows = [r for r in rows if term in r[0].lower() or term in r[1].lower() or term in r[2].lower()]
+
+        self.record_tree.set_rows(rows)
+        if not self.records:
+            self.records_count.configure(text="No attendance records found")
+        elif len(rows) == len(self.records):
+            self.records_count.configure(text=f"{len(rows)} records")
+        else:
+            self.records_count.configure(text=f"{len(rows)} of {len(self.records)} records")
 
     # ================= MARK ATTENDANCE =================
 
@@ -176,8 +220,10 @@ class AttendanceModule:
                 w.destroy()
             attendance_vars.clear()
 
+            # One query: the course's active students plus anything already
+            # marked for the date, so re-opening a day shows what was saved
             course_id = course_map.get(course_menu.get())
-            students = [s for s in self.app.db.get_all_students() if s["course_id"] == course_id]
+            students = self.app.db.get_roster(course_id, date_entry.get_date())
 
             for s in students:
                 row = ctk.CTkFrame(student_frame)
@@ -190,23 +236,34 @@ class AttendanceModule:
                     anchor="w"
                 ).pack(side="left", padx=10)
 
-                var = tk.StringVar(value="Present")
-                attendance_vars.append((s["student_id"], var))
+                var = tk.StringVar(value=s["attendance_status"] or "Present")
+                attendance_vars.append((s["student_id"], var, s["remarks"]))
 
                 ctk.CTkRadioButton(row, text="Present", variable=var, value="Present").pack(side="left", padx=10)
                 ctk.CTkRadioButton(row, text="Absent", variable=var, value="Absent").pack(side="left", padx=10)
 
         ctk.CTkButton(dialog, text="Load Students", command=load_students).pack(pady=5)
 
+        # The pre-filled statuses belong to a date; picking another reloads them
+        date_entry.bind("<<DateEntrySelected>>", lambda e: load_students() if attendance_vars else None)
+
         def save():
             course_id = course_map.get(course_menu.get())
             date = date_entry.get_date()
 
-            for sid, var in attendance_vars:
-                self.app.db.mark_attendance((sid, course_id, date, var.get(), None))
+            if not attendance_vars:
+                messagebox.showwarning("No Students", "Load the students of a course first")
+                return
+
+            rows = [(sid, course_id, date, var.get(), remarks) for sid, var, remarks in attendance_vars]
+            success, msg, outcomes = self.app.db.mark_attendance_bulk(rows)
 
-            messagebox.showinfo("Success", "Attendance saved successfully")
-            dialog.destroy()
+            if success:
+                messagebox.showinfo("Success", msg)
+                dialog.destroy()
+            else:
+                failed = [f"{sid}: {reason}" for sid, saved, reason in outcomes if not saved]
+                messagebox.showerror("Error", msg + "\n\n" + "\n".join(failed[:10]))
 
         ctk.CTkButton(
             dialog,
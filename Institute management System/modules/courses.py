@@ -2,19 +2,81 @@ import customtkinter as ctk
 from tkinter import messagebox
 
 from config import COLORS
+from widgets import VirtualCardList
+
+
+# Fixed card height so the list can be virtualized
+CARD_HEIGHT = 130
+
+
+class CourseCard(ctk.CTkFrame):
+    """One pooled course card; show() refills it in place for another course"""
+
+    def __init__(self, parent, module):
+        super().__init__(parent, fg_color=COLORS["sidebar"], corner_radius=15, height=CARD_HEIGHT)
+        self.pack_propagate(False)
+        self.course = None
+
+        info = ctk.CTkFrame(self, fg_color="transparent")
+        info.pack(side="left", fill="both", expand=True, padx=20, pady=15)
+
+        self.name_label = ctk.CTkLabel(info, text="", font=ctk.CTkFont(size=18, weight="bold"))
+        self.name_label.pack(anchor="w")
+
+        self.detail_label = ctk.CTkLabel(info, text="", font=ctk.CTkFont(size=12), text_color="gray")
+        self.detail_label.pack(anchor="w", pady=5)
+
+        self.count_label = ctk.CTkLabel(
+            info,
+            text="",
+            font=ctk.CTkFont(size=13, weight="bold"),
+            text_color=COLORS["info"]
+        )
+        self.count_label.pack(anchor="w", pady=5)
+
+        btns = ctk.CTkFrame(self, fg_color="transparent")
+        btns.pack(side="right", padx=20)
+
+        # The buttons act on whichever course the card shows at click time
+        ctk.CTkButton(
+            btns,
+            text="✏️ Edit",
+            width=100,
+            fg_color=COLORS["warning"],
+            command=lambda: module.show_edit_course_dialog(self.course)
+        ).pack(pady=5)
+
+        ctk.CTkButton(
+            btns,
+            text="🗑️ Delete",
+            width=100,
+            fg_color=COLORS["danger"],
+            command=lambda: module.delete_course(self.course)
+        ).pack(pady=5)
+
+    def show(self, course):
+        self.course = course
+        self.name_label.configure(text=course["course_name"])
+        self.detail_label.configure(
+            text=f"Code: {course['course_code']} | "
+                 f"Duration: {course['duration_months']} months | "
+                 f"Fees: ₹{course['fees']}"
+        )
+        self.count_label.configure(text=f"👨‍🎓 {course['student_count']} students enrolled")
 
 
 class CoursesModule:
     def __init__(self, app):
         self.app = app
+        self.frame = None
+        self.course_list = None
+        self.status_label = None
 
     # ================= MAIN VIEW =================
 
-    def show(self):
-        for w in self.app.main_content.winfo_children():
-            w.destroy()
-
-        header = ctk.CTkFrame(self.app.main_content, fg_color="transparent", height=80)
+    def build(self):
+        """Create the screen's widgets once; refresh() reloads the course cards"""
+        header = ctk.CTkFrame(self.frame, fg_color="transparent", height=80)
         header.pack(fill="x", padx=30, pady=(20, 10))
 
         ctk.CTkLabel(
@@ -30,72 +92,28 @@ class CoursesModule:
             command=self.show_add_course_dialog
         ).pack(side="right")
 
-        self._course_list()
+        self.status_label = ctk.CTkLabel(header, text="", text_color="gray")
+        self.status_label.pack(side="right", padx=15)
+
+        # Only the cards in view exist; they are recycled as the list scrolls
+        self.course_list = VirtualCardList(
+            self.frame,
+            make_card=lambda parent: CourseCard(parent, self),
+            card_height=CARD_HEIGHT,
+            empty_text="No courses available. Add your first course!"
+        )
+        self.course_list.pack(fill="both", expand=True, padx=30, pady=20)
 
     # ================= LIST =================
 
-    def _course_list(self):
-        scroll = ctk.CTkScrollableFrame(self.app.main_content)
-        scroll.pack(fill="both", expand=True, padx=30, pady=20)
-
-        courses = self.app.db.get_all_courses()
-
-        if not courses:
-            ctk.CTkLabel(
-                scroll,
-                text="No courses available. Add your first course!",
-                font=ctk.CTkFont(size=16),
-                text_color="gray"
-            ).pack(pady=50)
-            return
-
-        for course in courses:
-            card = ctk.CTkFrame(scroll, fg_color=COLORS["sidebar"], corner_radius=15)
-            card.pack(fill="x", pady=10, padx=10)
-
-            info = ctk.CTkFrame(card, fg_color="transparent")
-            info.pack(side="left", fill="both", expand=True, padx=20, pady=15)
-
-            ctk.CTkLabel(
-                info,
-                text=course["course_name"],
-                font=ctk.CTkFont(size=18, weight="bold")
-            ).pack(anchor="w")
-
-            ctk.CTkLabel(
-                info,
-                text=f"Code: {course['course_code']} | "
-                     f"Duration: {course['duration_months']} months | "
-                     f"Fees: ₹{course['fees']}",
-                font=ctk.CTkFont(size=12),
-                text_color="gray"
-            ).pack(anchor="w", pady=5)
-
-            ctk.CTkLabel(
-                info,
-                text=f"👨‍🎓 {course['student_count']} students enrolled",
-                font=ctk.CTkFont(size=13, weight="bold"),
-                text_color=COLORS["info"]
-            ).pack(anchor="w", pady=5)
-
-            btns = ctk.CTkFrame(card, fg_color="transparent")
-            btns.pack(side="right", padx=20)
-
-            ctk.CTkButton(
-                btns,
-                text="✏️ Edit",
-                width=100,
-                fg_color=COLORS["warning"],
-                command=lambda c=course: self.show_edit_course_dialog(c)
-            ).pack(pady=5)
-
-            ctk.CTkButton(
-                btns,
-                text="🗑️ Delete",
-                width=100,
-                fg_color=COLORS["danger"],
-                command=lambda c=course: self.delete_course(c)
-            ).pack(pady=5)
+    def refresh(self):
+        """Fetch the courses in the background and update the cards in place"""
+        self.status_label.configure(text="⏳ Loading courses...")
+        self.app.tasks.submit(self.app.db.get_all_courses, on_success=self._render_courses, group="screen")
+
+    def _render_courses(self, courses):
+        self.status_label.configure(text=f"{len(courses)} courses")
+        self.course_list.set_items(courses)
 
     # ================= ADD =================
 
@@ -140,7 +158,7 @@ class CoursesModule:
             if success:
                 messagebox.showinfo("Success", msg)
                 dialog.destroy()
-                self.show()
+                self.refresh()
             else:
                 messagebox.showerror("Error", msg)
 
@@ -197,7 +215,7 @@ class CoursesModule:
             if success:
                 messagebox.showinfo("Success", msg)
                 dialog.destroy()
-                self.show()
+                self.refresh()
             else:
                 messagebox.showerror("Error", msg)
 
@@ -219,6 +237,6 @@ class CoursesModule:
             success, msg = self.app.db.delete_course(course["course_id"])
             if success:
                 messagebox.showinfo("Success", msg)
-                self.show()
+                self.refresh()
             else:
                 messagebox.showerror("Error", msg)
@@ -1,20 +1,21 @@
 import customtkinter as ctk
 from config import COLORS
-from matplotlib.figure import Figure
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from charts import ChartManager, PieChart, LineChart
 
 
 class DashboardModule:
     def __init__(self, app):
         self.app = app
+        self.frame = None
+        self.status_label = None
+        self.card_values = {}
+        self.charts = ChartManager()
 
     # ================= MAIN VIEW =================
 
-    def show(self):
-        for w in self.app.main_content.winfo_children():
-            w.destroy()
-
-        header = ctk.CTkFrame(self.app.main_content, fg_color="transparent", height=80)
+    def build(self):
+        """Create the dashboard widgets once; refresh() fills them in"""
+        header = ctk.CTkFrame(self.frame, fg_color="transparent", height=80)
         header.pack(fill="x", padx=30, pady=(20, 10))
 
         ctk.CTkLabel(
@@ -27,36 +28,69 @@ class DashboardModule:
             header,
             text="🔄 Refresh",
             fg_color=COLORS["info"],
-            command=self.show
+            command=lambda: self.refresh(force=True)
         ).pack(side="right")
 
-        stats = self.app.db.get_dashboard_stats()
-
-        self._stats_cards(stats)
-        self._charts(stats)
+        self.status_label = ctk.CTkLabel(header, text="", text_color="gray")
+        self.status_label.pack(side="right", padx=15)
+
+        self._stats_cards()
+        self._charts()
+
+    def refresh(self, force=False):
+        """Fetch the stats in the background and update cards and charts in place"""
+        self.status_label.configure(text="⏳ Loading statistics...")
+        self.app.tasks.submit(
+            self.app.db.get_dashboard_stats,
+            refresh=force,
+            on_success=self._render,
+            group="screen"
+        )
+
+    def _render(self, stats):
+        with self.app.db.metrics.timer("ui.dashboard.render"):
+            self._render_stats(stats)
+
+    def _render_stats(self, stats):
+        self.status_label.configure(text="")
+
+        self.card_values["students"].configure(text=str(stats.get("total_students", 0)))
+        self.card_values["courses"].configure(text=str(stats.get("total_courses", 0)))
+        self.card_values["attendance"].configure(text=f"{stats.get('attendance_rate', 0)}%")
+        self.card_values["active"].configure(text=str(stats.get("active_students", 0)))
+
+        self.charts.update(
+            "students_by_course",
+            [(d["course_name"], d["count"]) for d in stats.get("students_by_course", [])]
+        )
+        self.charts.update(
+            "monthly_admissions",
+            [(d["month"], d["count"]) for d in stats.get("monthly_admissions", [])]
+        )
 
     # ================= STATS =================
 
-    def _stats_cards(self, stats):
-        cards = ctk.CTkFrame(self.app.main_content, fg_color="transparent")
+    def _stats_cards(self):
+        cards = ctk.CTkFrame(self.frame, fg_color="transparent")
         cards.pack(fill="x", padx=30, pady=10)
 
-        self._card(cards, "👨‍🎓 Students", stats.get("total_students", 0), COLORS["info"], 0)
-        self._card(cards, "📚 Courses", stats.get("total_courses", 0), COLORS["success"], 1)
-        self._card(cards, "📈 Attendance", f"{stats.get('attendance_rate', 0)}%", COLORS["warning"], 2)
-        self._card(cards, "✅ Active", stats.get("active_students", 0), COLORS["secondary"], 3)
+        self._card(cards, "students", "👨‍🎓 Students", COLORS["info"], 0)
+        self._card(cards, "courses", "📚 Courses", COLORS["success"], 1)
+        self._card(cards, "attendance", "📈 Attendance", COLORS["warning"], 2)
+        self._card(cards, "active", "✅ Active", COLORS["secondary"], 3)
 
-    def _card(self, parent, title, value, color, col):
+    def _card(self, parent, key, title, color, col):
         card = ctk.CTkFrame(parent, corner_radius=15, fg_color=color)
         card.grid(row=0, column=col, padx=10, pady=10, sticky="ew")
         parent.grid_columnconfigure(col, weight=1)
 
-        ctk.CTkLabel(
+        self.card_values[key] = ctk.CTkLabel(
             card,
-            text=str(value),
+            text="–",
             font=ctk.CTkFont(size=36, weight="bold"),
             text_color="white"
-        ).pack(pady=(20, 5))
+        )
+        self.card_values[key].pack(pady=(20, 5))
 
         ctk.CTkLabel(
             card,
@@ -67,57 +101,33 @@ class DashboardModule:
 
     # ================= CHARTS =================
 
-    def _charts(self, stats):
-        container = ctk.CTkScrollableFrame(self.app.main_content)
+    def _charts(self):
+        container = ctk.CTkScrollableFrame(self.frame)
         container.pack(fill="both", expand=True, padx=30, pady=20)
 
-        self._pie_chart(container, stats.get("students_by_course", []))
-        self._line_chart(container, stats.get("monthly_admissions", []))
-
-    def _pie_chart(self, parent, data):
-        frame = ctk.CTkFrame(parent, corner_radius=15)
-        frame.pack(fill="x", pady=10)
-
-        ctk.CTkLabel(
-            frame,
-            text="Students by Course",
-            font=ctk.CTkFont(size=16, weight="bold")
-        ).pack(pady=10)
-
-        fig = Figure(figsize=(6, 4), dpi=100)
-        ax = fig.add_subplot(111)
-
-        if data:
-            labels = [d["course_name"] for d in data]
-            sizes = [d["count"] for d in data]
-            ax.pie(sizes, labels=labels, autopct="%1.1f%%", startangle=90)
-        else:
-            ax.text(0.5, 0.5, "No data", ha="center", va="center")
-
-        canvas = FigureCanvasTkAgg(fig, frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill="both", expand=True, padx=20, pady=20)
-
-    def _line_chart(self, parent, data):
+        # Canvases live as long as the screen; updates redraw only what changed
+        self.charts.add(
+            "students_by_course",
+            PieChart(self._chart_frame(container, "Students by Course"), figsize=(6, 4),
+                     timer=lambda: self.app.db.metrics.timer("ui.chart.students_by_course"))
+        )
+        self.charts.add(
+            "monthly_admissions",
+            LineChart(self._chart_frame(container, "Monthly Admissions"), figsize=(10, 4),
+                      timer=lambda: self.app.db.metrics.timer("ui.chart.monthly_admissions"))
+        )
+
+    def _chart_frame(self, parent, title):
         frame = ctk.CTkFrame(parent, corner_radius=15)
         frame.pack(fill="x", pady=10)
 
         ctk.CTkLabel(
             frame,
-            text="Monthly Admissions",
+            text=title,
             font=ctk.CTkFont(size=16, weight="bold")
         ).pack(pady=10)
+        return frame
 
-        fig = Figure(figsize=(10, 4), dpi=100)
-        ax = fig.add_subplot(111)
-
-        if data:
-            months = [d["month"] for d in data]
-            counts = [d["count"] for d in data]
-            ax.plot(months, counts, marker="o")
-        else:
-            ax.text(0.5, 0.5, "No data", ha="center", va="center")
-
-        canvas = FigureCanvasTkAgg(fig, frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill="both", expand=True, padx=20, pady=20)
+    def close(self):
+        """Close the chart figures; called when the main layout is torn down"""
+        self.charts.close()
@@ -0,0 +1,157 @@
+import json
+import customtkinter as ctk
+from tkinter import filedialog, messagebox
+from datetime import datetime
+
+from config import COLORS
+from widgets import VirtualTreeview
+
+
+class DiagnosticsModule:
+    """Timings recorded by db.metrics: operations, SQL statements and slow queries"""
+
+    def __init__(self, app):
+        self.app = app
+        self.frame = None
+        self.summary_label = None
+        self.operation_tree = None
+        self.query_tree = None
+        self.slow_tree = None
+        self.plan_box = None
+        self.slow_queries = []
+
+    # ================= MAIN VIEW =================
+
+    def build(self):
+        """Create the tables once; refresh() reloads them from the metrics"""
+        header = ctk.CTkFrame(self.frame, fg_color="transparent", height=80)
+        header.pack(fill="x", padx=30, pady=(20, 10))
+
+        ctk.CTkLabel(
+            header,
+            text="🩺 Diagnostics",
+            font=ctk.CTkFont(size=28, weight="bold")
+        ).pack(side="left")
+
+        ctk.CTkButton(
+            header,
+            text="💾 Dump",
+            width=100,
+            fg_color=COLORS["success"],
+            command=self.dump
+        ).pack(side="right", padx=5)
+
+        ctk.CTkButton(
+            header,
+            text="🧹 Reset",
+            width=100,
+            fg_color=COLORS["danger"],
+            command=self.reset
+        ).pack(side="right", padx=5)
+
+        ctk.CTkButton(
+            header,
+            text="🔄 Refresh",
+            width=100,
+            fg_color=COLORS["info"],
+            command=self.refresh
+        ).pack(side="right", padx=5)
+
+        self.summary_label = ctk.CTkLabel(self.frame, text="", text_color="gray", anchor="w")
+        self.summary_label.pack(fill="x", padx=30)
+
+        tabs = ctk.CTkTabview(self.frame)
+        tabs.pack(fill="both", expand=True, padx=30, pady=(5, 20))
+
+        self.operation_tree = VirtualTreeview(
+            tabs.add("Operations"),
+            ("Operation", "Calls", "Errors", "p50 ms", "p95 ms", "Max ms", "Total ms"),
+            widths=(320, 80, 70, 90, 90, 90, 100),
+            sortable=True
+        )
+        self.operation_tree.pack(fill="both", expand=True)
+
+        self.query_tree = VirtualTreeview(
+            tabs.add("Queries"),
+            ("SQL", "Calls", "Errors", "p50 ms", "p95 ms", "Max ms", "Total ms", "Rows", "KB", "Operations"),
+            widths=(420, 70, 60, 80, 80, 80, 90, 80, 80, 260),
+            sortable=True
+        )
+        self.query_tree.pack(fill="both", expand=True)
+
+        slow_tab = tabs.add("Slow Queries")
+        self.slow_tree = VirtualTreeview(
+            slow_tab,
+            ("#", "Time", "ms", "Rows", "Operation", "SQL"),
+            widths=(40, 160, 90, 80, 220, 520)
+        )
+        self.slow_tree.pack(fill="both", expand=True)
+        self.slow_tree.bind_row("<ButtonRelease-1>", self._show_plan)
+
+        self.plan_box = ctk.CTkTextbox(slow_tab, height=160, font=ctk.CTkFont(family="Courier", size=12))
+        self.plan_box.pack(fill="x", pady=(10, 0))
+
+    def refresh(self):
+        """Reload every table from a fresh snapshot"""
+        snapshot = self.app.db.metrics_snapshot()
+        pool = snapshot["pool"] or {}
+        queries = snapshot["queries"]
+
+        self.summary_label.configure(text=(
+            f"Backend: {snapshot['backend']}   •   "
+            f"Pool: {pool.get('in_use', 0)} in use / {pool.get('size', 0)} open / {pool.get('max_size', 0)} max   •   "
+            f"{sum(q['count'] for q in queries):,} statements since {snapshot['started_at']}   •   "
+            f"slow ≥ {snapshot['slow_query_ms']} ms"
+        ))
+
+        self.operation_tree.set_rows(
+            (o["name"], o["count"], o["errors"], o["p50_ms"], o["p95_ms"], o["max_ms"], o["total_ms"])
+            for o in snapshot["operations"]
+        )
+        self.query_tree.set_rows(
+            (q["sql"], q["count"], q["errors"], q["p50_ms"], q["p95_ms"], q["max_ms"], q["total_ms"],
+             q["rows"], round(q["bytes"] / 1024, 1), ", ".join(q["operations"]))
+            for q in queries
+        )
+
+        # Newest first
+        self.slow_queries = snapshot["slow_queries"][::-1]
+        self.slow_tree.set_rows(
+            (i + 1, s["time"], s["ms"], s["rows"], s["operation"] or "", s["sql"])
+            for i, s in enumerate(self.slow_queries)
+        )
+        self.plan_box.delete("1.0", "end")
+
+    def _show_plan(self, row):
+        entry = self.slow_queries[row[0] - 1]
+        if "plan_error" in entry:
+            text = f"EXPLAIN failed: {entry['plan_error']}"
+        elif entry["plan"] is None:
+            text = "No plan for this kind of statement"
+        else:
+            text = "\n".join(json.dumps(step, default=str) for step in entry["plan"])
+
+        self.plan_box.delete("1.0", "end")
+        self.plan_box.insert("1.0", f"{entry['sql']}\n\n{text}")
+
+    # ================= ACTIONS =================
+
+    def dump(self):
+        path = filedialog.asksaveasfilename(
+            defaultextension=".json",
+            filetypes=[("JSON files", "*.json")],
+            initialfile=f"ims_metrics_{datetime.now():%Y%m%d_%H%M%S}.json"
+        )
+        if not path:
+            return
+
+        success, msg = self.app.db.dump_metrics(path)
+        if success:
+            messagebox.showinfo("Success", msg)
+        else:
+            messagebox.showerror("Error", msg)
+
+    def reset(self):
+        if messagebox.askyesno("Reset", "Clear all recorded timings?"):
+            self.app.db.metrics.reset()
+            self.refresh()
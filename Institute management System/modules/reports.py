@@ -1,25 +1,38 @@
 import customtkinter as ctk
-from tkinter import messagebox, filedialog
+from tkinter import filedialog
 from datetime import datetime
 from tkcalendar import DateEntry
 
-import openpyxl
-from openpyxl.styles import Font, PatternFill, Alignment
-
 from config import COLORS
+from exporters import FORMATS
+
+# How often the Recent exports panel re-reads job progress while jobs run
+JOB_POLL_MS = 500
+
+STATUS_COLORS = {
+    "Queued": "gray",
+    "Running": COLORS["info"],
+    "Done": COLORS["success"],
+    "No data": COLORS["warning"],
+    "Failed": COLORS["danger"],
+    "Cancelled": "gray",
+}
 
 
 class ReportsModule:
     def __init__(self, app):
         self.app = app
+        self.frame = None
+        self.jobs_list = None
+        self.job_rows = {}
+        self.poll_job = None
+        self.fmt = "xlsx"
 
     # ================= MAIN VIEW =================
 
-    def show(self):
-        for w in self.app.main_content.winfo_children():
-            w.destroy()
-
-        header = ctk.CTkFrame(self.app.main_content, fg_color="transparent", height=80)
+    def build(self):
+        """Create the screen's widgets once; refresh() updates the job list"""
+        header = ctk.CTkFrame(self.frame, fg_color="transparent", height=80)
         header.pack(fill="x", padx=30, pady=(20, 10))
 
         ctk.CTkLabel(
@@ -28,14 +41,27 @@ class ReportsModule:
             font=ctk.CTkFont(size=28, weight="bold")
         ).pack(side="left")
 
-        body = ctk.CTkFrame(self.app.main_content)
-        body.pack(fill="both", expand=True, padx=30, pady=20)
+        body = ctk.CTkFrame(self.frame)
+        body.pack(side="left", fill="both", expand=True, padx=(30, 10), pady=20)
 
         ctk.CTkLabel(
             body,
-            text="📊 Export Data to Excel",
+            text="📊 Export Data",
             font=ctk.CTkFont(size=22, weight="bold")
-        ).pack(pady=30)
+        ).pack(pady=(30, 10))
+
+        fmt_row = ctk.CTkFrame(body, fg_color="transparent")
+        fmt_row.pack()
+
+        labels = {cls.label: fmt for fmt, cls in FORMATS.items()}
+        ctk.CTkLabel(fmt_row, text="Format:", font=ctk.CTkFont(size=12, weight="bold")).pack(side="left", padx=5)
+        fmt_menu = ctk.CTkOptionMenu(
+            fmt_row,
+            values=list(labels),
+            command=lambda label: setattr(self, "fmt", labels[label])
+        )
+        fmt_menu.set(FORMATS[self.fmt].label)
+        fmt_menu.pack(side="left", padx=5)
 
         btns = ctk.CTkFrame(body, fg_color="transparent")
         btns.pack(pady=20)
@@ -67,90 +93,109 @@ class ReportsModule:
             command=self.export_attendance_dialog
         ).pack(pady=10)
 
-    # ================= STUDENTS =================
+        self._jobs_panel()
 
-    def export_students(self):
-        students = self.app.db.get_all_students()
-        if not students:
-            messagebox.showwarning("No Data", "No students to export")
-            return
+    # ================= RECENT EXPORTS =================
 
-        path = filedialog.asksaveasfilename(
-            defaultextension=".xlsx",
-            filetypes=[("Excel files", "*.xlsx")],
-            initialfile=f"students_{datetime.now():%Y%m%d_%H%M%S}.xlsx"
-        )
-        if not path:
+    def _jobs_panel(self):
+        panel = ctk.CTkFrame(self.frame, width=420)
+        panel.pack(side="right", fill="y", padx=(10, 30), pady=20)
+        panel.pack_propagate(False)
+
+        ctk.CTkLabel(
+            panel,
+            text="🕒 Recent Exports",
+            font=ctk.CTkFont(size=18, weight="bold")
+        ).pack(pady=(15, 5))
+
+        self.jobs_list = ctk.CTkScrollableFrame(panel, fg_color="transparent")
+        self.jobs_list.pack(fill="both", expand=True, padx=10, pady=10)
+
+    def refresh(self):
+        if self.poll_job is not None:
+            self.app.after_cancel(self.poll_job)
+            self.poll_job = None
+        self._refresh_jobs()
+
+    def _refresh_jobs(self):
+        """Redraw the job list from the queue; keeps polling while jobs are active"""
+        self.poll_job = None
+        if not self.jobs_list.winfo_exists():
             return
 
-        wb = openpyxl.Workbook()
-        ws = wb.active
-        ws.title = "Students"
-
-        headers = [
-            "Student ID", "First Name", "Last Name", "Gender",
-            "DOB", "Email", "Phone", "Address",
-            "Course", "Admission Date", "Status"
-        ]
-
-        self._write_headers(ws, headers, "1f538d")
-
-        for r, s in enumerate(students, 2):
-            ws.cell(r, 1, s["student_id"])
-            ws.cell(r, 2, s["first_name"])
-            ws.cell(r, 3, s["last_name"])
-            ws.cell(r, 4, s["gender"])
-            ws.cell(r, 5, s["dob"])
-            ws.cell(r, 6, s["email"])
-            ws.cell(r, 7, s["phone"])
-            ws.cell(r, 8, s["address"])
-            ws.cell(r, 9, s.get("course_name", "N/A"))
-            ws.cell(r, 10, s["admission_date"])
-            ws.cell(r, 11, s["status"])
-
-        self._autosize(ws)
-        wb.save(path)
-        messagebox.showinfo("Success", "Students exported successfully")
+        jobs = self.app.exports.recent()
+        if [job.job_id for job in jobs] != list(self.job_rows):
+            self._rebuild_job_rows(jobs)
 
-    # ================= COURSES =================
+        for job in jobs:
+            status, rows, cancel = self.job_rows[job.job_id]
+            status.configure(text=job.status, text_color=STATUS_COLORS[job.status])
+            rows.configure(text=job.error or f"{job.rows:,} rows")
+            if not job.active and cancel.winfo_ismapped():
+                cancel.pack_forget()
 
-    def export_courses(self):
-        courses = self.app.db.get_all_courses()
-        if not courses:
-            messagebox.showwarning("No Data", "No courses to export")
+        # Polling stops when the user leaves; refresh() restarts it on return
+        if self.app.exports.has_active() and self.app.current_section == "reports":
+            self.poll_job = self.app.after(JOB_POLL_MS, self._refresh_jobs)
+
+    def _rebuild_job_rows(self, jobs):
+        for w in self.jobs_list.winfo_children():
+            w.destroy()
+        self.job_rows = {}
+
+        if not jobs:
+            ctk.CTkLabel(self.jobs_list, text="No exports yet", text_color="gray").pack(pady=20)
             return
 
-        path = filedialog.asksaveasfilename(
-            defaultextension=".xlsx",
-            filetypes=[("Excel files", "*.xlsx")],
-            initialfile=f"courses_{datetime.now():%Y%m%d_%H%M%S}.xlsx"
-        )
+        for job in jobs:
+            row = ctk.CTkFrame(self.jobs_list)
+            row.pack(fill="x", pady=4)
+
+            info = ctk.CTkFrame(row, fg_color="transparent")
+            info.pack(side="left", fill="x", expand=True, padx=10, pady=6)
+
+            ctk.CTkLabel(
+                info,
+                text=job.filename,
+                font=ctk.CTkFont(size=12, weight="bold"),
+                anchor="w"
+            ).pack(fill="x")
+
+            status = ctk.CTkLabel(info, text="", font=ctk.CTkFont(size=11, weight="bold"), anchor="w")
+            status.pack(side="left")
+
+            rows = ctk.CTkLabel(info, text="", font=ctk.CTkFont(size=11), anchor="w", wraplength=220)
+            rows.pack(side="left", padx=10)
+
+            cancel = ctk.CTkButton(
+                row,
+                text="Cancel",
+                width=70,
+                fg_color=COLORS["danger"],
+                command=job.cancel
+            )
+            if job.active:
+                cancel.pack(side="right", padx=10)
+
+            self.job_rows[job.job_id] = (status, rows, cancel)
+
+    # ================= STUDENTS =================
+
+    def export_students(self):
+        path = self._ask_path("students")
         if not path:
             return
 
-        wb = openpyxl.Workbook()
-        ws = wb.active
-        ws.title = "Courses"
-
-        headers = [
-            "Course ID", "Name", "Code", "Description",
-            "Duration (Months)", "Fees", "Students Enrolled"
-        ]
+        self._export("students", path)
 
-        self._write_headers(ws, headers, "14a085")
+    # ================= COURSES =================
 
-        for r, c in enumerate(courses, 2):
-            ws.cell(r, 1, c["course_id"])
-            ws.cell(r, 2, c["course_name"])
-            ws.cell(r, 3, c["course_code"])
-            ws.cell(r, 4, c["description"])
-            ws.cell(r, 5, c["duration_months"])
-            ws.cell(r, 6, c["fees"])
-            ws.cell(r, 7, c["student_count"])
+    def export_courses(self):
+        path = self._ask_path("courses")
+        if not path:
+            return
 
-        self._autosize(ws)
-        wb.save(path)
-        messagebox.showinfo("Success", "Courses exported successfully")
+        self._export("courses", path)
 
     # ================= ATTENDANCE =================
 
@@ -173,51 +218,28 @@ class ReportsModule:
         end.pack(pady=5)
 
         def export():
-            data = self.app.db.get_attendance_full_by_date_range(start.get_date(), end.get_date())
-            if not data:
-                messagebox.showwarning("No Data", "No records found")
-                return
-
-            path = filedialog.asksaveasfilename(
-                defaultextension=".xlsx",
-                filetypes=[("Excel files", "*.xlsx")],
-                initialfile=f"attendance_{datetime.now():%Y%m%d_%H%M%S}.xlsx"
-            )
+            path = self._ask_path("attendance")
             if not path:
                 return
 
-            wb = openpyxl.Workbook()
-            ws = wb.active
-            ws.title = "Attendance"
-
-            headers = ["Student ID", "Student Name", "Course", "Date", "Status", "Remarks"]
-            self._write_headers(ws, headers, "f39c12")
-
-            for r, rec in enumerate(data, 2):
-                ws.cell(r, 1, rec["student_id"])
-                ws.cell(r, 2, rec["student_name"])
-                ws.cell(r, 3, rec["course_name"])
-                ws.cell(r, 4, rec["attendance_date"])
-                ws.cell(r, 5, rec["status"])
-                ws.cell(r, 6, rec["remarks"])
-
-            self._autosize(ws)
-            wb.save(path)
-            messagebox.showinfo("Success", "Attendance exported successfully")
+            self._export("attendance", path, start_date=start.get_date(), end_date=end.get_date())
             dialog.destroy()
 
         ctk.CTkButton(dialog, text="Export", command=export).pack(pady=15)
 
     # ================= HELPERS =================
 
-    def _write_headers(self, ws, headers, color):
-        for c, h in enumerate(headers, 1):
-            cell = ws.cell(1, c, h)
-            cell.font = Font(bold=True, color="FFFFFF")
-            cell.fill = PatternFill(start_color=color, end_color=color, fill_type="solid")
-            cell.alignment = Alignment(horizontal="center")
-
-    def _autosize(self, ws):
-        for col in ws.columns:
-            length = max(len(str(c.value)) if c.value else 0 for c in col)
-            ws.column_dimensions[col[0].column_letter].width = length + 2
+    def _ask_path(self, name):
+        """Ask where to save an export in the selected format"""
+        exporter = FORMATS[self.fmt]
+        return filedialog.asksaveasfilename(
+            defaultextension=exporter.extension,
+            filetypes=[(f"{exporter.label} files", f"*{exporter.extension}")],
+            initialfile=f"{name}_{datetime.now():%Y%m%d_%H%M%S}{exporter.extension}"
+        )
+
+    def _export(self, dataset, path, **params):
+        """Queue a background export of dataset to path and show it in Recent exports"""
+        self.app.exports.submit(dataset, path, self.fmt, **params)
+        if self.poll_job is None:
+            self._refresh_jobs()
@@ -6,24 +6,53 @@ from datetime import datetime
 from PIL import Image, ImageTk
 import os
 import shutil
-from utils import sort_students_by_name, binary_search_student_by_id
 from config import COLORS
+from widgets import VirtualTreeview
+from importer import import_students
+
+# Rows fetched per keyset page while scrolling the student table
+PAGE_SIZE = 200
+
+# Typeahead search: max results shown and keystroke debounce (ms)
+SEARCH_LIMIT = 100
+SEARCH_DELAY = 250
+
+SEARCH_FILTERS = {
+    "All Fields": "all",
+    "Student ID": "student_id",
+    "First Name": "first_name",
+    "Last Name": "last_name",
+    "Email": "email",
+}
 
 
 class StudentsModule:
     def __init__(self, app):
         self.app = app
+        self.frame = None
         self.selected_photo_path = None
         self.photo_preview_label = None
         self.student_tree = None
+        self.count_label = None
 
-    # ================= MAIN VIEW =================
+        # keyset paging state
+        self.next_key = None
+        self.loaded_count = 0
+        self.total_estimate = 0
+        self.page_pending = False
+        self.load_task = None
 
-    def show(self):
-        for w in self.app.main_content.winfo_children():
-            w.destroy()
+        # typeahead search state
+        self.search_entry = None
+        self.search_filter = None
+        self.search_job = None
+        self.import_btn = None
 
-        header = ctk.CTkFrame(self.app.main_content, fg_color="transparent", height=80)
+    # ================= MAIN VIEW =================
+
+    def build(self):
+        """Create the screen's widgets once; refresh() reloads the table"""
+        header = ctk.CTkFrame(self.frame, fg_color="transparent", height=80)
         header.pack(fill="x", padx=30, pady=(20, 10))
 
         ctk.CTkLabel(
@@ -42,66 +71,163 @@ class StudentsModule:
             command=self.show_add_student_dialog
         ).pack(side="left", padx=5)
 
+        self.import_btn = ctk.CTkButton(
+            btn_frame,
+            text="📥 Import",
+            fg_color=COLORS["primary"],
+            command=self.import_students
+        )
+        self.import_btn.pack(side="left", padx=5)
+
         ctk.CTkButton(
             btn_frame,
             text="🔄 Refresh",
             fg_color=COLORS["info"],
-            command=self.load_students
+            command=self.run_search
         ).pack(side="left", padx=5)
 
+        self._search_bar()
         self._create_table()
-        self.load_students()
+
+    def refresh(self):
+        """Reload the table, keeping whatever is typed in the search box"""
+        self.run_search()
+
+    # ================= SEARCH =================
+
+    def _search_bar(self):
+        bar = ctk.CTkFrame(self.frame, fg_color="transparent")
+        bar.pack(fill="x", padx=30)
+
+        self.search_entry = ctk.CTkEntry(
+            bar,
+            placeholder_text="🔍 Search by ID, name or email",
+            width=360
+        )
+        self.search_entry.pack(side="left", padx=(0, 10))
+        self.search_entry.bind("<KeyRelease>", lambda e: self._schedule_search())
+
+        self.search_filter = ctk.CTkOptionMenu(
+            bar,
+            values=list(SEARCH_FILTERS.keys()),
+            command=lambda _: self.run_search()
+        )
+        self.search_filter.pack(side="left")
+
+    def _schedule_search(self):
+        # Debounce so a burst of keystrokes costs a single query
+        if self.search_job:
+            self.app.after_cancel(self.search_job)
+        self.search_job = self.app.after(SEARCH_DELAY, self.run_search)
+
+    def run_search(self):
+        """Show search results, or the paged list when the search box is empty"""
+        self.search_job = None
+        term = self.search_entry.get().strip()
+        if not term:
+            self.load_students()
+            return
+
+        filter_by = SEARCH_FILTERS[self.search_filter.get()]
+        self.next_key = None
+        self.page_pending = False
+        self.count_label.configure(text="⏳ Searching...")
+        self._start_load(
+            self.app.db.search_students, term, filter_by,
+            limit=SEARCH_LIMIT,
+            on_success=lambda results: self._show_results(term, results)
+        )
+
+    def _show_results(self, term, results):
+        self.student_tree.clear()
+        self.student_tree.append_rows(self._row_values(s) for s in results)
+
+        more = "+" if len(results) == SEARCH_LIMIT else ""
+        self.count_label.configure(text=f"{len(results)}{more} matches for \"{term}\"")
 
     # ================= TABLE =================
 
     def _create_table(self):
-        table_frame = ctk.CTkFrame(self.app.main_content)
+        table_frame = ctk.CTkFrame(self.frame)
         table_frame.pack(fill="both", expand=True, padx=30, pady=20)
 
-        tree_scroll = tk.Scrollbar(table_frame)
-        tree_scroll.pack(side="right", fill="y")
+        self.count_label = ctk.CTkLabel(table_frame, text="", text_color="gray")
+        self.count_label.pack(side="bottom", anchor="e", padx=10)
 
         columns = ("ID", "Name", "Gender", "Email", "Course", "Status")
 
-        self.student_tree = tk.ttk.Treeview(
-            table_frame,
-            columns=columns,
-            show="headings",
-            yscrollcommand=tree_scroll.set
+        # Only the visible rows exist as Treeview items; pages stream into its column store
+        self.student_tree = VirtualTreeview(table_frame, columns, on_scroll_end=self._on_scroll_end)
+        self.student_tree.pack(fill="both", expand=True)
+
+        self.student_tree.bind_row("<Double-1>", self.view_student)
+
+    # ================= DATA =================
+
+    def load_students(self):
+        """Reset the table and fetch the first page of students in the background"""
+        self.next_key = None
+        self.loaded_count = 0
+        self.page_pending = False
+        self.student_tree.clear()
+        self.count_label.configure(text="⏳ Loading students...")
+
+        self._start_load(
+            self.app.db.get_students_page,
+            limit=PAGE_SIZE,
+            on_success=self._first_page
+        )
+
+    def load_more(self):
+        """Fetch the next keyset page in the background, if there is one"""
+        if self.next_key is None or self.page_pending:
+            return
+        self.page_pending = True
+        self._start_load(
+            self.app.db.get_students_page,
+            after_key=self.next_key,
+            limit=PAGE_SIZE,
+            on_success=self._append_page
         )
 
-        tree_scroll.config(command=self.student_tree.yview)
+    def _start_load(self, fn, *args, on_success, **kwargs):
+        # Only the latest request may fill the table
+        if self.load_task:
+            self.load_task.cancel()
+        self.load_task = self.app.tasks.submit(fn, *args, on_success=on_success, group="screen", **kwargs)
 
-        for col in columns:
-            self.student_tree.heading(col, text=col)
-            self.student_tree.column(col, width=140)
+    def _on_scroll_end(self):
+        # The table asks for more once the view gets within a screen of the end
+        self.load_more()
 
-        self.student_tree.pack(fill="both", expand=True)
+    def _first_page(self, page):
+        self.total_estimate = page["total"] or 0
+        self._append_page(page)
 
-        self.student_tree.bind("<Double-1>", lambda e: self.view_student())
+    def _append_page(self, page):
+        # Set the cursor first: if the page doesn't fill the view the append asks for the next one
+        self.page_pending = False
+        self.next_key = page["next_key"]
 
-    # ================= DATA =================
+        self.student_tree.append_rows(self._row_values(s) for s in page["rows"])
 
-    def load_students(self):
-        for row in self.student_tree.get_children():
-            self.student_tree.delete(row)
-
-        students = self.app.db.get_all_students()
-
-        for s in students:
-            name = f"{s['first_name']} {s['last_name']}"
-            self.student_tree.insert(
-                "",
-                "end",
-                values=(
-                    s["student_id"],
-                    name,
-                    s["gender"],
-                    s["email"],
-                    s.get("course_name", "N/A"),
-                    s["status"]
-                )
-            )
+        self.loaded_count += len(page["rows"])
+        self.total_estimate = max(self.total_estimate, self.loaded_count)
+
+        approx = "~" if self.next_key is not None else ""
+        self.count_label.configure(
+            text=f"Showing {self.loaded_count} of {approx}{self.total_estimate} students"
+        )
+
+    def _row_values(self, s):
+        return (
+            s["student_id"],
+            f"{s['first_name']} {s['last_name']}",
+            s["gender"],
+            s["email"],
+            s.get("course_name", "N/A"),
+            s["status"]
+        )
 
     # ================= ADD STUDENT =================
 
@@ -131,6 +257,10 @@ class StudentsModule:
                 return
 
             student_id = self.app.db.generate_student_id()
+            if student_id is None:
+                messagebox.showerror("Error", "Could not allocate a student ID")
+                return
+
             data = (
                 student_id,
                 first_name.get(),
@@ -147,20 +277,63 @@ class StudentsModule:
             if success:
                 messagebox.showinfo("Success", msg)
                 dialog.destroy()
-                self.load_students()
+                self.run_search()
             else:
                 messagebox.showerror("Error", msg)
 
         ctk.CTkButton(dialog, text="Save", fg_color=COLORS["success"], command=save).pack(pady=20)
 
-    # ================= VIEW =================
+    # ================= IMPORT =================
 
-    def view_student(self):
-        selected = self.student_tree.selection()
-        if not selected:
+    def import_students(self):
+        """Bulk-admit students from a CSV/XLSX file on a worker thread"""
+        path = filedialog.askopenfilename(
+            title="Import Students",
+            filetypes=[("Student files", "*.csv *.xlsx *.gz"), ("All files", "*.*")]
+        )
+        if not path:
+            return
+
+        self.import_btn.configure(state="disabled", text="⏳ Importing...")
+        # "session", not "screen": the import keeps going (and reports back)
+        # if the user moves to another screen, but not past a logout
+        self.app.tasks.submit(
+            import_students, self.app.db, path,
+            on_success=self._import_done,
+            on_error=self._import_failed,
+            group="session"
+        )
+
+    def _import_done(self, result):
+        if not self.import_btn.winfo_exists():
+            return
+        self.import_btn.configure(state="normal", text="📥 Import")
+        if self.app.current_section == "students":
+            self.run_search()
+
+        if not result.rejected:
+            messagebox.showinfo("Import Complete", result.summary())
             return
 
-        student_id = self.student_tree.item(selected[0])["values"][0]
+        if messagebox.askyesno("Import Complete", result.summary() + "\n\nSave a report of the rejected rows?"):
+            path = filedialog.asksaveasfilename(
+                defaultextension=".csv",
+                initialfile="import_errors.csv",
+                filetypes=[("CSV files", "*.csv")]
+            )
+            if path:
+                result.write_error_report(path)
+
+    def _import_failed(self, error):
+        if not self.import_btn.winfo_exists():
+            return
+        self.import_btn.configure(state="normal", text="📥 Import")
+        messagebox.showerror("Import Failed", str(error))
+
+    # ================= VIEW =================
+
+    def view_student(self, row):
+        student_id = row[0]
         student = self.app.db.get_student_by_id(student_id)
 
         messagebox.showinfo(
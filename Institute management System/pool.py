@@ -0,0 +1,235 @@
+"""
+Connection Pool for Student Management System
+Bounded, thread-safe pool of database connections shared by Database
+"""
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+
+class PoolTimeout(Exception):
+    """Raised when no connection becomes free within the checkout timeout"""
+
+
+class PoolClosed(Exception):
+    """Raised when borrowing from a pool that has been closed"""
+
+
+class _PooledConnection:
+    """Raw connection plus the bookkeeping the pool needs"""
+
+    __slots__ = ("raw", "created_at", "last_used")
+
+    def __init__(self, raw):
+        now = time.monotonic()
+        self.raw = raw
+        self.created_at = now
+        self.last_used = now
+
+
+class ConnectionPool:
+    """Bounded connection pool with checkout/return semantics
+
+    - at most ``max_size`` connections are open at any time
+    - borrowers wait up to ``checkout_timeout`` seconds for a free one
+    - connections idle longer than ``ping_after_idle`` are pinged on borrow
+    - connections idle longer than ``idle_timeout`` are evicted
+    - connections older than ``max_lifetime`` are recycled
+    """
+
+    def __init__(self, factory, max_size=8, checkout_timeout=10,
+                 idle_timeout=300, max_lifetime=1800, ping_after_idle=5,
+                 disconnect_errors=()):
+        self.factory = factory
+        self.max_size = max_size
+        self.checkout_timeout = checkout_timeout
+        self.idle_timeout = idle_timeout
+        self.max_lifetime = max_lifetime
+        self.ping_after_idle = ping_after_idle
+        self.disconnect_errors = tuple(disconnect_errors)
+
+        self._idle = deque()
+        self._size = 0
+        self._closed = False
+        self._cond = threading.Condition(threading.Lock())
+
+    # ================= CHECKOUT / RETURN =================
+
+    def checkout(self, timeout=None):
+        """Borrow a healthy connection, waiting if the pool is exhausted
+
+        timeout overrides checkout_timeout; 0 fails at once rather than wait.
+        """
+        timeout = self.checkout_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+
+        while True:
+            pooled = None
+            create = False
+
+            with self._cond:
+                while True:
+                    if self._closed:
+                        raise PoolClosed("Connection pool is closed")
+
+                    self._evict_expired()
+                    if self._idle:
+                        # LIFO keeps the hot connections hot and lets the rest idle out
+                        pooled = self._idle.pop()
+                        break
+                    if self._size < self.max_size:
+                        self._size += 1
+                        create = True
+                        break
+
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise PoolTimeout(
+                            f"No connection available after {timeout}s "
+                            f"({self.max_size} in use)"
+                        )
+                    self._cond.wait(remaining)
+
+            if create:
+                try:
+                    pooled = _PooledConnection(self.factory())
+                except BaseException:
+                    self._forget()
+                    raise
+            elif not self._is_healthy(pooled):
+                self._close_raw(pooled)
+                self._forget()
+                continue
+
+            pooled.last_used = time.monotonic()
+            return pooled
+
+    def release(self, pooled, discard=False):
+        """Return a borrowed connection; broken or expired ones are closed"""
+        now = time.monotonic()
+        with self._cond:
+            if not discard and not self._closed and not self._too_old(pooled, now):
+                pooled.last_used = now
+                self._idle.append(pooled)
+                self._cond.notify()
+                return
+
+        self._close_raw(pooled)
+        self._forget()
+
+    # ================= CONTEXT MANAGERS =================
+
+    @contextmanager
+    def connection(self, timeout=None):
+        """Borrow a connection for the duration of a ``with`` block"""
+        pooled = self.checkout(timeout)
+        broken = False
+        try:
+            yield pooled.raw
+        except self.disconnect_errors:
+            broken = True
+            raise
+        finally:
+            self.release(pooled, discard=broken)
+
+    @contextmanager
+    def cursor(self, cursorclass=None):
+        """Borrow a connection and yield a fresh cursor on it"""
+        with self.connection() as conn:
+            cursor = conn.cursor(cursorclass) if cursorclass else conn.cursor()
+            try:
+                yield cursor
+            finally:
+                cursor.close()
+
+    @contextmanager
+    def transaction(self):
+        """Yield a cursor inside a transaction, committed on success and rolled back on error"""
+        with self.connection() as conn:
+            conn.begin()
+            cursor = conn.cursor()
+            try:
+                yield cursor
+                conn.commit()
+            except BaseException:
+                try:
+                    conn.rollback()
+                except Exception:
+                    pass
+                raise
+            finally:
+                cursor.close()
+
+    # ================= MAINTENANCE =================
+
+    def evict_idle(self):
+        """Close idle connections past their idle timeout or lifetime"""
+        with self._cond:
+            self._evict_expired()
+
+    def stats(self):
+        """Snapshot of pool occupancy"""
+        with self._cond:
+            return {
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": self._size - len(self._idle),
+                "max_size": self.max_size,
+            }
+
+    def close(self):
+        """Close every idle connection; borrowed ones are closed on return"""
+        with self._cond:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._size -= len(idle)
+            self._cond.notify_all()
+
+        for pooled in idle:
+            self._close_raw(pooled)
+
+    # ================= INTERNALS =================
+
+    def _evict_expired(self):
+        # Caller holds the lock; oldest-returned connections sit at the left
+        now = time.monotonic()
+        keep = deque()
+        evicted = 0
+        while self._idle:
+            pooled = self._idle.popleft()
+            if self._too_old(pooled, now) or now - pooled.last_used > self.idle_timeout:
+                self._close_raw(pooled)
+                evicted += 1
+            else:
+                keep.append(pooled)
+        self._idle = keep
+        if evicted:
+            self._size -= evicted
+            self._cond.notify(evicted)
+
+    def _too_old(self, pooled, now):
+        return self.max_lifetime and now - pooled.created_at > self.max_lifetime
+
+    def _is_healthy(self, pooled):
+        if time.monotonic() - pooled.last_used < self.ping_after_idle:
+            return True
+        try:
+            pooled.raw.ping(reconnect=False)
+            return True
+        except Exception:
+            return False
+
+    def _forget(self):
+        with self._cond:
+            self._size -= 1
+            self._cond.notify()
+
+    @staticmethod
+    def _close_raw(pooled):
+        try:
+            pooled.raw.close()
+        except Exception:
+            pass
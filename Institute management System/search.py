@@ -0,0 +1,166 @@
+"""
+Student Search for Student Management System
+Indexed prefix / full-text search helpers used by Database.search_students
+"""
+
+import re
+
+# Columns a search may be narrowed to (never interpolate anything else into SQL)
+SEARCH_COLUMNS = ("student_id", "first_name", "last_name", "email")
+
+# Name of the FULLTEXT index over the searchable text columns
+FULLTEXT_INDEX = "ft_students_search"
+
+# index name -> DDL; the ngram parser lets MATCH find infixes, not just whole words
+SEARCH_INDEXES = {
+    FULLTEXT_INDEX: (
+        f"ALTER TABLE students ADD FULLTEXT INDEX {FULLTEXT_INDEX} "
+        "(first_name, last_name, email) WITH PARSER ngram"
+    ),
+    "idx_students_first_name": "CREATE INDEX idx_students_first_name ON students (first_name)",
+    "idx_students_last_name": "CREATE INDEX idx_students_last_name ON students (last_name)",
+}
+
+# SQLite has no FULLTEXT indexes: an FTS5 table over the same columns, kept
+# in step with students by triggers, plays the part
+SQLITE_SEARCH_INDEXES = {
+    FULLTEXT_INDEX: [
+        f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS {FULLTEXT_INDEX}
+        USING fts5(first_name, last_name, email, content='students', content_rowid='rowid')
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {FULLTEXT_INDEX}_insert AFTER INSERT ON students BEGIN
+            INSERT INTO {FULLTEXT_INDEX} (rowid, first_name, last_name, email)
+            VALUES (new.rowid, new.first_name, new.last_name, new.email);
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {FULLTEXT_INDEX}_delete AFTER DELETE ON students BEGIN
+            INSERT INTO {FULLTEXT_INDEX} ({FULLTEXT_INDEX}, rowid, first_name, last_name, email)
+            VALUES ('delete', old.rowid, old.first_name, old.last_name, old.email);
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {FULLTEXT_INDEX}_update AFTER UPDATE ON students BEGIN
+            INSERT INTO {FULLTEXT_INDEX} ({FULLTEXT_INDEX}, rowid, first_name, last_name, email)
+            VALUES ('delete', old.rowid, old.first_name, old.last_name, old.email);
+            INSERT INTO {FULLTEXT_INDEX} (rowid, first_name, last_name, email)
+            VALUES (new.rowid, new.first_name, new.last_name, new.email);
+        END
+        """,
+        # Index the students that were there before the table existed
+        f"INSERT INTO {FULLTEXT_INDEX} ({FULLTEXT_INDEX}) VALUES ('rebuild')",
+    ],
+    "idx_students_first_name": ["CREATE INDEX idx_students_first_name ON students (first_name)"],
+    "idx_students_last_name": ["CREATE INDEX idx_students_last_name ON students (last_name)"],
+}
+
+# "All fields" search: a student_id prefix scan plus a ranked full-text
+# match over names and email, best matches first
+ALL_FIELDS_QUERY = {
+    "mysql": """
+    SELECT * FROM (
+        (SELECT s.*, c.course_name, 2 as score
+         FROM students s
+         LEFT JOIN courses c ON s.course_id = c.course_id
+         WHERE s.student_id LIKE %s
+         LIMIT %s)
+        UNION ALL
+        (SELECT s.*, c.course_name,
+                MATCH(s.first_name, s.last_name, s.email) AGAINST (%s IN BOOLEAN MODE) as score
+         FROM students s
+         LEFT JOIN courses c ON s.course_id = c.course_id
+         WHERE MATCH(s.first_name, s.last_name, s.email) AGAINST (%s IN BOOLEAN MODE)
+           AND s.student_id NOT LIKE %s
+         ORDER BY score DESC
+         LIMIT %s)
+    ) results
+    ORDER BY score DESC, last_name, first_name
+    LIMIT %s
+    """,
+    # bm25() is lower for better matches; ID matches rank first
+    "sqlite": f"""
+    SELECT * FROM (
+        SELECT s.*, c.course_name, 0 as kind, 0.0 as score
+        FROM students s
+        LEFT JOIN courses c ON s.course_id = c.course_id
+        WHERE s.student_id LIKE %s ESCAPE '\\'
+        LIMIT %s
+    )
+    UNION ALL
+    SELECT * FROM (
+        SELECT s.*, c.course_name, 1 as kind, bm25({FULLTEXT_INDEX}) as score
+        FROM {FULLTEXT_INDEX}
+        JOIN students s ON s.rowid = {FULLTEXT_INDEX}.rowid
+        LEFT JOIN courses c ON s.course_id = c.course_id
+        WHERE {FULLTEXT_INDEX} MATCH %s AND s.student_id NOT LIKE %s ESCAPE '\\'
+        ORDER BY score
+        LIMIT %s
+    )
+    ORDER BY kind, score, last_name, first_name
+    LIMIT %s
+    """,
+}
+
+# Characters with a meaning in MATCH ... AGAINST (... IN BOOLEAN MODE)
+_BOOLEAN_OPERATORS = '+-<>()~*"@'
+
+
+def boolean_query(term):
+    """Turn free text into a BOOLEAN MODE query requiring every word as a prefix"""
+    cleaned = "".join(" " if ch in _BOOLEAN_OPERATORS else ch for ch in term)
+    return " ".join(f"+{word}*" for word in cleaned.split())
+
+
+def fts_query(term):
+    """Turn free text into an FTS5 query requiring every word as a prefix"""
+    words = re.findall(r"\w+", term)
+    return " ".join(f'"{word}"*' for word in words)
+
+
+def all_fields_query(backend, term, limit):
+    """(query, params) searching every field for term on backend"""
+    prefix = prefix_pattern(term)
+    if backend.name == "sqlite":
+        params = (prefix, limit, fts_query(term) or '""', prefix, limit, limit)
+    else:
+        match = boolean_query(term)
+        params = (prefix, limit, match, match, prefix, limit, limit)
+    return ALL_FIELDS_QUERY[backend.name], params
+
+
+def prefix_pattern(term):
+    """LIKE pattern matching values that start with term (wildcards escaped)"""
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"{escaped}%"
+
+
+def ensure_search_indexes(cursor, backend):
+    """Create any missing search index on the students table"""
+    if backend.name == "sqlite":
+        cursor.execute("SELECT name FROM sqlite_master")
+        existing = {row["name"] for row in cursor.fetchall()}
+        for name, statements in SQLITE_SEARCH_INDEXES.items():
+            if name not in existing:
+                for statement in statements:
+                    cursor.execute(statement)
+        return
+
+    cursor.execute("""
+        SELECT DISTINCT INDEX_NAME as name
+        FROM information_schema.STATISTICS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'students'
+    """)
+    existing = {row["name"] for row in cursor.fetchall()}
+
+    for name, ddl in SEARCH_INDEXES.items():
+        if name in existing:
+            continue
+        try:
+            cursor.execute(ddl)
+        except Exception:
+            if name != FULLTEXT_INDEX:
+                raise
+            # Servers without the ngram plugin still get a word-level index
+            cursor.execute(ddl.replace(" WITH PARSER ngram", ""))
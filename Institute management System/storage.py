@@ -0,0 +1,532 @@
+"""
+Storage Backends for Student Management System
+Connections, schema and SQL dialect fragments for MySQL and SQLite
+
+Database writes its queries once with %s placeholders and asks its backend
+for the few fragments that differ between the two (upserts, date
+functions, locking reads, catalog lookups).
+"""
+
+import os
+import re
+import sqlite3
+from datetime import date, datetime
+from decimal import Decimal
+
+from config import DB_CONFIG, STORAGE_CONFIG
+
+
+class StorageBackend:
+    """Opens connections for ConnectionPool and speaks one SQL dialect
+
+    Connections must behave like PyMySQL's: autocommit, dict rows,
+    begin()/commit()/rollback(), ping() and %s placeholders.
+    """
+
+    name = ""
+    # Base of every exception the driver raises
+    Error = Exception
+    # Exceptions meaning "this row breaks a unique or foreign key"
+    IntegrityError = Exception
+    # Exceptions after which a connection must not go back to the pool
+    disconnect_errors = ()
+    # Cursor class for unbuffered streaming reads (None: the default streams)
+    stream_cursorclass = None
+    # Appended to a locking SELECT inside a transaction
+    for_update = ""
+    # Appended to LIKE patterns built by search.prefix_pattern
+    like_escape = ""
+    # Prefix turning a query into a query plan
+    explain_prefix = "EXPLAIN "
+
+    def connect(self):
+        raise NotImplementedError
+
+    def check(self):
+        """Raise if the server (or file location) can't be reached"""
+
+    def create_database(self):
+        raise NotImplementedError
+
+    def drop_database(self):
+        raise NotImplementedError
+
+    def tables(self):
+        """CREATE TABLE statements for the base schema, in dependency order"""
+        raise NotImplementedError
+
+    # ================= DIALECT =================
+
+    def upsert(self, key, **assignments):
+        """Clause turning INSERT ... VALUES into an upsert on the unique key columns"""
+        raise NotImplementedError
+
+    def new(self, column):
+        """The incoming value of column inside an upsert clause"""
+        raise NotImplementedError
+
+    def concat(self, *parts):
+        """String concatenation of SQL expressions"""
+        raise NotImplementedError
+
+    def month(self, column):
+        """'YYYY-MM' of a date column"""
+        raise NotImplementedError
+
+    def month_start(self, column):
+        """First day of the month of a date column"""
+        raise NotImplementedError
+
+    def months_ago(self, months):
+        """The date `months` months before today"""
+        raise NotImplementedError
+
+    def index_exists(self, cursor, table, name):
+        raise NotImplementedError
+
+    def column_exists(self, cursor, table, name):
+        raise NotImplementedError
+
+    def add_column(self, table, name, definition, after=None):
+        """ALTER TABLE statement adding a column"""
+        raise NotImplementedError
+
+    def estimate_rows(self, cursor, table):
+        """Cheap row count estimate for table, or None if there is none"""
+        return None
+
+    def full_scans(self, plan):
+        """Table aliases an explain_prefix plan reads with a full scan"""
+        raise NotImplementedError
+
+
+def backend_from_config():
+    """The backend chosen by STORAGE_CONFIG["backend"]"""
+    kind = STORAGE_CONFIG["backend"]
+    if kind == "mysql":
+        return MySQLBackend()
+    if kind == "sqlite":
+        return SQLiteBackend(STORAGE_CONFIG["sqlite_path"])
+    raise ValueError(f"Unknown storage backend: {kind}")
+
+
+# ================= MYSQL =================
+
+MYSQL_TABLES = [
+    # Courses first due to foreign keys
+    """
+    CREATE TABLE IF NOT EXISTS courses (
+        course_id INT AUTO_INCREMENT PRIMARY KEY,
+        course_name VARCHAR(100) NOT NULL UNIQUE,
+        course_code VARCHAR(20) NOT NULL UNIQUE,
+        description TEXT,
+        duration_months INT,
+        fees DECIMAL(10, 2),
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS students (
+        student_id VARCHAR(20) PRIMARY KEY,
+        first_name VARCHAR(50) NOT NULL,
+        last_name VARCHAR(50) NOT NULL,
+        gender ENUM('Male', 'Female', 'Other') NOT NULL,
+        dob DATE NOT NULL,
+        email VARCHAR(100) UNIQUE,
+        phone VARCHAR(15),
+        address TEXT,
+        course_id INT,
+        admission_date DATE NOT NULL,
+        photo_path VARCHAR(255),
+        status ENUM('Active', 'Inactive', 'Graduated') DEFAULT 'Active',
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (course_id) REFERENCES courses(course_id) ON DELETE SET NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS attendance (
+        attendance_id INT AUTO_INCREMENT PRIMARY KEY,
+        student_id VARCHAR(20) NOT NULL,
+        course_id INT NOT NULL,
+        attendance_date DATE NOT NULL,
+        status ENUM('Present', 'Absent') NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (student_id) REFERENCES students(student_id) ON DELETE CASCADE,
+        FOREIGN KEY (course_id) REFERENCES courses(course_id) ON DELETE CASCADE,
+        UNIQUE KEY unique_attendance (student_id, attendance_date)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS users (
+        user_id INT AUTO_INCREMENT PRIMARY KEY,
+        username VARCHAR(50) NOT NULL UNIQUE,
+        email VARCHAR(100) NOT NULL UNIQUE,
+        password_hash VARCHAR(255) NOT NULL,
+        full_name VARCHAR(100),
+        role ENUM('Admin', 'Staff') DEFAULT 'Staff',
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+]
+
+
+class MySQLBackend(StorageBackend):
+    """MySQL server through PyMySQL"""
+
+    name = "mysql"
+    for_update = " FOR UPDATE"
+
+    def __init__(self, database=None, **overrides):
+        # PyMySQL is only needed when this backend is in use
+        import pymysql
+
+        self.pymysql = pymysql
+        self.config = {**DB_CONFIG, **overrides}
+        self.database = database or self.config["database"]
+        self.Error = pymysql.MySQLError
+        self.IntegrityError = pymysql.IntegrityError
+        self.disconnect_errors = (pymysql.OperationalError, pymysql.InterfaceError)
+        self.stream_cursorclass = pymysql.cursors.SSDictCursor
+
+    def connect(self, use_database=True):
+        """Open a raw PyMySQL connection to the server or the app database"""
+        return self.pymysql.connect(
+            host=self.config["host"],
+            user=self.config["user"],
+            password=self.config["password"],
+            database=self.database if use_database else None,
+            charset='utf8mb4',
+            cursorclass=self.pymysql.cursors.DictCursor,
+            autocommit=True
+        )
+
+    def check(self):
+        self.connect(use_database=False).close()
+
+    def create_database(self):
+        self._server_execute(f"CREATE DATABASE IF NOT EXISTS {self.database}")
+
+    def drop_database(self):
+        self._server_execute(f"DROP DATABASE IF EXISTS {self.database}")
+
+    def _server_execute(self, statement):
+        connection = self.connect(use_database=False)
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(statement)
+        finally:
+            connection.close()
+
+    def tables(self):
+        return MYSQL_TABLES
+
+    def upsert(self, key, **assignments):
+        # MySQL upserts on whichever unique key collides; key documents which one
+        return "ON DUPLICATE KEY UPDATE " + ", ".join(f"{c} = {e}" for c, e in assignments.items())
+
+    def new(self, column):
+        return f"VALUES({column})"
+
+    def concat(self, *parts):
+        return f"CONCAT({', '.join(parts)})"
+
+    def month(self, column):
+        return f"DATE_FORMAT({column}, '%Y-%m')"
+
+    def month_start(self, column):
+        return f"DATE_FORMAT({column}, '%Y-%m-01')"
+
+    def months_ago(self, months):
+        return f"DATE_SUB(CURDATE(), INTERVAL {int(months)} MONTH)"
+
+    def index_exists(self, cursor, table, name):
+        cursor.execute("""
+            SELECT COUNT(*) as count
+            FROM information_schema.STATISTICS
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND INDEX_NAME = %s
+        """, (table, name))
+        return cursor.fetchone()["count"] > 0
+
+    def column_exists(self, cursor, table, name):
+        cursor.execute("""
+            SELECT COUNT(*) as count
+            FROM information_schema.COLUMNS
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND COLUMN_NAME = %s
+        """, (table, name))
+        return cursor.fetchone()["count"] > 0
+
+    def add_column(self, table, name, definition, after=None):
+        position = f" AFTER {after}" if after else ""
+        return f"ALTER TABLE {table} ADD COLUMN {name} {definition}{position}"
+
+    def estimate_rows(self, cursor, table):
+        # InnoDB table statistics: no scan, but only approximate
+        cursor.execute("""
+            SELECT TABLE_ROWS as count
+            FROM information_schema.TABLES
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+        """, (table,))
+        result = cursor.fetchone()
+        return result["count"] if result and result["count"] else None
+
+    def full_scans(self, plan):
+        return [
+            row["table"] for row in plan
+            if row.get("type") == "ALL" and row.get("table") and not row["table"].startswith("<")
+        ]
+
+
+# ================= SQLITE =================
+
+# Case-insensitive text columns match MySQL's default collation, and let
+# LIKE 'prefix%' use their indexes. Columns joined to student_id share its
+# collation, or the join can't use the primary key.
+SQLITE_TABLES = [
+    """
+    CREATE TABLE IF NOT EXISTS courses (
+        course_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        course_name VARCHAR(100) NOT NULL UNIQUE COLLATE NOCASE,
+        course_code VARCHAR(20) NOT NULL UNIQUE COLLATE NOCASE,
+        description TEXT,
+        duration_months INT,
+        fees DECIMAL(10, 2),
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS students (
+        student_id VARCHAR(20) PRIMARY KEY COLLATE NOCASE,
+        first_name VARCHAR(50) NOT NULL COLLATE NOCASE,
+        last_name VARCHAR(50) NOT NULL COLLATE NOCASE,
+        gender TEXT NOT NULL CHECK (gender IN ('Male', 'Female', 'Other')),
+        dob DATE NOT NULL,
+        email VARCHAR(100) UNIQUE COLLATE NOCASE,
+        phone VARCHAR(15),
+        address TEXT,
+        course_id INT REFERENCES courses(course_id) ON DELETE SET NULL,
+        admission_date DATE NOT NULL,
+        photo_path VARCHAR(255),
+        status TEXT DEFAULT 'Active' CHECK (status IN ('Active', 'Inactive', 'Graduated')),
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS attendance (
+        attendance_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        student_id VARCHAR(20) NOT NULL COLLATE NOCASE REFERENCES students(student_id) ON DELETE CASCADE,
+        course_id INT NOT NULL REFERENCES courses(course_id) ON DELETE CASCADE,
+        attendance_date DATE NOT NULL,
+        status TEXT NOT NULL CHECK (status IN ('Present', 'Absent')),
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        CONSTRAINT unique_attendance UNIQUE (student_id, attendance_date)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS users (
+        user_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        username VARCHAR(50) NOT NULL UNIQUE,
+        email VARCHAR(100) NOT NULL UNIQUE COLLATE NOCASE,
+        password_hash VARCHAR(255) NOT NULL,
+        full_name VARCHAR(100),
+        role TEXT DEFAULT 'Staff' CHECK (role IN ('Admin', 'Staff')),
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+]
+
+# Column types come back as the Python types PyMySQL returns
+sqlite3.register_adapter(date, date.isoformat)
+sqlite3.register_adapter(datetime, lambda value: value.isoformat(" "))
+sqlite3.register_adapter(Decimal, str)
+sqlite3.register_converter("DATE", lambda raw: date.fromisoformat(raw.decode()))
+sqlite3.register_converter("TIMESTAMP", lambda raw: datetime.fromisoformat(raw.decode()))
+sqlite3.register_converter("DECIMAL", lambda raw: Decimal(raw.decode()))
+
+_PLACEHOLDER = re.compile(r"%([s%])")
+
+
+def _qmark(query):
+    # %s -> ?, %% -> % (the same escaping PyMySQL applies when params are given)
+    return _PLACEHOLDER.sub(lambda m: "?" if m.group(1) == "s" else "%", query)
+
+
+def _dict_row(cursor, row):
+    return {column[0]: value for column, value in zip(cursor.description, row)}
+
+
+class _SQLiteCursor:
+    """sqlite3 cursor accepting %s placeholders, as the PyMySQL cursors do"""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def execute(self, query, params=None):
+        if params is None:
+            self._cursor.execute(query)
+        else:
+            self._cursor.execute(_qmark(query), tuple(params))
+        return self._cursor.rowcount
+
+    def executemany(self, query, seq_of_params):
+        self._cursor.executemany(_qmark(query), [tuple(p) for p in seq_of_params])
+        return self._cursor.rowcount
+
+    def fetchone(self):
+        return self._cursor.fetchone()
+
+    def fetchmany(self, size):
+        return self._cursor.fetchmany(size)
+
+    def fetchall(self):
+        return self._cursor.fetchall()
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    @property
+    def lastrowid(self):
+        return self._cursor.lastrowid
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    def close(self):
+        self._cursor.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class _SQLiteConnection:
+    """sqlite3 connection with the PyMySQL connection methods the pool uses"""
+
+    def __init__(self, raw):
+        self.raw = raw
+
+    def cursor(self, cursorclass=None):
+        return _SQLiteCursor(self.raw.cursor())
+
+    def begin(self):
+        # IMMEDIATE takes the write lock up front, so a transaction that reads
+        # and then writes can't deadlock against another writer
+        self.raw.execute("BEGIN IMMEDIATE")
+
+    def commit(self):
+        if self.raw.in_transaction:
+            self.raw.execute("COMMIT")
+
+    def rollback(self):
+        if self.raw.in_transaction:
+            self.raw.execute("ROLLBACK")
+
+    def ping(self, reconnect=False):
+        self.raw.execute("SELECT 1")
+
+    def close(self):
+        self.raw.close()
+
+
+class SQLiteBackend(StorageBackend):
+    """Local SQLite file in WAL mode: readers never block the single writer"""
+
+    name = "sqlite"
+    Error = sqlite3.Error
+    IntegrityError = sqlite3.IntegrityError
+    disconnect_errors = (sqlite3.InterfaceError,)
+    like_escape = " ESCAPE '\\'"
+    explain_prefix = "EXPLAIN QUERY PLAN "
+
+    def __init__(self, path, busy_timeout=10):
+        self.path = path
+        self.database = path
+        self.busy_timeout = busy_timeout
+
+    def connect(self):
+        raw = sqlite3.connect(
+            self.path,
+            timeout=self.busy_timeout,
+            detect_types=sqlite3.PARSE_DECLTYPES,
+            # autocommit like the MySQL connections; begin() opens transactions
+            isolation_level=None,
+            # pooled connections move between worker threads (one at a time)
+            check_same_thread=False,
+        )
+        raw.row_factory = _dict_row
+        raw.execute("PRAGMA journal_mode = WAL")
+        raw.execute("PRAGMA synchronous = NORMAL")
+        raw.execute("PRAGMA foreign_keys = ON")
+        return _SQLiteConnection(raw)
+
+    def check(self):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        if not os.path.isdir(directory):
+            raise FileNotFoundError(f"No such directory: {directory}")
+
+    def create_database(self):
+        # The file is created by the first connection
+        pass
+
+    def drop_database(self):
+        for suffix in ("", "-wal", "-shm"):
+            try:
+                os.remove(self.path + suffix)
+            except FileNotFoundError:
+                pass
+
+    def tables(self):
+        return SQLITE_TABLES
+
+    def upsert(self, key, **assignments):
+        return f"ON CONFLICT ({', '.join(key)}) DO UPDATE SET " + ", ".join(
+            f"{c} = {e}" for c, e in assignments.items()
+        )
+
+    def new(self, column):
+        return f"excluded.{column}"
+
+    def concat(self, *parts):
+        return " || ".join(parts)
+
+    def month(self, column):
+        return f"strftime('%Y-%m', {column})"
+
+    def month_start(self, column):
+        return f"strftime('%Y-%m-01', {column})"
+
+    def months_ago(self, months):
+        return f"date('now', '-{int(months)} months')"
+
+    def index_exists(self, cursor, table, name):
+        cursor.execute("""
+            SELECT COUNT(*) as count
+            FROM sqlite_master
+            WHERE type = 'index' AND tbl_name = %s AND name = %s
+        """, (table, name))
+        return cursor.fetchone()["count"] > 0
+
+    def column_exists(self, cursor, table, name):
+        cursor.execute("SELECT COUNT(*) as count FROM pragma_table_info(%s) WHERE name = %s", (table, name))
+        return cursor.fetchone()["count"] > 0
+
+    def add_column(self, table, name, definition, after=None):
+        # SQLite always appends new columns
+        return f"ALTER TABLE {table} ADD COLUMN {name} {definition}"
+
+    def full_scans(self, plan):
+        # "SCAN s" is a full table scan; "SCAN s USING [COVERING] INDEX ..." walks
+        # an index and "SCAN f VIRTUAL TABLE ..." is a full-text lookup
+        scans = []
+        for row in plan:
+            detail = [word for word in row["detail"].split() if word != "TABLE"]
+            if (
+                len(detail) >= 2 and detail[0] == "SCAN"
+                and not {"USING", "VIRTUAL", "CONSTANT"} & set(detail)
+                and not detail[1].startswith("(")
+            ):
+                scans.append(detail[1])
+        return scans
@@ -0,0 +1,109 @@
+"""
+Student ID Allocation for Student Management System
+Per-year sequences handing out STU-YYYY#### IDs in atomically reserved blocks
+"""
+
+import threading
+from datetime import date
+
+SEQUENCE_TABLE = """
+CREATE TABLE IF NOT EXISTS student_id_sequences (
+    year SMALLINT PRIMARY KEY,
+    next_value INT UNSIGNED NOT NULL
+)
+"""
+
+# Start each year after its numerically highest existing ID. The suffix is
+# cast before MAX so STU-202410000 counts as higher than STU-20249999.
+SEED_SEQUENCES = {
+    "mysql": """
+    INSERT INTO student_id_sequences (year, next_value)
+    SELECT CAST(SUBSTRING(student_id, 5, 4) AS UNSIGNED) AS year,
+           MAX(CAST(SUBSTRING(student_id, 9) AS UNSIGNED)) + 1 AS next_value
+    FROM students
+    WHERE student_id REGEXP '^STU-[0-9]{8,}$'
+    GROUP BY year
+    ON DUPLICATE KEY UPDATE next_value = GREATEST(next_value, VALUES(next_value))
+    """,
+    "sqlite": """
+    INSERT INTO student_id_sequences (year, next_value)
+    SELECT CAST(substr(student_id, 5, 4) AS INTEGER) AS year,
+           MAX(CAST(substr(student_id, 9) AS INTEGER)) + 1 AS next_value
+    FROM students
+    WHERE student_id GLOB 'STU-[0-9][0-9][0-9][0-9][0-9][0-9][0-9][0-9]*'
+      AND substr(student_id, 9) NOT GLOB '*[^0-9]*'
+    GROUP BY year
+    ON CONFLICT (year) DO UPDATE SET next_value = MAX(next_value, excluded.next_value)
+    """,
+}
+
+# One statement claims a block and returns the new next_value; the row lock
+# is held only for the upsert. MySQL hands the value back through
+# LAST_INSERT_ID(expr) on this connection, SQLite through RETURNING.
+RESERVE_BLOCK = {
+    "mysql": """
+    INSERT INTO student_id_sequences (year, next_value)
+    VALUES (%s, LAST_INSERT_ID(1 + %s))
+    ON DUPLICATE KEY UPDATE next_value = LAST_INSERT_ID(next_value + %s)
+    """,
+    "sqlite": """
+    INSERT INTO student_id_sequences (year, next_value)
+    VALUES (%s, 1 + %s)
+    ON CONFLICT (year) DO UPDATE SET next_value = next_value + %s
+    RETURNING next_value
+    """,
+}
+
+
+def format_student_id(year, number):
+    """STU-YYYY0001; numbers past 9999 simply get wider"""
+    return f"STU-{year}{number:04d}"
+
+
+def reserve_block(cursor, backend, year, count):
+    """Claim count consecutive numbers for year; returns the first one"""
+    cursor.execute(RESERVE_BLOCK[backend.name], (year, count, count))
+    if backend.name == "mysql":
+        cursor.execute("SELECT LAST_INSERT_ID() AS next_value")
+    return cursor.fetchone()["next_value"] - count
+
+
+class StudentIdAllocator:
+    """Thread-safe in-process cache of reserved ID blocks, one per year
+
+    reserve(year, count) must claim count numbers atomically and return the
+    first. Numbers still unused when the process exits are skipped, so the
+    sequence can have gaps but never hands out the same ID twice.
+    """
+
+    def __init__(self, reserve, block_size=50):
+        self._reserve = reserve
+        self.block_size = block_size
+        self._year = None
+        self._next = 0
+        self._end = 0
+        self._lock = threading.Lock()
+
+    def next_id(self):
+        """One new student ID"""
+        return self.take(1)[0]
+
+    def take(self, count):
+        """count new student IDs, in increasing order"""
+        year = date.today().year
+        with self._lock:
+            if year != self._year:
+                # A block never spans New Year; last year's leftovers are dropped
+                self._year, self._next, self._end = year, 0, 0
+
+            numbers = list(range(self._next, min(self._end, self._next + count)))
+            self._next += len(numbers)
+
+            short = count - len(numbers)
+            if short:
+                size = max(short, self.block_size)
+                first = self._reserve(year, size)
+                numbers.extend(range(first, first + short))
+                self._next, self._end = first + short, first + size
+
+        return [format_student_id(year, n) for n in numbers]
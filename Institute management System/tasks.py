@@ -0,0 +1,135 @@
+"""
+Background tasks for Student Management System
+Runs blocking work (database queries, file I/O) on worker threads and hands
+the results back to the Tk main loop
+"""
+
+import queue
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class Task:
+    """Handle for a submitted call; cancelled tasks never run their callbacks"""
+
+    __slots__ = ("group", "cancelled", "future")
+
+    def __init__(self, group):
+        self.group = group
+        self.cancelled = False
+        self.future = None
+
+    def cancel(self):
+        self.cancelled = True
+        if self.future is not None:
+            self.future.cancel()
+
+    @property
+    def done(self):
+        return self.future is not None and self.future.done()
+
+
+class TaskExecutor:
+    """Thread pool plus an after()-based pump delivering results on the Tk thread"""
+
+    def __init__(self, root, max_workers=4, poll_ms=30):
+        self.root = root
+        self.poll_ms = poll_ms
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ims-task")
+        self._results = queue.SimpleQueue()
+        self._groups = {}
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._pump_job = None
+
+    def submit(self, fn, *args, on_success=None, on_error=None, group=None, **kwargs):
+        """Run fn(*args, **kwargs) on a worker thread
+
+        on_success(result) or on_error(exception) is then called on the Tk
+        thread, unless the task (or its group) was cancelled in the meantime.
+        """
+        task = Task(group)
+        callbacks = (on_success, on_error)
+
+        def run():
+            if task.cancelled:
+                self._results.put((task, callbacks, False, None))
+                return
+            try:
+                self._results.put((task, callbacks, True, fn(*args, **kwargs)))
+            except Exception as e:
+                self._results.put((task, callbacks, False, e))
+
+        with self._lock:
+            self._pending += 1
+            if group is not None:
+                self._groups.setdefault(group, set()).add(task)
+
+        task.future = self._pool.submit(run)
+        task.future.add_done_callback(lambda f: self._forget(task) if f.cancelled() else None)
+        self._schedule_pump()
+        return task
+
+    def cancel_group(self, group):
+        """Cancel every outstanding task submitted with group"""
+        with self._lock:
+            tasks = self._groups.pop(group, set())
+        for task in tasks:
+            task.cancel()
+
+    def shutdown(self):
+        """Cancel queued work and stop delivering results"""
+        with self._lock:
+            groups = list(self._groups)
+        for group in groups:
+            self.cancel_group(group)
+        if self._pump_job is not None:
+            self.root.after_cancel(self._pump_job)
+            self._pump_job = None
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    # ================= TK SIDE =================
+
+    def _schedule_pump(self):
+        # Called from the Tk thread only; polling stops while nothing is pending
+        if self._pump_job is None:
+            self._pump_job = self.root.after(self.poll_ms, self._pump)
+
+    def _pump(self):
+        self._pump_job = None
+        while True:
+            try:
+                task, (on_success, on_error), ok, value = self._results.get_nowait()
+            except queue.Empty:
+                break
+
+            self._forget(task)
+            if task.cancelled:
+                continue
+
+            callback = on_success if ok else on_error
+            if callback:
+                try:
+                    callback(value)
+                except Exception:
+                    # Reported as Tk would for any callback; the rest of the
+                    # queue is still delivered and the pump keeps running
+                    self.root.report_callback_exception(*sys.exc_info())
+            elif not ok:
+                print(f"Background task error: {value}")
+
+        with self._lock:
+            pending = self._pending
+        if pending:
+            self._schedule_pump()
+
+    def _forget(self, task):
+        with self._lock:
+            self._pending -= 1
+            if task.group is not None:
+                members = self._groups.get(task.group)
+                if members is not None:
+                    members.discard(task)
+                    if not members:
+                        del self._groups[task.group]
@@ -0,0 +1,24 @@
+"""
+Shared fixtures: a fresh SQLite-backed Database per test, no server needed
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import config  # noqa: E402
+from db import Database  # noqa: E402
+from storage import SQLiteBackend  # noqa: E402
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setitem(config.METRICS_CONFIG, "slow_log_path", None)
+    database = Database(SQLiteBackend(str(tmp_path / "test.db")))
+    assert database.initialize_database()
+    yield database
+    database.close()
@@ -0,0 +1,58 @@
+"""
+attendance_summary / attendance_totals stay in step with the attendance table
+"""
+
+from datetime import date
+
+DAY = date(2026, 10, 1)
+
+
+def _add_student(db):
+    db.add_course(("Python", "PY1", "Intro", 3, 1000))
+    course_id = db.get_all_courses()[0]["course_id"]
+    student_id = db.reserve_student_ids(1)[0]
+    success, msg, _ = db.add_students_bulk([(
+        student_id, "Asha", "Rao", "Female", date(2005, 1, 1), "asha@example.com",
+        "9000000000", "1 Main Road", course_id, date(2026, 1, 1), None, "Active",
+    )])
+    assert success, msg
+    return student_id, course_id
+
+
+def _tables(db):
+    with db.pool.cursor() as cursor:
+        cursor.execute("SELECT student_id, status FROM attendance")
+        attendance = cursor.fetchall()
+        cursor.execute("SELECT student_id, present, total FROM attendance_summary")
+        summary = cursor.fetchall()
+        cursor.execute("SELECT present, total FROM attendance_totals")
+        totals = cursor.fetchall()
+    return attendance, summary, totals
+
+
+def test_remark_with_different_case_overwrites_in_rollup(db):
+    student_id, course_id = _add_student(db)
+
+    assert db.mark_attendance((student_id, course_id, DAY, "Present", None))[0]
+    assert db.mark_attendance((student_id.lower(), course_id, DAY, "Absent", None))[0]
+
+    attendance, summary, totals = _tables(db)
+    assert attendance == [{"student_id": student_id, "status": "Absent"}]
+    assert summary == [{"student_id": student_id, "present": 0, "total": 1}]
+    assert totals == [{"present": 0, "total": 1}]
+    assert db.get_dashboard_stats(refresh=True)["attendance_rate"] == 0
+
+
+def test_bulk_marks_with_mixed_case_in_one_roll_call(db):
+    student_id, course_id = _add_student(db)
+
+    success, msg, _ = db.mark_attendance_bulk([
+        (student_id.lower(), course_id, DAY, "Absent", None),
+        (student_id, course_id, DAY, "Present", None),
+    ])
+    assert success, msg
+
+    attendance, summary, totals = _tables(db)
+    assert attendance == [{"student_id": student_id, "status": "Present"}]
+    assert summary == [{"student_id": student_id, "present": 1, "total": 1}]
+    assert totals == [{"present": 1, "total": 1}]
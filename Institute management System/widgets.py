@@ -0,0 +1,366 @@
+"""
+Reusable widgets for Student Management System
+"""
+
+import customtkinter as ctk
+import tkinter as tk
+from tkinter import ttk
+
+
+class VirtualTreeview(tk.Frame):
+    """Treeview that only materializes the rows in view
+
+    Data lives in a column store (one list per column) and a fixed pool of
+    Treeview items - the visible rows plus a small buffer - is recycled as the
+    user scrolls, so widget count and redraw cost do not grow with the data.
+    """
+
+    def __init__(self, parent, columns, widths=None, buffer=5, on_scroll_end=None, sortable=False, **kwargs):
+        super().__init__(parent, **kwargs)
+
+        self.columns = tuple(columns)
+        self.buffer = buffer
+        self.on_scroll_end = on_scroll_end
+        self._sort = None
+
+        self._data = [[] for _ in self.columns]
+        self._offset = 0
+        self._visible = 1
+        self._slots = []
+        self._attached = 0
+        self._selected = None
+        self._syncing = False
+
+        self.scrollbar = tk.Scrollbar(self, command=self._on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y")
+
+        self.tree = ttk.Treeview(self, columns=self.columns, show="headings", selectmode="browse")
+        self.tree.pack(side="left", fill="both", expand=True)
+
+        for i, col in enumerate(self.columns):
+            self.tree.heading(col, text=col)
+            self.tree.column(col, width=widths[i] if widths else 140)
+            if sortable:
+                self.tree.heading(col, command=lambda c=i: self._on_heading(c))
+
+        self.tree.bind("<Configure>", self._on_resize)
+        self.tree.bind("<<TreeviewSelect>>", self._on_select)
+        self.tree.bind("<MouseWheel>", self._on_mousewheel)
+        self.tree.bind("<Button-4>", lambda e: self._scroll_by(-3))
+        self.tree.bind("<Button-5>", lambda e: self._scroll_by(3))
+        self.tree.bind("<Up>", lambda e: self._move_selection(-1))
+        self.tree.bind("<Down>", lambda e: self._move_selection(1))
+        self.tree.bind("<Prior>", lambda e: self._scroll_by(-self._visible))
+        self.tree.bind("<Next>", lambda e: self._scroll_by(self._visible))
+
+    # ================= DATA =================
+
+    def __len__(self):
+        return len(self._data[0])
+
+    def clear(self):
+        """Drop all rows and reset the view to the top"""
+        self._data = [[] for _ in self.columns]
+        self._offset = 0
+        self._selected = None
+        self._render()
+
+    def append_rows(self, rows):
+        """Append row value tuples to the column store"""
+        for row in rows:
+            for column, value in zip(self._data, row):
+                column.append(value)
+        self._render()
+
+    def set_rows(self, rows):
+        """Replace all rows, keeping the current sort, and reset the view to the top"""
+        self._data = [[] for _ in self.columns]
+        for row in rows:
+            for column, value in zip(self._data, row):
+                column.append(value)
+        self._offset = 0
+        self._selected = None
+        if self._sort:
+            self._apply_sort()
+        self._render()
+
+    def sort_by(self, column, reverse=False):
+        """Sort the rows by a column (name or index); later set_rows() keep the order"""
+        index = column if isinstance(column, int) else self.columns.index(column)
+        self._sort = (index, reverse)
+        self._apply_sort()
+        self._selected = None
+        self._render()
+
+        for i, col in enumerate(self.columns):
+            arrow = (" ▼" if reverse else " ▲") if i == index else ""
+            self.tree.heading(col, text=col + arrow)
+
+    def row(self, index):
+        """Values of the row at index"""
+        return tuple(column[index] for column in self._data)
+
+    def selected_row(self):
+        """Values of the selected row, or None"""
+        if self._selected is None or self._selected >= len(self):
+            return None
+        return self.row(self._selected)
+
+    def bind_row(self, sequence, callback):
+        """Bind an event on the table to callback(row_values)"""
+        def handler(event):
+            # Resolve from the pointer: the select event may not have run yet
+            iid = self.tree.identify_row(event.y)
+            if iid in self._slots[:self._attached]:
+                self._selected = self._offset + self._slots.index(iid)
+            row = self.selected_row()
+            if row is not None:
+                callback(row)
+        self.tree.bind(sequence, handler)
+
+    def _apply_sort(self):
+        index, reverse = self._sort
+        key_column = self._data[index]
+        # None sorts last either way round
+        present = [i for i, v in enumerate(key_column) if v is not None]
+        missing = [i for i, v in enumerate(key_column) if v is None]
+        order = sorted(present, key=key_column.__getitem__, reverse=reverse) + missing
+        self._data = [[column[i] for i in order] for column in self._data]
+
+    def _on_heading(self, index):
+        reverse = self._sort == (index, False)
+        self.sort_by(index, reverse)
+
+    # ================= RENDERING =================
+
+    def _ensure_slots(self):
+        wanted = self._visible + self.buffer
+        while len(self._slots) < wanted:
+            iid = self.tree.insert("", "end", values=())
+            self.tree.detach(iid)
+            self._slots.append(iid)
+
+    def _render(self):
+        total = len(self)
+        self._offset = max(0, min(self._offset, total - self._visible))
+        self._ensure_slots()
+
+        # Slots stay in order, so only the tail ever needs attaching or detaching
+        shown = max(0, min(self._visible, total - self._offset, len(self._slots)))
+        for i in range(self._attached, shown):
+            self.tree.move(self._slots[i], "", i)
+        for i in range(shown, self._attached):
+            self.tree.detach(self._slots[i])
+        self._attached = shown
+
+        selection = ()
+        for i in range(shown):
+            index = self._offset + i
+            self.tree.item(self._slots[i], values=self.row(index))
+            if index == self._selected:
+                selection = (self._slots[i],)
+
+        # Keep <<TreeviewSelect>> from echoing the programmatic change
+        self._syncing = True
+        self.tree.selection_set(selection)
+        self.after_idle(self._end_sync)
+
+        if total:
+            self.scrollbar.set(self._offset / total, min(1.0, (self._offset + self._visible) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+        if self.on_scroll_end and total and self._offset + self._visible * 2 >= total:
+            self.on_scroll_end()
+
+    def _end_sync(self):
+        self._syncing = False
+
+    # ================= SCROLLING =================
+
+    def _scroll_to(self, offset):
+        offset = max(0, min(int(offset), len(self) - self._visible))
+        if offset != self._offset:
+            self._offset = offset
+            self._render()
+
+    def _scroll_by(self, rows):
+        self._scroll_to(self._offset + rows)
+        return "break"
+
+    def _on_scrollbar(self, action, amount, unit=None):
+        if action == "moveto":
+            self._scroll_to(float(amount) * len(self))
+        elif action == "scroll":
+            step = self._visible if unit == "pages" else 1
+            self._scroll_by(int(amount) * step)
+
+    def _on_mousewheel(self, event):
+        return self._scroll_by(-3 if event.delta > 0 else 3)
+
+    def _on_resize(self, event):
+        rowheight = ttk.Style().lookup("Treeview", "rowheight") or 20
+        # The heading takes about one row of the widget's height
+        visible = max(1, int(event.height) // int(rowheight) - 1)
+        if visible != self._visible:
+            self._visible = visible
+            self._render()
+
+    # ================= SELECTION =================
+
+    def _on_select(self, event):
+        if self._syncing:
+            return
+        selection = self.tree.selection()
+        if selection and selection[0] in self._slots[:self._attached]:
+            self._selected = self._offset + self._slots.index(selection[0])
+
+    def _move_selection(self, step):
+        if not len(self):
+            return "break"
+        current = self._selected if self._selected is not None else self._offset - step
+        self._selected = max(0, min(current + step, len(self) - 1))
+        if self._selected < self._offset:
+            self._offset = self._selected
+        elif self._selected >= self._offset + self._visible:
+            self._offset = self._selected - self._visible + 1
+        self._render()
+        return "break"
+
+
+class VirtualCardList(ctk.CTkFrame):
+    """Scrolling list of fixed-height cards that only materializes the ones in view
+
+    make_card(parent) builds one card widget with a show(item) method. A pool
+    of them - enough to cover the viewport plus a buffer - is re-placed as the
+    user scrolls, and show() only runs when the item under a card changes, so
+    widget count and render time do not grow with the number of items.
+    """
+
+    _EMPTY = object()
+
+    def __init__(self, parent, make_card, card_height, spacing=10, buffer=1, empty_text="", **kwargs):
+        super().__init__(parent, **kwargs)
+
+        self.make_card = make_card
+        self.card_height = card_height
+        self.pitch = card_height + spacing
+        self.spacing = spacing
+        self.buffer = buffer
+
+        self._items = []
+        self._offset = 0.0
+        self._view_height = 1
+        self._cards = []
+        self._shown = []
+        self._placed = 0
+
+        self.scrollbar = ctk.CTkScrollbar(self, command=self._on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y")
+
+        self.viewport = ctk.CTkFrame(self, fg_color="transparent")
+        self.viewport.pack(side="left", fill="both", expand=True)
+        self.viewport.bind("<Configure>", self._on_resize)
+        self._bind_wheel(self.viewport)
+
+        self.empty_label = ctk.CTkLabel(
+            self.viewport, text=empty_text, font=ctk.CTkFont(size=16), text_color="gray"
+        )
+
+    # ================= DATA =================
+
+    def __len__(self):
+        return len(self._items)
+
+    def set_items(self, items):
+        """Replace the items; cards whose item is unchanged are left alone"""
+        self._items = list(items)
+        self._render()
+
+    # ================= RENDERING =================
+
+    def _content_height(self):
+        return max(0, len(self._items) * self.pitch - self.spacing)
+
+    def _ensure_cards(self, wanted):
+        while len(self._cards) < wanted:
+            card = self.make_card(self.viewport)
+            self._bind_wheel(card)
+            self._cards.append(card)
+            self._shown.append(self._EMPTY)
+
+    def _render(self):
+        total = len(self._items)
+        self._offset = max(0.0, min(self._offset, self._content_height() - self._view_height))
+
+        fits = int(self._view_height // self.pitch) + 2
+        self._ensure_cards(fits + self.buffer)
+
+        first = int(self._offset // self.pitch)
+        shown = max(0, min(fits, total - first))
+
+        for i in range(shown):
+            index = first + i
+            card = self._cards[i]
+            item = self._items[index]
+            if self._shown[i] is self._EMPTY or self._shown[i] != item:
+                card.show(item)
+                self._shown[i] = item
+            card.place(x=0, y=index * self.pitch - self._offset, relwidth=1)
+
+        for i in range(shown, self._placed):
+            self._cards[i].place_forget()
+        self._placed = shown
+
+        if total:
+            self.empty_label.place_forget()
+        else:
+            self.empty_label.place(relx=0.5, y=50, anchor="n")
+
+        content = self._content_height()
+        if content > self._view_height:
+            self.scrollbar.set(self._offset / content, (self._offset + self._view_height) / content)
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    # ================= SCROLLING =================
+
+    def _scroll_to(self, offset):
+        offset = max(0.0, min(offset, self._content_height() - self._view_height))
+        if offset != self._offset:
+            self._offset = offset
+            self._render()
+
+    def _scroll_by(self, amount):
+        self._scroll_to(self._offset + amount)
+        return "break"
+
+    def _on_scrollbar(self, action, amount, unit=None):
+        if action == "moveto":
+            self._scroll_to(float(amount) * self._content_height())
+        elif action == "scroll":
+            step = self._view_height if unit == "pages" else self.pitch
+            self._scroll_by(int(amount) * step)
+
+    def _on_mousewheel(self, event):
+        return self._scroll_by(-self.pitch / 3 if event.delta > 0 else self.pitch / 3)
+
+    def _bind_wheel(self, widget):
+        # Wheel events go to the innermost widget under the pointer, so every
+        # tk-level descendant of a card gets the binding (bypassing CTk's bind)
+        for w in [widget, *self._descendants(widget)]:
+            tk.Misc.bind(w, "<MouseWheel>", self._on_mousewheel, add="+")
+            tk.Misc.bind(w, "<Button-4>", lambda e: self._scroll_by(-self.pitch / 3), add="+")
+            tk.Misc.bind(w, "<Button-5>", lambda e: self._scroll_by(self.pitch / 3), add="+")
+
+    def _descendants(self, widget):
+        for child in widget.winfo_children():
+            yield child
+            yield from self._descendants(child)
+
+    def _on_resize(self, event):
+        # Card positions are in CTk units; the event is in scaled pixels
+        height = self._reverse_widget_scaling(event.height)
+        if height != self._view_height:
+            self._view_height = height
+            self._render()